@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+API 지연 시간/처리량 벤치마크 (프로세스 내부 실행)
+
+합성 케이스 코퍼스(synthetic_data.py)를 대상으로 main.app을 ASGI로 직접 호출합니다.
+실제 사용과 비슷한 요청 구성(케이스 목록, 신호 목록, 확대한 데이터 구간, 구간 통계)을
+지정한 동시성으로 실행하고, 엔드포인트별 p50/p95/p99 지연 시간, 처리량, 최대 RSS를
+JSON으로 저장합니다. 같은 시드와 설정이면 같은 요청 순서가 만들어지므로 커밋 간 결과를 비교할 수 있습니다.
+
+사용 예:
+    python benchmark.py --corpus /tmp/vitalab-bench --cases 50 -c 8 -n 2000 -o bench.json
+    python benchmark.py --corpus /tmp/vitalab-bench -o after.json --compare bench.json
+"""
+
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import numpy as np
+
+ENDPOINTS = ("list", "signals", "data", "stats")
+DEFAULT_MIX = "list=1,signals=2,data=5,stats=2"
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """요청 구성 파싱 ("data=5,stats=2" → {"data": 5.0, "stats": 2.0})"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name} (expected one of {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def current_rss() -> int:
+    """현재 프로세스 RSS (바이트, /proc가 없으면 지금까지의 최대 RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_rss()
+
+
+def peak_rss() -> int:
+    """프로세스 최대 RSS (바이트, macOS는 바이트 단위, Linux는 KB 단위로 보고됨)"""
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def build_requests(cases: List[Dict[str, Any]], mix: Dict[str, float], count: int,
+                   seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    (엔드포인트 이름, URL) 요청 목록 생성
+
+    Args:
+        cases: 매니페스트 항목 (case_id, signals, start_time, end_time)
+        mix: 엔드포인트별 가중치
+        count: 요청 수
+    """
+    rng = np.random.default_rng(seed)
+    names = list(mix)
+    weights = np.array([mix[name] for name in names], dtype=np.float64)
+    choices = rng.choice(len(names), size=count, p=weights / weights.sum())
+
+    requests = []
+    for choice in choices:
+        endpoint = names[choice]
+        case = cases[rng.integers(len(cases))]
+        case_id = case["case_id"]
+        if endpoint == "list":
+            requests.append((endpoint, "/api/cases"))
+            continue
+        if endpoint == "signals":
+            requests.append((endpoint, f"/api/case/{case_id}/signals"))
+            continue
+
+        # 화면에서 확대한 구간: 케이스 길이의 1%~100% 폭, 신호 1~4개
+        signals = list(rng.choice(case["signals"], size=min(len(case["signals"]), rng.integers(1, 5)), replace=False))
+        start, end = case["start_time"] or 0.0, case["end_time"] or 0.0
+        width = (end - start) * float(rng.uniform(0.01, 1.0))
+        window_start = start + float(rng.uniform(0, max(end - start - width, 0)))
+        params = {"signals": signals, "start_time": round(window_start, 3), "end_time": round(window_start + width, 3)}
+        if endpoint == "data":
+            params["resolution"] = 500
+            params["method"] = str(rng.choice(["uniform", "minmax", "lttb"]))
+            requests.append((endpoint, f"/api/case/{case_id}/data?{urlencode(params, doseq=True)}"))
+        else:
+            requests.append((endpoint, f"/api/case/{case_id}/statistics?{urlencode(params, doseq=True)}"))
+    return requests
+
+
+async def run_requests(app, requests: List[Tuple[str, str]], concurrency: int) -> Dict[str, Any]:
+    """
+    요청 목록을 concurrency개 작업자로 실행하고 엔드포인트별 지연 시간/오류/RSS 기록
+    """
+    import httpx
+
+    latencies: Dict[str, List[float]] = {name: [] for name, _ in requests}
+    errors: Dict[str, int] = {name: 0 for name in latencies}
+    max_rss: Dict[str, int] = {name: 0 for name in latencies}
+    position = 0
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        async def worker():
+            nonlocal position
+            while position < len(requests):
+                endpoint, url = requests[position]
+                position += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    ok = response.status_code < 400
+                except Exception:
+                    ok = False
+                latencies[endpoint].append(time.perf_counter() - started)
+                if not ok:
+                    errors[endpoint] += 1
+                max_rss[endpoint] = max(max_rss[endpoint], current_rss())
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        wall = time.perf_counter() - started
+
+    return {"latencies": latencies, "errors": errors, "max_rss": max_rss, "wall_seconds": wall}
+
+
+def summarize(run: Dict[str, Any]) -> Dict[str, Any]:
+    """엔드포인트별/전체 지연 시간 백분위수(ms), 처리량(req/s), 최대 RSS(MB) 요약"""
+    wall = run["wall_seconds"]
+
+    def stats(values: List[float], errors: int, rss: int) -> Dict[str, Any]:
+        ms = np.asarray(values) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99]) if len(ms) else (None, None, None)
+        return {
+            "requests": len(ms),
+            "errors": errors,
+            "p50_ms": p50, "p95_ms": p95, "p99_ms": p99,
+            "mean_ms": float(ms.mean()) if len(ms) else None,
+            "max_ms": float(ms.max()) if len(ms) else None,
+            "throughput_rps": len(ms) / wall if wall else None,
+            "max_rss_mb": rss / 2 ** 20,
+        }
+
+    endpoints = {
+        name: stats(values, run["errors"][name], run["max_rss"][name])
+        for name, values in sorted(run["latencies"].items())
+    }
+    all_values = [v for values in run["latencies"].values() for v in values]
+    overall = stats(all_values, sum(run["errors"].values()), max(run["max_rss"].values(), default=0))
+    overall["wall_seconds"] = wall
+    overall["peak_rss_mb"] = peak_rss() / 2 ** 20
+    # numpy 스칼라를 JSON용 float로 변환
+    as_float = lambda d: {k: (float(v) if isinstance(v, np.floating) else v) for k, v in d.items()}
+    return {"endpoints": {k: as_float(v) for k, v in endpoints.items()}, "overall": as_float(overall)}
+
+
+def git_revision() -> Optional[Dict[str, Any]]:
+    """현재 커밋 해시와 작업 트리 변경 여부 (git이 없으면 None)"""
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=cwd,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=cwd,
+                               capture_output=True, text=True, check=True).stdout.strip() != ""
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare_corpus(corpus: str, cases: int, signals: int, hours: float, workers: int, seed: int) -> None:
+    """코퍼스 디렉토리에 케이스가 없으면 합성 케이스 생성"""
+    has_cases = os.path.isdir(corpus) and any(
+        name.endswith(".csv") and name[:-4].isdigit() for name in os.listdir(corpus)
+    ) or os.path.isdir(os.path.join(corpus, "store"))
+    if has_cases:
+        return
+    from synthetic_data import generate_directory
+    print(f"코퍼스가 비어 있어 합성 케이스 {cases}개를 생성합니다: {corpus}")
+    generate_directory(corpus, cases, output_format="store", n_signals=signals,
+                       duration=hours * 3600, seed=seed, workers=workers)
+
+
+async def benchmark(config: Dict[str, Any]) -> Dict[str, Any]:
+    """코퍼스를 데이터 디렉토리로 main.app을 띄워 워밍업 후 본 측정 실행"""
+    # main은 가져올 때 데이터 디렉토리를 읽으므로 환경 변수를 먼저 설정
+    os.environ["VITALAB_DATA_DIR"] = config["corpus"]
+    os.environ.setdefault("VITALAB_PREWARM_TOP_N", "0")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import main
+
+    main.dataset_manifest.refresh(force=True)
+    cases = [entry for entry in main.dataset_manifest.entries() if entry["signals"]]
+    if not cases:
+        raise ValueError(f"No cases found in {config['corpus']}")
+
+    mix = parse_mix(config["mix"])
+    warmup = build_requests(cases, mix, config["warmup"], config["seed"] + 1)
+    requests = build_requests(cases, mix, config["requests"], config["seed"])
+
+    async with main.app.router.lifespan_context(main.app):
+        if warmup:
+            await run_requests(main.app, warmup, config["concurrency"])
+        rss_before = current_rss()
+        run = await run_requests(main.app, requests, config["concurrency"])
+
+    result = summarize(run)
+    result["overall"]["rss_before_mb"] = rss_before / 2 ** 20
+    result["meta"] = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": len(cases),
+        "config": config,
+    }
+    return result
+
+
+def print_summary(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    """엔드포인트별 결과 표 출력 (baseline이 있으면 변화율 함께 출력)"""
+    columns = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "max_rss_mb")
+    print(f"{'endpoint':<10} {'requests':>8} {'errors':>6} " + " ".join(f"{c:>16}" for c in columns))
+    rows = dict(result["endpoints"], overall=result["overall"])
+    for name, row in rows.items():
+        cells = []
+        for column in columns:
+            value = row.get(column)
+            cell = "-" if value is None else f"{value:.2f}"
+            base = ((baseline or {}).get("endpoints", {}).get(name) if name != "overall"
+                    else (baseline or {}).get("overall")) or {}
+            if value is not None and base.get(column):
+                cell += f" ({(value / base[column] - 1) * 100:+.0f}%)"
+            cells.append(f"{cell:>16}")
+        print(f"{name:<10} {row['requests']:>8} {row['errors']:>6} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="API 지연 시간/처리량 벤치마크 (프로세스 내부 실행)")
+    parser.add_argument("--corpus", required=True, help="케이스 코퍼스 디렉토리 (비어 있으면 합성 케이스 생성)")
+    parser.add_argument("--cases", type=int, default=50, help="생성할 합성 케이스 수 (코퍼스가 비어 있을 때)")
+    parser.add_argument("--signals", type=int, default=200, help="합성 케이스당 신호 수")
+    parser.add_argument("--hours", type=float, default=4.0, help="합성 케이스 길이 (시간)")
+    parser.add_argument("-n", "--requests", type=int, default=1000, help="측정할 요청 수")
+    parser.add_argument("--warmup", type=int, default=100, help="측정 전 워밍업 요청 수")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"엔드포인트별 요청 가중치 (기본 {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=0, help="요청 생성 시드")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="합성 케이스 생성 프로세스 수")
+    parser.add_argument("-o", "--output", help="결과 JSON 파일 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일 경로")
+
+    args = parser.parse_args()
+    try:
+        parse_mix(args.mix)
+        prepare_corpus(args.corpus, args.cases, args.signals, args.hours, args.workers, args.seed)
+        config = {
+            "corpus": os.path.abspath(args.corpus),
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "seed": args.seed,
+        }
+        result = asyncio.run(benchmark(config))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_summary(result, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"\n결과를 저장했습니다: {args.output}")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+메모리 예산 기반 LRU 캐시
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import pandas as pd
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """DataFrame이 차지하는 메모리 (바이트, object 열 포함)"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+class LRUCache:
+    """
+    바이트 크기 기준으로 용량을 제한하는 LRU 캐시
+
+    항목을 넣을 때 sizeof로 크기를 재고, 총합이 max_bytes를 넘으면
+    가장 오래 사용되지 않은 항목부터 제거합니다.
+    max_bytes보다 큰 항목은 캐시하지 않습니다.
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int] = frame_nbytes, name: str = "cache"):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.name = name
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self.rejections = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """항목 조회 (적중 시 가장 최근 사용으로 이동)"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> bool:
+        """항목 저장 후 예산을 넘는 만큼 제거 (캐시되었으면 True)"""
+        size = self.sizeof(value)
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                self.rejections += 1
+                return False
+
+            self._entries[key] = value
+            self._sizes[key] = size
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                old_size = self._sizes.pop(old_key)
+                self.current_bytes -= old_size
+                self.evictions += 1
+                self.evicted_bytes += old_size
+            return True
+
+    def values(self) -> List[Any]:
+        """현재 캐시된 항목 (오래된 것부터, 사용 기록은 바꾸지 않음)"""
+        with self._lock:
+            return list(self._entries.values())
+
+    def pop(self, key: Hashable) -> None:
+        """항목 제거 (없으면 무시)"""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.current_bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        if key in self._entries:
+            del self._entries[key]
+            self.current_bytes -= self._sizes.pop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 크기와 적중/실패/제거 카운터"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+                "rejections": self.rejections,
+            }
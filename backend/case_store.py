@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+케이스 CSV를 신호별 바이너리 배열로 변환하고 np.memmap으로 읽는 컬럼형 저장소
+
+저장소 레이아웃 (data/store/{case_id}/):
+    header.json  - 행 수, 신호 목록, 원본 CSV 정보 (JSON)
+    time.bin     - 시간 열 (little-endian int64 또는 float64, 원본 dtype 유지)
+    000.f32 ...  - 신호별 값 (little-endian float32, NaN = 결측)
+"""
+
+import json
+import os
+import shutil
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+STORE_VERSION = 2
+STORE_DIR_NAME = "store"
+HEADER_FILE = "header.json"
+TIME_FILE = "time.bin"
+VALUE_DTYPE = "<f4"
+
+
+def get_store_dir(data_dir: str, case_id: int) -> str:
+    """케이스 저장소 디렉토리 경로 반환"""
+    return os.path.join(data_dir, STORE_DIR_NAME, str(case_id))
+
+
+def source_identity(csv_path: str) -> Dict[str, int]:
+    """원본 CSV 파일의 크기와 수정 시각 (저장소 최신 여부 판단용)"""
+    stat = os.stat(csv_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def store_identity(store_dir: str) -> Dict[str, int]:
+    """CSV 없이 저장소가 원본인 케이스의 파일 정보 (헤더를 제외한 시간/신호 배열 파일의 총 크기와 최근 수정 시각)"""
+    stats = [os.stat(os.path.join(store_dir, name)) for name in os.listdir(store_dir) if name != HEADER_FILE]
+    return {"size": sum(s.st_size for s in stats), "mtime_ns": max((s.st_mtime_ns for s in stats), default=0)}
+
+
+def time_slice_bounds(time: np.ndarray, start_time: Optional[float] = None,
+                      end_time: Optional[float] = None) -> Tuple[int, int]:
+    """
+    정렬된 시간 배열에서 [start_time, end_time] 구간의 행 범위를 이진 탐색으로 계산
+
+    시간이 NaN인 행(깨진 CSV 행)은 정렬 시 맨 뒤에 위치하며, 구간이 하나라도
+    지정되면 비교 필터와 마찬가지로 제외됩니다.
+
+    Returns:
+        (lo, hi): time[lo:hi]가 구간에 포함되는 행
+    """
+    if start_time is None and end_time is None:
+        return 0, len(time)
+    lo = 0 if start_time is None else int(np.searchsorted(time, start_time, side="left"))
+    hi = int(np.searchsorted(time, np.inf if end_time is None else end_time, side="right"))
+    return lo, max(lo, hi)
+
+
+def convert_csv_to_store(csv_path: str, store_dir: str) -> Dict:
+    """
+    CSV 파일 하나를 신호별 바이너리 배열 저장소로 변환
+
+    임시 디렉토리에 먼저 쓴 뒤 이름을 바꾸므로, 변환 도중에 읽는 프로세스는
+    이전 저장소나 원본 CSV를 보게 됩니다.
+
+    Args:
+        csv_path (str): 원본 CSV 파일 경로
+        store_dir (str): 저장소 디렉토리 경로
+
+    Returns:
+        dict: 기록된 헤더
+    """
+    identity = source_identity(csv_path)
+    df = pd.read_csv(csv_path)
+    if not df["time"].is_monotonic_increasing:
+        df = df.sort_values("time", kind="stable", ignore_index=True)
+    return write_store(df, store_dir, identity)
+
+
+def write_store(df: pd.DataFrame, store_dir: str, identity: Optional[Dict[str, int]] = None) -> Dict:
+    """
+    시간순 정렬된 와이드 DataFrame을 저장소로 기록 (임시 디렉토리에 쓴 뒤 이름 변경)
+
+    Args:
+        df (pd.DataFrame): time 열과 신호 열
+        store_dir (str): 저장소 디렉토리 경로
+        identity (dict): 원본 파일 크기/수정 시각 (header의 source), None이면 저장소가 원본이므로
+            기록한 배열 파일 기준 (store_identity)
+
+    Returns:
+        dict: 기록된 헤더
+    """
+    tmp_dir = f"{store_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    try:
+        time_dtype = "<i8" if pd.api.types.is_integer_dtype(df["time"]) else "<f8"
+        df["time"].to_numpy(dtype=time_dtype).tofile(os.path.join(tmp_dir, TIME_FILE))
+
+        signals = []
+        for idx, name in enumerate(col for col in df.columns if col != "time"):
+            file_name = f"{idx:03d}.f32"
+            values = pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=VALUE_DTYPE)
+            values.tofile(os.path.join(tmp_dir, file_name))
+            signals.append({"name": name, "file": file_name})
+
+        if identity is None:
+            identity = store_identity(tmp_dir)
+        header = {
+            "version": STORE_VERSION,
+            "rows": int(len(df)),
+            "time": {"file": TIME_FILE, "dtype": time_dtype},
+            "value_dtype": VALUE_DTYPE,
+            "signals": signals,
+            "source": identity,
+        }
+        with open(os.path.join(tmp_dir, HEADER_FILE), "w", encoding="utf-8") as f:
+            json.dump(header, f, ensure_ascii=False)
+
+        shutil.rmtree(store_dir, ignore_errors=True)
+        os.replace(tmp_dir, store_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    return header
+
+
+class CaseStore:
+    """
+    memmap 기반 케이스 저장소 리더
+
+    배열은 처음 접근할 때 열리며, 요청된 신호의 파일만 페이지 캐시로 올라옵니다.
+    같은 파일을 여는 모든 워커 프로세스는 OS 페이지 캐시를 공유합니다.
+    """
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, HEADER_FILE), encoding="utf-8") as f:
+            self.header = json.load(f)
+        if self.header.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported store version: {self.header.get('version')}")
+
+        self.rows: int = self.header["rows"]
+        self._files: Dict[str, str] = {s["name"]: s["file"] for s in self.header["signals"]}
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @property
+    def signals(self) -> List[str]:
+        """시간 열을 제외한 신호 목록 (원본 CSV 열 순서)"""
+        return [s["name"] for s in self.header["signals"]]
+
+    @property
+    def source(self) -> Dict[str, int]:
+        return self.header.get("source", {})
+
+    def is_fresh(self, csv_path: str) -> bool:
+        """원본 CSV가 변환 이후 바뀌지 않았는지 확인 (CSV가 없으면 저장소가 원본)"""
+        if not os.path.exists(csv_path):
+            return True
+        return source_identity(csv_path) == self.source
+
+    def _open(self, key: str, file_name: str, dtype: str) -> np.ndarray:
+        array = self._arrays.get(key)
+        if array is None:
+            path = os.path.join(self.store_dir, file_name)
+            if self.rows == 0:
+                array = np.empty(0, dtype=dtype)
+            else:
+                array = np.memmap(path, dtype=dtype, mode="r", shape=(self.rows,))
+            self._arrays[key] = array
+        return array
+
+    @property
+    def time(self) -> np.ndarray:
+        """시간 배열 (읽기 전용 memmap)"""
+        return self._open("time", self.header["time"]["file"], self.header["time"]["dtype"])
+
+    def column(self, name: str) -> np.ndarray:
+        """신호 값 배열 (읽기 전용 memmap)"""
+        if name not in self._files:
+            raise KeyError(name)
+        return self._open(name, self._files[name], self.header["value_dtype"])
+
+    def to_frame(self, signals: Optional[List[str]] = None, start_time: Optional[float] = None,
+                 end_time: Optional[float] = None) -> pd.DataFrame:
+        """
+        요청된 신호와 시간 구간만 읽어 time 열을 포함한 DataFrame 생성 (없는 신호는 무시)
+        - 구간은 시간 배열 이진 탐색으로 찾고, memmap 슬라이스만 복사 (O(log n + k))
+        - 값은 저장된 float32 그대로 (응답 인코딩에서 가장 짧은 십진 표현으로 변환)
+        """
+        lo, hi = time_slice_bounds(self.time, start_time, end_time)
+        return self.row_frame(signals, lo, hi)
+
+    def row_frame(self, signals: Optional[List[str]], lo: int, hi: int) -> pd.DataFrame:
+        """행 [lo, hi)의 요청된 신호만 읽어 DataFrame 생성 (값은 저장된 float32 그대로)"""
+        names = self.signals if signals is None else [s for s in signals if s in self._files]
+        data = {"time": np.array(self.time[lo:hi])}
+        for name in names:
+            data[name] = np.array(self.column(name)[lo:hi])
+        return pd.DataFrame(data)
+
+
+def is_store_fresh(store_dir: str, csv_path: str) -> bool:
+    """저장소가 현재 버전이고 원본 CSV와 일치하는지 확인 (열 수 없으면 False)"""
+    if not os.path.exists(os.path.join(store_dir, HEADER_FILE)):
+        return False
+    try:
+        return CaseStore(store_dir).is_fresh(csv_path)
+    except (ValueError, KeyError, OSError):
+        return False
+
+
+def convert_directory(data_dir: str = "./data", force: bool = False) -> int:
+    """
+    디렉토리 내 모든 케이스 CSV를 저장소로 변환 (최신 저장소는 건너뜀)
+
+    Args:
+        data_dir (str): CSV 파일이 있는 디렉토리 경로
+        force (bool): 최신 저장소도 다시 변환할지 여부
+
+    Returns:
+        int: 변환된 케이스 수
+    """
+    csv_files = sorted(
+        f for f in os.listdir(data_dir) if f.endswith(".csv") and f[:-4].isdigit()
+    )
+    converted = 0
+
+    for idx, filename in enumerate(csv_files, 1):
+        case_id = int(filename[:-4])
+        csv_path = os.path.join(data_dir, filename)
+        store_dir = get_store_dir(data_dir, case_id)
+
+        try:
+            if not force and is_store_fresh(store_dir, csv_path):
+                print(f"[{idx}/{len(csv_files)}] {filename}: 최신 상태, 건너뜁니다.")
+                continue
+
+            header = convert_csv_to_store(csv_path, store_dir)
+            converted += 1
+            print(f"[{idx}/{len(csv_files)}] {filename}: {header['rows']}행, {len(header['signals'])}개 신호 변환됨")
+        except Exception as e:
+            print(f"[{idx}/{len(csv_files)}] {filename} 처리 중 오류 발생: {str(e)}")
+
+    print(f"\n작업 완료: 총 {len(csv_files)}개 파일 중 {converted}개 파일이 변환되었습니다.")
+    return converted
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="케이스 CSV를 memmap 저장소로 변환")
+    parser.add_argument("-d", "--directory", default="./data", help="CSV 파일이 있는 디렉토리 경로")
+    parser.add_argument("-f", "--force", action="store_true", help="최신 저장소도 다시 변환")
+
+    args = parser.parse_args()
+    if not os.path.exists(args.directory):
+        print(f"Error: Directory '{args.directory}' not found.")
+        sys.exit(1)
+    convert_directory(args.directory, args.force)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+caseid로 색인된 임상 정보 저장소 (clinical_info.csv)
+
+파일은 열 단위로 한 번에 변환해 caseid → 필드 딕셔너리 색인을 만들고,
+파일의 크기나 수정 시각이 바뀌었을 때만 다시 읽습니다.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 문자열로 변환해 반환하는 필드 (숫자 열)
+STRING_FIELDS = ["age", "height", "weight", "bmi", "asa"]
+# 원본 값을 그대로 반환하는 필드 (문자 열)
+RAW_FIELDS = ["sex", "department", "dx", "opname"]
+FIELDS = ["age", "sex", "height", "weight", "bmi", "asa", "department", "dx", "opname"]
+
+
+class ClinicalInfoStore:
+    """clinical_info.csv 색인 (파일이 바뀌면 다음 조회 시 자동으로 다시 로드)"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._identity: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """CSV 전체를 열 단위 연산으로 caseid 색인으로 변환"""
+        df = pd.read_csv(self.file_path, usecols=lambda col: col == "caseid" or col in FIELDS)
+        df = df[df["caseid"].notna()]
+
+        fields = [field for field in FIELDS if field in df.columns]
+        columns = []
+        for field in fields:
+            column = df[field]
+            values = column.astype(str) if field in STRING_FIELDS else column
+            columns.append(values.astype(object).where(column.notna(), None).tolist())
+
+        # 같은 caseid가 여러 번 나오면 마지막 행 사용
+        case_ids = df["caseid"].astype(str).tolist()
+        return {case_id: dict(zip(fields, row)) for case_id, row in zip(case_ids, zip(*columns))}
+
+    def refresh(self) -> bool:
+        """파일의 크기/수정 시각이 바뀌었으면 다시 로드 (다시 로드했으면 True)"""
+        identity = self._stat()
+        if identity == self._identity:
+            return False
+
+        with self._lock:
+            if identity == self._identity:
+                return False
+            if identity is None:
+                logger.warning(f"Clinical info file not found: {self.file_path}")
+                self._index = {}
+            else:
+                try:
+                    self._index = self._load()
+                    self.loads += 1
+                    logger.info(f"Loaded clinical info for {len(self._index)} cases")
+                except Exception as e:
+                    logger.error(f"Error loading clinical info file: {e}")
+                    self._index = {}
+            self._identity = identity
+        return True
+
+    @property
+    def identity(self) -> Optional[Tuple[int, int]]:
+        return self._identity
+
+    def get(self, case_id: Any) -> Optional[Dict[str, Any]]:
+        """케이스 하나의 필드 딕셔너리 (없으면 None)"""
+        self.refresh()
+        return self._index.get(str(case_id))
+
+    def get_many(self, case_ids: Iterable[Any]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """여러 케이스를 한 번에 조회 (파일 확인은 한 번만)"""
+        self.refresh()
+        index = self._index
+        return {str(case_id): index.get(str(case_id)) for case_id in case_ids}
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._index)
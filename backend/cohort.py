@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+여러 케이스에 걸친 신호별 코호트 집계 (프로세스 풀)
+
+케이스 하나를 워커 프로세스 하나가 맡아 요청된 신호 열만 읽고, 병합 가능한 부분 집계
+(개수/평균/편차 제곱합, 최소/최대, 고정 구간 히스토그램, centroid 분위수 스케치, 임계값 조건 시간)를
+계산해 돌려줍니다. 부모 프로세스는 끝난 순서대로 부분 집계를 병합하므로 워커당 메모리는
+케이스 하나, 부모 메모리는 신호 수에 비례합니다. 케이스 데이터 캐시는 사용하지 않습니다.
+
+조건 시간은 각 샘플 값이 다음 샘플까지 유지된다고 보고 계산하며 (최대 max_hold초),
+sample_fraction은 샘플 수 기준, time_fraction은 시간 기준 비율입니다.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from case_store import CaseStore, get_store_dir, is_store_fresh, STORE_DIR_NAME
+from encoding import float32_to_float64
+from quantile_sketch import compress_centroids, interpolate_quantiles
+
+logger = logging.getLogger(__name__)
+
+# 케이스 하나와 병합 결과가 유지하는 최대 centroid 수
+COHORT_CENTROIDS = 256
+
+# 조건 시간 계산에서 샘플 하나가 유지된다고 보는 최대 시간 (초, 이보다 긴 공백은 측정 안 됨으로 처리)
+DEFAULT_MAX_HOLD = 60.0
+
+# 임계값 비교 연산자
+THRESHOLD_OPS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}
+
+# 메모리에 보관하는 최대 작업 수 (넘으면 끝난 작업부터 제거)
+MAX_JOBS = 32
+
+T = TypeVar("T")
+
+
+def threshold_key(op: str, value: float) -> str:
+    """임계값 응답 키 ("<" 90 → "<90")"""
+    return f"{op}{value:g}"
+
+
+def list_case_ids(data_dir: str) -> List[int]:
+    """케이스 CSV 또는 저장소가 있는 케이스 ID 목록"""
+    case_ids = {int(f[:-4]) for f in os.listdir(data_dir) if f.endswith(".csv") and f[:-4].isdigit()}
+    store_root = os.path.join(data_dir, STORE_DIR_NAME)
+    if os.path.isdir(store_root):
+        case_ids.update(int(name) for name in os.listdir(store_root) if name.isdigit())
+    return sorted(case_ids)
+
+
+class SignalAggregate:
+    """한 신호의 병합 가능한 부분 집계 (케이스 하나 또는 여러 케이스를 병합한 결과)"""
+
+    def __init__(self, bins: int = 0, value_range: Optional[Tuple[float, float]] = None,
+                 thresholds: Optional[List[Tuple[str, float]]] = None):
+        self.cases = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.vmin = np.inf
+        self.vmax = -np.inf
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.value_range = value_range if bins > 0 else None
+        self.counts = np.zeros(bins if self.value_range else 0, dtype=np.int64)
+        self.below_range = 0
+        self.above_range = 0
+        self.observed_seconds = 0.0
+        # 임계값 키 → [조건을 만족한 샘플 수, 시간(초)]
+        self.thresholds = {threshold_key(op, value): [0, 0.0] for op, value in thresholds or []}
+
+    @classmethod
+    def from_samples(cls, values: np.ndarray, holds: np.ndarray, bins: int = 0,
+                     value_range: Optional[Tuple[float, float]] = None,
+                     thresholds: Optional[List[Tuple[str, float]]] = None) -> "SignalAggregate":
+        """
+        케이스 하나의 결측이 아닌 샘플로 부분 집계 생성
+
+        Args:
+            values: 값 (float64, 유한값만)
+            holds: 샘플별 유지 시간 (초)
+        """
+        agg = cls(bins, value_range, thresholds)
+        n = len(values)
+        if n == 0:
+            return agg
+        agg.cases = 1
+        agg.count = n
+        agg.mean = float(values.mean())
+        agg.m2 = float(np.square(values - agg.mean).sum())
+        agg.vmin = float(values.min())
+        agg.vmax = float(values.max())
+        agg.means, agg.weights = compress_centroids(values, np.ones(n), COHORT_CENTROIDS)
+        if agg.value_range is not None:
+            lo, hi = agg.value_range
+            agg.counts = np.histogram(values, bins=len(agg.counts), range=(lo, hi))[0].astype(np.int64)
+            agg.below_range = int((values < lo).sum())
+            agg.above_range = int((values > hi).sum())
+        agg.observed_seconds = float(holds.sum())
+        for op, value in thresholds or []:
+            mask = THRESHOLD_OPS[op](values, value)
+            agg.thresholds[threshold_key(op, value)] = [int(mask.sum()), float(holds[mask].sum())]
+        return agg
+
+    def merge(self, other: "SignalAggregate") -> "SignalAggregate":
+        """다른 부분 집계를 합침 (평균/편차 제곱합은 Chan 방식, 스케치는 합친 뒤 다시 압축)"""
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.cases += other.cases
+        self.vmin = min(self.vmin, other.vmin)
+        self.vmax = max(self.vmax, other.vmax)
+        self.means, self.weights = compress_centroids(np.concatenate([self.means, other.means]),
+                                                      np.concatenate([self.weights, other.weights]),
+                                                      COHORT_CENTROIDS)
+        if self.value_range is not None:
+            self.counts += other.counts
+            self.below_range += other.below_range
+            self.above_range += other.above_range
+        self.observed_seconds += other.observed_seconds
+        for key, (samples, seconds) in other.thresholds.items():
+            self.thresholds[key][0] += samples
+            self.thresholds[key][1] += seconds
+        return self
+
+    def result(self, percentiles: List[float]) -> Dict[str, Any]:
+        """응답용 집계 결과 (std는 표본 표준편차, ddof=1)"""
+        empty = self.count == 0
+        result: Dict[str, Any] = {
+            "cases": self.cases,
+            "count": self.count,
+            "min": None if empty else self.vmin,
+            "max": None if empty else self.vmax,
+            "mean": None if empty else self.mean,
+            "std": float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else None,
+            "percentiles": interpolate_quantiles(self.means, self.weights, percentiles, self.vmin, self.vmax),
+            "observed_seconds": self.observed_seconds,
+        }
+        if self.value_range is not None:
+            lo, hi = self.value_range
+            result["histogram"] = {
+                "edges": np.linspace(lo, hi, len(self.counts) + 1).tolist(),
+                "counts": self.counts.tolist(),
+                "below": self.below_range,
+                "above": self.above_range,
+            }
+        if self.thresholds:
+            result["thresholds"] = {
+                key: {
+                    "samples": samples,
+                    "sample_fraction": samples / self.count if self.count else None,
+                    "seconds": seconds,
+                    "time_fraction": seconds / self.observed_seconds if self.observed_seconds > 0 else None,
+                }
+                for key, (samples, seconds) in self.thresholds.items()
+            }
+        return result
+
+
+def read_case_signals(data_dir: str, case_id: int, signals: List[str]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    케이스 하나의 시간 열과 요청된 신호 열만 읽기 (최신 저장소가 있으면 memmap, 없으면 CSV의 해당 열)
+
+    Returns:
+        (시간순 정렬된 time, 신호 → float64 값), 케이스에 없는 신호는 제외
+
+    값은 저장소와 같은 float32 정밀도의 가장 짧은 십진 표현으로 맞추므로 (서버 응답과 동일),
+    같은 케이스는 CSV에서 읽든 저장소에서 읽든 같은 집계 결과가 나옵니다.
+    """
+    csv_path = os.path.join(data_dir, f"{case_id}.csv")
+    store_dir = get_store_dir(data_dir, case_id)
+    if is_store_fresh(store_dir, csv_path):
+        store = CaseStore(store_dir)
+        available = set(store.signals)
+        time_values = np.asarray(store.time, dtype=np.float64)
+        columns = {s: float32_to_float64(store.column(s)) for s in signals if s in available}
+        return time_values, columns
+
+    wanted = set(signals) | {"time"}
+    df = pd.read_csv(csv_path, usecols=lambda c: c in wanted)
+    if not df["time"].is_monotonic_increasing:
+        df = df.sort_values("time", kind="stable", ignore_index=True)
+    time_values = pd.to_numeric(df["time"], errors="coerce").to_numpy(dtype=np.float64)
+    with np.errstate(over="ignore", invalid="ignore"):
+        columns = {s: float32_to_float64(pd.to_numeric(df[s], errors="coerce").to_numpy(dtype=np.float64))
+                   for s in signals if s in df.columns}
+    return time_values, columns
+
+
+def sample_holds(time_values: np.ndarray, max_hold: float) -> np.ndarray:
+    """샘플별 유지 시간: 다음 샘플까지의 간격 (max_hold초로 제한, 마지막 샘플은 간격 중앙값, 시간이 NaN이면 0)"""
+    if len(time_values) < 2:
+        return np.zeros(len(time_values))
+    gaps = np.diff(time_values)
+    finite = gaps[np.isfinite(gaps)]
+    holds = np.concatenate([gaps, [np.median(finite) if len(finite) else 0.0]])
+    holds[~np.isfinite(holds)] = 0.0
+    return np.clip(holds, 0.0, max_hold)
+
+
+def aggregate_case(data_dir: str, case_id: int, signals: List[str],
+                   spec: Dict[str, Any]) -> Dict[str, SignalAggregate]:
+    """
+    워커 프로세스에서 실행: 케이스 하나의 신호별 부분 집계
+
+    Args:
+        spec: bins, ranges(신호 → [하한, 상한]), thresholds(신호 → [(연산자, 값)]), max_hold
+    """
+    time_values, columns = read_case_signals(data_dir, case_id, signals)
+    partials = {}
+    for signal, values in columns.items():
+        # 시간이 NaN인 행의 값도 분포에는 포함하되, 유지 시간은 0으로 처리
+        keep = np.isfinite(values)
+        holds = sample_holds(time_values[keep], spec.get("max_hold", DEFAULT_MAX_HOLD))
+        value_range = spec.get("ranges", {}).get(signal)
+        partials[signal] = SignalAggregate.from_samples(
+            values[keep], holds, spec.get("bins", 0), tuple(value_range) if value_range else None,
+            spec.get("thresholds", {}).get(signal))
+    return partials
+
+
+def _pool_context():
+    """서버의 스레드를 복제하지 않도록 워커는 spawn으로 시작"""
+    return multiprocessing.get_context("spawn")
+
+
+def aggregate_cohort(data_dir: str, case_ids: List[int], signals: List[str], spec: Dict[str, Any],
+                     percentiles: List[float], executor: ProcessPoolExecutor,
+                     on_progress: Optional[Callable[[int, int, Dict[int, str]], None]] = None,
+                     should_stop: Callable[[], bool] = lambda: False) -> Dict[str, Any]:
+    """
+    케이스별 부분 집계를 프로세스 풀에서 계산하고 끝난 순서대로 병합
+
+    Returns:
+        {"cases": 처리한 케이스 수, "failed": {케이스 ID: 오류}, "signals": 신호 → 집계 결과}
+    """
+    merged = {
+        s: SignalAggregate(spec.get("bins", 0),
+                           tuple(spec["ranges"][s]) if s in spec.get("ranges", {}) else None,
+                           spec.get("thresholds", {}).get(s))
+        for s in signals
+    }
+    failed: Dict[int, str] = {}
+    done = 0
+    futures = {executor.submit(aggregate_case, data_dir, case_id, signals, spec): case_id for case_id in case_ids}
+    try:
+        for future in as_completed(futures):
+            case_id = futures.pop(future)
+            try:
+                for signal, partial in future.result().items():
+                    merged[signal].merge(partial)
+            except BrokenProcessPool:
+                raise
+            except Exception as e:
+                failed[case_id] = str(e)
+            done += 1
+            if on_progress:
+                on_progress(done, len(case_ids), failed)
+            if should_stop():
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+
+    return {
+        "cases": done - len(failed),
+        "failed": {str(k): v for k, v in sorted(failed.items())},
+        "signals": {s: agg.result(percentiles) for s, agg in merged.items()},
+    }
+
+
+class CohortJob:
+    """백그라운드에서 실행되는 코호트 집계 작업 하나"""
+
+    def __init__(self, case_ids: List[int], signals: List[str], spec: Dict[str, Any], percentiles: List[float]):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.case_ids = case_ids
+        self.signals = signals
+        self.spec = spec
+        self.percentiles = percentiles
+        self.status = "pending"
+        self.done = 0
+        self.failed = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.cancelled = threading.Event()
+
+    def _progress(self, done: int, total: int, failed: Dict[int, str]) -> None:
+        self.done = done
+        self.failed = len(failed)
+
+    def run(self, data_dir: str, executor: ProcessPoolExecutor) -> None:
+        self.status = "running"
+        self.started = time.time()
+        try:
+            self.result = aggregate_cohort(data_dir, self.case_ids, self.signals, self.spec, self.percentiles,
+                                           executor, self._progress, self.cancelled.is_set)
+            self.status = "cancelled" if self.cancelled.is_set() else "done"
+        except BrokenProcessPool as e:
+            # 풀을 새로 만들 수 있도록 호출한 쪽(CohortRunner.call)에 다시 전달
+            logger.error(f"Cohort job {self.job_id} failed: worker pool broken: {e}")
+            self.error = f"Worker pool broken: {e}"
+            self.status = "failed"
+            raise
+        except Exception as e:
+            logger.error(f"Cohort job {self.job_id} failed: {e}")
+            self.error = str(e)
+            self.status = "failed"
+        finally:
+            self.finished = time.time()
+
+    @property
+    def finished_running(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        info = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "cases": len(self.case_ids),
+            "done": self.done,
+            "failed": self.failed,
+            "signals": self.signals,
+            "elapsed": None if self.started is None else (self.finished or time.time()) - self.started,
+        }
+        if self.error:
+            info["error"] = self.error
+        if include_result and self.result is not None:
+            info["result"] = self.result
+        return info
+
+
+class CohortRunner:
+    """코호트 집계 작업 목록과 공유 프로세스 풀 (풀은 첫 작업에서 생성, 작업은 한 번에 하나씩 실행)"""
+
+    def __init__(self, data_dir: str, workers: int):
+        self.data_dir = data_dir
+        self.workers = max(1, workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, CohortJob] = {}
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+
+    def executor(self) -> ProcessPoolExecutor:
+        """공유 프로세스 풀 (이벤트 인덱스 검출도 같은 풀 사용)"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+            return self._executor
+
+    def call(self, fn: Callable[[ProcessPoolExecutor], T]) -> T:
+        """
+        공유 풀로 fn(풀) 실행
+        - submit()/future.result()에서 BrokenProcessPool(워커 비정상 종료)이 나면 그 풀을 버리고 오류를 다시 발생
+          (다음 호출은 새 풀 사용)
+        """
+        executor = self.executor()
+        try:
+            return fn(executor)
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def submit(self, case_ids: List[int], signals: List[str], spec: Dict[str, Any],
+               percentiles: List[float]) -> CohortJob:
+        """작업을 등록하고 백그라운드 스레드에서 실행 (앞선 작업이 끝날 때까지 대기)"""
+        job = CohortJob(case_ids, signals, spec, percentiles)
+        with self._lock:
+            finished = [k for k, j in self._jobs.items() if j.finished_running]
+            for key in finished[:max(0, len(self._jobs) - MAX_JOBS + 1)]:
+                del self._jobs[key]
+            self._jobs[job.job_id] = job
+
+        def run() -> None:
+            with self._run_lock:
+                if job.cancelled.is_set():
+                    job.status = "cancelled"
+                    return
+                try:
+                    self.call(lambda executor: job.run(self.data_dir, executor))
+                except BrokenProcessPool:
+                    pass  # 작업은 실패로 기록되었고 풀은 다음 작업에서 새로 생성됨
+
+        threading.Thread(target=run, name=f"cohort-{job.job_id}", daemon=True).start()
+        return job
+
+    def get(self, job_id: str) -> Optional[CohortJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[CohortJob]:
+        """작업 취소 요청 (실행 중인 케이스는 끝까지 계산되고, 남은 케이스는 제출 취소)"""
+        job = self._jobs.get(job_id)
+        if job is not None and not job.finished_running:
+            job.cancelled.set()
+        return job
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        return [job.to_dict(include_result=False) for job in list(self._jobs.values())]
+
+    def shutdown(self) -> None:
+        for job in list(self._jobs.values()):
+            job.cancelled.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_thresholds(items: List[str]) -> Dict[str, List[Tuple[str, float]]]:
+    """"신호<값" 형식 목록을 신호 → [(연산자, 값)]으로 변환 (예: Solar8000/PLETH_SPO2<90)"""
+    thresholds: Dict[str, List[Tuple[str, float]]] = {}
+    for item in items:
+        for op in ("<=", ">=", "<", ">"):
+            if op in item:
+                signal, value = item.rsplit(op, 1)
+                thresholds.setdefault(signal, []).append((op, float(value)))
+                break
+        else:
+            raise ValueError(f"Invalid threshold (expected SIGNAL<VALUE): {item}")
+    return thresholds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="여러 케이스에 걸친 신호별 코호트 집계 (프로세스 풀)")
+    parser.add_argument("-d", "--directory", default="./data", help="케이스 CSV/저장소가 있는 디렉토리")
+    parser.add_argument("-s", "--signal", action="append", required=True, help="집계할 신호 (여러 번 지정 가능)")
+    parser.add_argument("--cases", default="", help="집계할 케이스 ID (쉼표로 구분, 기본: 전체)")
+    parser.add_argument("--percentiles", default="5,25,50,75,95", help="분위수 목록 (쉼표로 구분)")
+    parser.add_argument("--bins", type=int, default=0, help="히스토그램 구간 수 (--range와 함께 사용)")
+    parser.add_argument("--range", action="append", default=[], metavar="SIGNAL=LO:HI",
+                        help="신호별 히스토그램 범위 (예: Solar8000/HR=0:200)")
+    parser.add_argument("-t", "--threshold", action="append", default=[], metavar="SIGNAL<VALUE",
+                        help="조건 시간 비율을 계산할 임계값 (예: Solar8000/PLETH_SPO2<90)")
+    parser.add_argument("--max-hold", type=float, default=DEFAULT_MAX_HOLD, help="샘플 하나의 최대 유지 시간 (초)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="병렬 프로세스 수")
+    parser.add_argument("-o", "--output", help="결과 JSON 파일 (기본: 표준 출력)")
+
+    args = parser.parse_args()
+    try:
+        if not os.path.isdir(args.directory):
+            raise ValueError(f"Directory not found: {args.directory}")
+        case_ids = ([int(c) for c in args.cases.split(",") if c.strip()] if args.cases
+                    else list_case_ids(args.directory))
+        ranges = {}
+        for item in args.range:
+            signal, bounds = item.rsplit("=", 1)
+            lo, hi = (float(v) for v in bounds.split(":"))
+            ranges[signal] = [lo, hi]
+        spec = {"bins": args.bins, "ranges": ranges, "thresholds": parse_thresholds(args.threshold),
+                "max_hold": args.max_hold}
+        percentiles = [float(p) for p in args.percentiles.split(",") if p.strip()]
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"{len(case_ids)}개 케이스, {len(args.signal)}개 신호를 {args.workers}개 프로세스로 집계합니다...",
+          file=sys.stderr)
+    started = time.perf_counter()
+
+    def report(done: int, total: int, failed: Dict[int, str]) -> None:
+        if done % 100 == 0 or done == total:
+            print(f"[{done}/{total}] 처리됨 (실패 {len(failed)}개)", file=sys.stderr)
+
+    with ProcessPoolExecutor(max_workers=max(1, args.workers), mp_context=_pool_context()) as executor:
+        result = aggregate_cohort(args.directory, case_ids, args.signal, spec, percentiles, executor, report)
+    result["elapsed"] = time.perf_counter() - started
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"\n작업 완료: 결과를 {args.output}에 저장했습니다. ({result['elapsed']:.1f}초)", file=sys.stderr)
+    else:
+        print(output)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+파생 신호 (원본 신호에서 계산하는 채널)
+
+파생 신호는 원본 신호처럼 이름으로 요청하며, 요청된 시간 구간(+ 계산에 필요한 앞쪽 여유 구간)의
+입력 샘플만 읽어 NumPy로 벡터화해 계산합니다. 결과는 (케이스, 원본 파일 정보, 이름, 구간) 단위로
+메모리 예산 기반 LRU 캐시에 저장됩니다.
+
+- 고정 채널: DERIVED_SIGNALS (예: Derived/NIBP_MAP, Derived/SHOCK_INDEX)
+  입력이 여러 개면 첫 입력의 샘플 시각에서 계산하고, 나머지 입력은 max_age초 이내의 직전 값을 사용 (LOCF)
+- 함수형 채널: rolling_mean(신호,초) - 직전 N초 이동 평균 (누적합)
+              roc(신호,초) - 직전 N초 동안의 분당 변화율
+  신호 자리에는 다른 파생 신호도 쓸 수 있습니다 (예: rolling_mean(Derived/SHOCK_INDEX,300))
+
+샘플은 (케이스 행 인덱스, float64 값) 쌍으로 다루며, 결측이 아닌 값만 포함합니다.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from cache import LRUCache
+from case_store import time_slice_bounds
+from resampling import resample_locf
+
+# (행 인덱스 int64, 값 float64)
+Samples = Tuple[np.ndarray, np.ndarray]
+
+# 함수형 채널의 최대 창 길이 (초)
+MAX_WINDOW_SECONDS = 24 * 3600
+
+FUNCTION_PATTERN = re.compile(r"^(rolling_mean|roc)\((.+),\s*([0-9]+(?:\.[0-9]+)?)\)$")
+
+
+class DerivedSignal:
+    """파생 신호 정의 (inputs의 샘플로 compute를 계산, lookback은 구간 앞쪽에 더 읽을 시간)"""
+
+    def __init__(self, name: str, inputs: List[str], compute: Callable[[np.ndarray, List[Samples]], Samples],
+                 lookback: float = 0.0, description: str = ""):
+        self.name = name
+        self.inputs = inputs
+        self.compute = compute
+        self.lookback = lookback
+        self.description = description
+
+
+def _empty() -> Samples:
+    return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+
+def _locf(time: np.ndarray, base_rows: np.ndarray, other: Samples, max_age: float) -> np.ndarray:
+    """base_rows 시각의 other 직전 값 (max_age초보다 오래되었거나 없으면 NaN)"""
+    rows, values = other
+    return resample_locf(time[rows].astype(np.float64), values, time[base_rows].astype(np.float64), max_age)
+
+
+def combine(fn: Callable[..., np.ndarray], max_age: float) -> Callable[[np.ndarray, List[Samples]], Samples]:
+    """여러 입력을 첫 입력의 샘플 시각에 맞춰 fn(첫 값, 나머지 값...)으로 계산"""
+    def compute(time: np.ndarray, inputs: List[Samples]) -> Samples:
+        base_rows, base_values = inputs[0]
+        others = [_locf(time, base_rows, other, max_age) for other in inputs[1:]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = fn(base_values, *others)
+        keep = np.isfinite(values)
+        return base_rows[keep], values[keep]
+    return compute
+
+
+def rolling_mean(seconds: float) -> Callable[[np.ndarray, List[Samples]], Samples]:
+    """직전 seconds초 (t - seconds, t] 샘플의 평균 (누적합과 이진 탐색)"""
+    def compute(time: np.ndarray, inputs: List[Samples]) -> Samples:
+        rows, values = inputs[0]
+        t = time[rows].astype(np.float64)
+        keep = np.isfinite(t)
+        rows, values, t = rows[keep], values[keep], t[keep]
+        csum = np.concatenate([[0.0], np.cumsum(values)])
+        first = np.searchsorted(t, t - seconds, side="right")
+        last = np.arange(1, len(t) + 1)
+        return rows, (csum[last] - csum[first]) / (last - first)
+    return compute
+
+
+def rate_of_change(seconds: float) -> Callable[[np.ndarray, List[Samples]], Samples]:
+    """직전 seconds초 창의 첫 샘플 대비 분당 변화율"""
+    def compute(time: np.ndarray, inputs: List[Samples]) -> Samples:
+        rows, values = inputs[0]
+        t = time[rows].astype(np.float64)
+        keep = np.isfinite(t)
+        rows, values, t = rows[keep], values[keep], t[keep]
+        first = np.searchsorted(t, t - seconds, side="left")
+        valid = first < np.arange(len(t))
+        i = np.flatnonzero(valid)
+        j = first[valid]
+        return rows[i], (values[i] - values[j]) / (t[i] - t[j]) * 60.0
+    return compute
+
+
+# 고정 파생 신호 (입력 신호가 모두 있는 케이스의 신호 목록에 포함)
+DERIVED_SIGNALS: Dict[str, DerivedSignal] = {
+    signal.name: signal for signal in [
+        DerivedSignal("Derived/NIBP_MAP", ["Solar8000/NIBP_SBP", "Solar8000/NIBP_DBP"],
+                      combine(lambda sbp, dbp: (sbp + 2 * dbp) / 3, max_age=60), lookback=60,
+                      description="비침습 평균 동맥압 (SBP + 2 * DBP) / 3"),
+        DerivedSignal("Derived/SHOCK_INDEX", ["Solar8000/HR", "Solar8000/NIBP_SBP"],
+                      combine(lambda hr, sbp: np.where(sbp > 0, hr / sbp, np.nan), max_age=600), lookback=600,
+                      description="쇼크 지수 HR / NIBP_SBP (SBP는 10분 이내 측정값)"),
+        DerivedSignal("Derived/ART_SHOCK_INDEX", ["Solar8000/HR", "Solar8000/ART_SBP"],
+                      combine(lambda hr, sbp: np.where(sbp > 0, hr / sbp, np.nan), max_age=10), lookback=10,
+                      description="쇼크 지수 HR / ART_SBP"),
+    ]
+}
+
+
+@lru_cache(maxsize=1024)
+def parse_derived(name: str) -> Optional[DerivedSignal]:
+    """파생 신호 이름을 정의로 변환 (원본 신호 이름이거나 형식이 잘못되었으면 None)"""
+    if name in DERIVED_SIGNALS:
+        return DERIVED_SIGNALS[name]
+    match = FUNCTION_PATTERN.match(name)
+    if match is None:
+        return None
+    function, source, seconds = match.group(1), match.group(2).strip(), float(match.group(3))
+    if not 0 < seconds <= MAX_WINDOW_SECONDS:
+        return None
+    compute = rolling_mean(seconds) if function == "rolling_mean" else rate_of_change(seconds)
+    return DerivedSignal(name, [source], compute, lookback=seconds)
+
+
+def is_derived(name: str) -> bool:
+    return parse_derived(name) is not None
+
+
+def required_signals(name: str) -> Set[str]:
+    """파생 신호 계산에 필요한 원본 신호 (중첩된 파생 신호 포함)"""
+    signal = parse_derived(name)
+    if signal is None:
+        return {name}
+    return set().union(*(required_signals(source) for source in signal.inputs))
+
+
+def available_derived(signal_names: List[str]) -> List[str]:
+    """입력 신호가 모두 있는 고정 파생 신호 목록"""
+    names = set(signal_names)
+    return [name for name in DERIVED_SIGNALS if required_signals(name) <= names]
+
+
+def describe_derived() -> Dict[str, Dict[str, Any]]:
+    """고정 파생 신호 정의 (입력, 설명)"""
+    return {name: {"inputs": s.inputs, "description": s.description} for name, s in DERIVED_SIGNALS.items()}
+
+
+class DerivedEngine:
+    """파생 신호 계산기 (구간별 결과 메모이제이션)"""
+
+    def __init__(self, max_bytes: int, name: str = "derived_signals"):
+        self.cache = LRUCache(max_bytes, sizeof=lambda s: s[0].nbytes + s[1].nbytes, name=name)
+
+    def evaluate(self, case_key: Hashable, name: str, time: np.ndarray,
+                 read_raw: Callable[[str, int, int], Samples],
+                 start_time: Optional[float] = None, end_time: Optional[float] = None) -> Samples:
+        """
+        파생 신호의 [start_time, end_time] 구간 샘플
+
+        Args:
+            case_key: 케이스 식별자 (케이스 ID와 원본 파일 정보, 파일이 바뀌면 캐시 무효화)
+            time: 케이스의 정렬된 시간 배열
+            read_raw: (원본 신호, 행 lo, 행 hi) → 행 [lo, hi)의 결측이 아닌 샘플 (없는 신호면 KeyError)
+        """
+        key = (case_key, name, start_time, end_time)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        signal = parse_derived(name)
+        if signal is None:
+            raise KeyError(name)
+        lo, hi = time_slice_bounds(time, start_time, end_time)
+        if hi <= lo:
+            return _empty()
+
+        # 이동 창/LOCF 계산을 위해 구간 앞쪽 lookback초까지 입력을 읽은 뒤 결과는 구간 안만 남김
+        read_start = None if start_time is None else start_time - signal.lookback
+        read_lo = lo if read_start is None else time_slice_bounds(time, read_start, end_time)[0]
+        inputs = [
+            self.evaluate(case_key, source, time, read_raw, read_start, end_time) if is_derived(source)
+            else read_raw(source, read_lo, hi)
+            for source in signal.inputs
+        ]
+        rows, values = signal.compute(time, inputs)
+        keep = rows >= lo
+        result = (rows[keep].astype(np.int64), values[keep].astype(np.float64))
+        self.cache.put(key, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+신호 다운샘플링 (균등 선택, 구간별 최소/최대, LTTB)
+
+모든 함수는 선택된 포인트의 인덱스를 시간 순서로 반환합니다.
+"""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+DOWNSAMPLING_METHODS = ("uniform", "minmax", "lttb")
+
+
+def uniform_indices(n: int, n_out: int) -> np.ndarray:
+    """전체 구간에서 균등한 간격으로 n_out개 선택"""
+    if n <= n_out:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, n_out, dtype=int))
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    구간마다 최소값과 최대값 포인트를 선택 (스파이크와 급격한 저하 보존)
+    - n_out // 2 개의 구간으로 나누므로 최대 n_out개 반환
+    """
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+
+    n_buckets = max(n_out // 2, 1)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    width = int((ends - starts).max())
+
+    # 구간 길이 차이는 최대 1이므로 (구간 수 x 최대 길이) 행렬로 펼쳐 한 번에 계산
+    idx = starts[:, None] + np.arange(width)[None, :]
+    valid = idx < ends[:, None]
+    idx = np.minimum(idx, n - 1)
+    values = y[idx]
+
+    rows = np.arange(n_buckets)
+    argmin = idx[rows, np.where(valid, values, np.inf).argmin(axis=1)]
+    argmax = idx[rows, np.where(valid, values, -np.inf).argmax(axis=1)]
+    return np.unique(np.concatenate([argmin, argmax]))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링
+    - 첫/마지막 포인트를 유지하고, 각 구간에서 이전 선택점과 다음 구간 평균점이
+      이루는 삼각형 넓이가 가장 큰 포인트를 선택
+    - 구간 내부 계산은 벡터화, 구간 간 의존성 때문에 구간 단위로만 반복
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return uniform_indices(n, n_out)
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    # 다음 구간 평균점은 선택 결과와 무관하므로 누적합으로 미리 계산
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    next_starts = np.append(edges[1:-1], n - 1)
+    next_ends = np.append(edges[2:], n)
+    counts = next_ends - next_starts
+    avg_x = (cx[next_ends] - cx[next_starts]) / counts
+    avg_y = (cy[next_ends] - cy[next_starts]) / counts
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        bx = x[start:end]
+        by = y[start:end]
+        area = np.abs((x[a] - avg_x[i]) * (by - y[a]) - (x[a] - bx) * (avg_y[i] - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def select_indices(x: np.ndarray, y: np.ndarray, n_out: int, method: str) -> np.ndarray:
+    """방법 이름으로 다운샘플링 인덱스 계산"""
+    if method == "uniform":
+        return uniform_indices(len(y), n_out)
+    if method == "minmax":
+        return minmax_indices(y, n_out)
+    if method == "lttb":
+        return lttb_indices(x, y, n_out)
+    raise ValueError(f"Unknown downsampling method: {method}")
+
+
+def split_budget(counts: List[int], total: int) -> List[int]:
+    """
+    total개 포인트를 신호별로 나눔 (합은 total 이하)
+    - 샘플 수가 적은 신호부터 남은 몫을 균등하게 나누고, 쓰지 않은 몫은 나머지 신호에 돌아감
+    """
+    budgets = [0] * len(counts)
+    remaining = total
+    order = sorted(range(len(counts)), key=lambda i: counts[i])
+    for position, i in enumerate(order):
+        budgets[i] = min(counts[i], remaining // (len(order) - position))
+        remaining -= budgets[i]
+    return budgets
+
+
+def downsample_frame(df: pd.DataFrame, resolution: int, method: str) -> pd.DataFrame:
+    """
+    신호별로 결측이 아닌 샘플만 대상으로 다운샘플링한 DataFrame 반환 (결과는 최대 resolution행)
+
+    resolution은 전체 행 예산이며 신호별 결측이 아닌 샘플 수에 맞춰 나눕니다 (split_budget, 시간이 NaN인 행은 제외).
+    결과 행은 모든 신호가 선택한 시간의 합집합이며, 한 신호가 선택하지 않은 행의 값은 NaN입니다.
+    신호 수가 resolution보다 많아 합집합이 예산을 넘으면 합집합에서 균등하게 줄입니다.
+    """
+    signal_columns: List[str] = [col for col in df.columns if col != "time"]
+    if method == "uniform" or not signal_columns:
+        return df.iloc[uniform_indices(len(df), resolution)]
+
+    time = df["time"].to_numpy(dtype=np.float64)
+    keep = np.zeros(len(df), dtype=bool)
+    masks = {}
+
+    finite_time = np.isfinite(time)
+    samples = {col: np.flatnonzero(np.isfinite(df[col].to_numpy(dtype=np.float64)) & finite_time)
+               for col in signal_columns}
+    budgets = split_budget([len(rows) for rows in samples.values()], resolution)
+
+    for (col, rows), budget in zip(samples.items(), budgets):
+        if len(rows) > budget:
+            values = df[col].to_numpy(dtype=np.float64)
+            rows = rows[select_indices(time[rows], values[rows], budget, method)] if budget > 0 else rows[:0]
+        mask = np.zeros(len(df), dtype=bool)
+        mask[rows] = True
+        masks[col] = mask
+        keep |= mask
+
+    rows = np.flatnonzero(keep)
+    if len(rows) > resolution:
+        rows = rows[uniform_indices(len(rows), resolution)]
+    result = df.iloc[rows].copy()
+    for col, mask in masks.items():
+        result[col] = result[col].where(mask[rows])
+    return result
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+DataFrame/배열을 JSON 직렬화 가능한 형태로 변환 (NaN, Infinity → null)
+
+값 검사는 배열 단위로 벡터화되어 있으며, 레코드/키 단위 파이썬 반복을 하지 않습니다.
+float32 열(저장된 신호 값)은 가장 짧은 십진 표현으로 변환하고 (0.800000011920929가 아닌 0.8),
+서버에서 계산한 float64 열(파생 신호, 리샘플링 결과)은 그대로 둡니다.
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# float32의 가장 짧은 십진 표현은 최대 9자리
+FLOAT32_MAX_DIGITS = 9
+
+# 정확히 표현되는 10의 거듭제곱 (10^22까지)
+POW10 = np.array([float(10 ** k) for k in range(23)])
+
+
+def float32_to_float64(values: Any) -> np.ndarray:
+    """
+    float32 값을 가장 짧은 십진 표현의 float64로 변환 (float32(0.8) → 0.8, 단순 변환은 0.800000011920929)
+
+    유효 숫자 1~9자리로 반올림해 float32로 되돌렸을 때 원래 값이 되는 가장 짧은 값을 고릅니다.
+    CSV 값의 유효 숫자가 float32 정밀도(약 7자리) 이내이면 원래 값과 같아집니다.
+    10^±22 배율로 계산할 수 없는 아주 크거나 작은 값만 문자열 변환을 거칩니다.
+    """
+    values = np.asarray(values, dtype=np.float32)
+    result = values.astype(np.float64)
+    idx = np.flatnonzero(np.isfinite(result) & (result != 0))
+    x = result[idx]
+    exponent = np.floor(np.log10(np.abs(x))).astype(np.int64)
+    fallback = []
+    for digits in range(1, FLOAT32_MAX_DIGITS + 1):
+        if len(idx) == 0:
+            break
+        # 정수로 반올림한 뒤 정확한 10의 거듭제곱으로 나누거나 곱해 십진 값에 가장 가까운 float64를 얻음
+        shift = digits - 1 - exponent
+        out_of_range = np.abs(shift) >= len(POW10)
+        fallback.append(idx[out_of_range])
+        scale = POW10[np.minimum(np.abs(shift), len(POW10) - 1)]
+        rounded = np.where(shift >= 0, np.round(x * scale) / scale, np.round(x / scale) * scale)
+        hit = ~out_of_range & (rounded.astype(np.float32) == values[idx])
+        result[idx[hit]] = rounded[hit]
+        rest = ~hit & ~out_of_range
+        idx, x, exponent = idx[rest], x[rest], exponent[rest]
+    fallback = np.concatenate(fallback + [idx])
+    if len(fallback):
+        result[fallback] = values[fallback].astype(str).astype(np.float64)
+    return result
+
+
+def column_to_json(values: Any) -> List[Any]:
+    """
+    배열을 파이썬 리스트로 변환 (NaN, Infinity, -Infinity는 None)
+    - float32 배열은 가장 짧은 십진 표현으로 변환 (float64 배열은 값 그대로)
+    """
+    array = np.asarray(values)
+    if array.dtype.kind in "iub":
+        return array.tolist()
+    if array.dtype == np.float32:
+        with np.errstate(over="ignore", invalid="ignore"):
+            array = float32_to_float64(array)
+    elif array.dtype.kind != "f":
+        array = pd.to_numeric(pd.Series(array), errors="coerce").to_numpy(dtype=np.float64)
+
+    invalid = ~np.isfinite(array)
+    if not invalid.any():
+        return array.tolist()
+    result = array.astype(object)
+    result[invalid] = None
+    return result.tolist()
+
+
+def frame_to_columns(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    열 방향 응답 형태로 변환
+    {"time": [...], "signals": {신호 이름: [...]}}
+    """
+    return {
+        "time": column_to_json(df["time"].to_numpy()) if "time" in df.columns else [],
+        "signals": {
+            col: column_to_json(df[col].to_numpy()) for col in df.columns if col != "time"
+        },
+    }
+
+
+def frame_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """행 방향 응답 형태로 변환 ([{"time": ..., 신호 이름: ...}, ...])"""
+    columns = list(df.columns)
+    values = [column_to_json(df[col].to_numpy()) for col in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def finite_or_none(value: Any) -> Any:
+    """스칼라 값을 float로 변환 (NaN, Infinity는 None)"""
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if np.isfinite(value) else None
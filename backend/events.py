@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+임계값 이벤트 검출과 규칙별 케이스 간 구간 인덱스
+
+규칙(신호, 연산자, 임계값, 최소 지속 시간, 히스테리시스, 최대 샘플 간격)마다 모든 케이스의
+이벤트 구간을 한 번 검출해 data/events/{규칙 키}.npz에 저장합니다. 인덱스는 (케이스 ID, 시작 시각)
+순으로 정렬된 열 배열이므로 "어느 케이스의 어느 구간이 해당하는가" 조회는 신호를 다시 읽지 않고
+배열 마스크만으로 처리됩니다. 원본 파일이 바뀐 케이스만 다시 검출합니다 (크기/수정 시각 기준).
+
+검출은 샘플 단위 런 길이 계산으로 벡터화되어 있습니다.
+- 진입: 값이 조건을 만족 (예: ART_MBP < 65)
+- 종료: 값이 히스테리시스만큼 벗어남 (예: ART_MBP >= 65 + 5), 그 사이 값은 직전 상태 유지
+- max_gap초보다 긴 샘플 간격(측정 안 됨)에서는 이벤트를 끊고 상태를 초기화
+- 이벤트 끝은 조건을 벗어난 첫 샘플 시각 (간격 뒤에서 끝났으면 마지막 조건 샘플 시각)
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import urllib.parse
+from concurrent.futures import Executor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+import numpy as np
+
+from cache import LRUCache
+from cohort import THRESHOLD_OPS, read_case_signals
+
+logger = logging.getLogger(__name__)
+
+# 저장 형식 또는 검출 값 변환이 바뀌면 올려서 저장된 인덱스를 다시 검출
+INDEX_VERSION = 2
+
+# 규칙별 검출 잠금 수 (규칙 해시로 나눠 쓰므로 임의 규칙이 늘어도 잠금 수는 고정)
+RULE_LOCK_STRIPES = 64
+EVENTS_DIR_NAME = "events"
+EVENT_COLUMNS = ("case_id", "start", "end", "extreme", "mean")
+
+
+class EventRule(NamedTuple):
+    """이벤트 검출 규칙"""
+    signal: str
+    op: str
+    threshold: float
+    min_duration: float = 60.0
+    hysteresis: float = 0.0
+    max_gap: float = 60.0
+
+    @property
+    def key(self) -> str:
+        """규칙 인덱스 파일 이름용 키 (숫자는 repr로 정확한 값을 써서 다른 규칙이 같은 키가 되지 않음)"""
+        return (f"{urllib.parse.quote(self.signal, safe='')}_{urllib.parse.quote(self.op, safe='')}"
+                f"{float(self.threshold)!r}_d{float(self.min_duration)!r}_h{float(self.hysteresis)!r}"
+                f"_g{float(self.max_gap)!r}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+# 자주 쓰는 규칙 (이름으로 조회)
+PRESET_RULES = {
+    "hypotension": EventRule("Solar8000/ART_MBP", "<", 65, min_duration=60, hysteresis=5),
+    "desaturation": EventRule("Solar8000/PLETH_SPO2", "<", 90, min_duration=60, hysteresis=2),
+    "tachycardia": EventRule("Solar8000/HR", ">", 100, min_duration=60, hysteresis=5),
+    "bradycardia": EventRule("Solar8000/HR", "<", 50, min_duration=60, hysteresis=5),
+}
+
+
+def _empty_events() -> Dict[str, np.ndarray]:
+    return {"start": np.zeros(0), "end": np.zeros(0), "extreme": np.zeros(0), "mean": np.zeros(0)}
+
+
+def detect_events(time: np.ndarray, values: np.ndarray, rule: EventRule) -> Dict[str, np.ndarray]:
+    """
+    한 신호의 이벤트 구간 검출 (time은 정렬되어 있어야 함, 시간/값이 결측인 샘플은 제외)
+
+    Returns:
+        start, end (초), extreme (이벤트 중 가장 조건에 가까운 쪽 극값: "<"면 최소, ">"면 최대), mean
+    """
+    time = np.asarray(time, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    keep = np.isfinite(time) & np.isfinite(values)
+    t, v = time[keep], values[keep]
+    n = len(t)
+    if n == 0:
+        return _empty_events()
+
+    below = rule.op in ("<", "<=")
+    compare = THRESHOLD_OPS[rule.op]
+    enter = compare(v, rule.threshold)
+    release = ~compare(v, rule.threshold + rule.hysteresis if below else rule.threshold - rule.hysteresis)
+
+    # 1 = 진입, 0 = 종료, -1 = 히스테리시스 구간 (직전 상태 유지), 간격 뒤 첫 샘플은 상태 초기화
+    segment_start = np.concatenate([[True], np.diff(t) > rule.max_gap])
+    marks = np.where(enter, 1, np.where(release, 0, -1))
+    marks[segment_start & (marks < 0)] = 0
+    last_mark = np.maximum.accumulate(np.where(marks >= 0, np.arange(n), 0))
+    state = marks[last_mark] == 1
+
+    # 런 경계: 상태가 바뀌거나 간격으로 끊기는 곳
+    prev_state = np.concatenate([[False], state[:-1]])
+    next_state = np.concatenate([state[1:], [False]])
+    next_break = np.concatenate([segment_start[1:], [True]])
+    first = np.flatnonzero(state & (segment_start | ~prev_state))
+    last = np.flatnonzero(state & (next_break | ~next_state))
+    if len(first) == 0:
+        return _empty_events()
+
+    exits_in_segment = ~next_break[last]
+    end = np.where(exits_in_segment, t[np.minimum(last + 1, n - 1)], t[last])
+    start = t[first]
+    long_enough = end - start >= rule.min_duration
+    first, last, start, end = first[long_enough], last[long_enough], start[long_enough], end[long_enough]
+    if len(first) == 0:
+        return _empty_events()
+
+    # 런별 극값/평균: [first, last] 구간 경계를 교대로 넣고 짝수 번째 reduceat 결과만 사용
+    bounds = np.column_stack([first, last + 1]).ravel()
+    padded = np.concatenate([v, [0.0]])
+    reduce = np.minimum if below else np.maximum
+    return {
+        "start": start,
+        "end": end,
+        "extreme": reduce.reduceat(padded, bounds)[::2],
+        "mean": np.add.reduceat(padded, bounds)[::2] / (last - first + 1),
+    }
+
+
+def detect_case_events(data_dir: str, case_id: int, rule: EventRule) -> Dict[str, np.ndarray]:
+    """워커 프로세스에서 실행: 케이스 하나의 규칙 신호만 읽어 이벤트 검출 (신호가 없으면 빈 결과)"""
+    time_values, columns = read_case_signals(data_dir, case_id, [rule.signal])
+    if rule.signal not in columns:
+        return _empty_events()
+    return detect_events(time_values, columns[rule.signal], rule)
+
+
+def get_index_path(data_dir: str, rule: EventRule) -> str:
+    return os.path.join(data_dir, EVENTS_DIR_NAME, rule.key + ".npz")
+
+
+class EventIndex:
+    """한 규칙의 케이스 간 이벤트 구간 인덱스 ((case_id, start) 순 정렬)"""
+
+    def __init__(self, rule: EventRule, columns: Optional[Dict[str, np.ndarray]] = None,
+                 sources: Optional[Dict[int, Dict[str, int]]] = None, errors: Optional[Dict[int, str]] = None):
+        self.rule = rule
+        self.columns = columns or {"case_id": np.zeros(0, dtype=np.int64), **_empty_events()}
+        # 검출한 케이스 → 원본 파일 정보 (이벤트가 없는 케이스 포함)
+        self.sources = sources or {}
+        self.errors = errors or {}
+
+    @classmethod
+    def load(cls, path: str) -> "EventIndex":
+        with np.load(path) as npz:
+            meta = json.loads(str(npz["meta"]))
+            if meta.get("version") != INDEX_VERSION:
+                raise ValueError(f"Unsupported event index version: {meta.get('version')}")
+            columns = {key: npz[key] for key in EVENT_COLUMNS}
+        return cls(EventRule(**meta["rule"]), columns,
+                   {int(k): v for k, v in meta["sources"].items()},
+                   {int(k): v for k, v in meta["errors"].items()})
+
+    def save(self, path: str) -> None:
+        """임시 파일에 쓴 뒤 이름을 바꿔 저장 (동시 읽기 안전)"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        meta = {"version": INDEX_VERSION, "rule": self.rule.to_dict(),
+                "sources": self.sources, "errors": self.errors}
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), **self.columns)
+        os.replace(tmp_path, path)
+
+    @property
+    def nbytes(self) -> int:
+        """이벤트 배열과 케이스별 원본 파일 정보/오류 목록이 차지하는 메모리 (바이트)"""
+        sources = sum(sys.getsizeof(case_id) + sys.getsizeof(identity)
+                      + sum(sys.getsizeof(value) for value in identity.values())
+                      for case_id, identity in self.sources.items())
+        errors = sum(sys.getsizeof(case_id) + sys.getsizeof(message) for case_id, message in self.errors.items())
+        return (sum(array.nbytes for array in self.columns.values())
+                + sys.getsizeof(self.sources) + sources + sys.getsizeof(self.errors) + errors)
+
+    def stale_cases(self, identities: Dict[int, Dict[str, int]]) -> List[int]:
+        """검출한 적 없거나 원본이 바뀐 케이스"""
+        return [case_id for case_id, identity in identities.items() if self.sources.get(case_id) != identity]
+
+    def replace(self, results: Dict[int, Dict[str, np.ndarray]], identities: Dict[int, Dict[str, int]],
+                errors: Dict[int, str], removed: Set[int] = frozenset()) -> None:
+        """다시 검출한 케이스의 구간을 교체하고 삭제된 케이스의 구간을 제거"""
+        dropped = set(results) | set(errors) | set(removed)
+        keep = ~np.isin(self.columns["case_id"], list(dropped))
+        parts = [{key: array[keep] for key, array in self.columns.items()}]
+        for case_id, events in results.items():
+            parts.append({"case_id": np.full(len(events["start"]), case_id, dtype=np.int64), **events})
+        merged = {key: np.concatenate([part[key] for part in parts]) for key in EVENT_COLUMNS}
+        order = np.lexsort((merged["start"], merged["case_id"]))
+        self.columns = {key: array[order] for key, array in merged.items()}
+
+        for case_id in removed:
+            self.sources.pop(case_id, None)
+            self.errors.pop(case_id, None)
+        for case_id in results:
+            self.sources[case_id] = identities[case_id]
+            self.errors.pop(case_id, None)
+        for case_id, message in errors.items():
+            self.sources[case_id] = identities[case_id]
+            self.errors[case_id] = message
+
+    def query(self, case_ids: Optional[List[int]] = None, start_time: Optional[float] = None,
+              end_time: Optional[float] = None, min_duration: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        조건에 맞는 이벤트 열 배열
+        - start_time/end_time: 케이스 시간 구간과 겹치는 이벤트만
+        - min_duration: 규칙보다 긴 최소 지속 시간으로 추가 필터
+        """
+        columns = self.columns
+        mask = np.ones(len(columns["case_id"]), dtype=bool)
+        if case_ids is not None:
+            mask &= np.isin(columns["case_id"], case_ids)
+        if start_time is not None:
+            mask &= columns["end"] >= start_time
+        if end_time is not None:
+            mask &= columns["start"] <= end_time
+        if min_duration is not None:
+            mask &= columns["end"] - columns["start"] >= min_duration
+        return {key: array[mask] for key, array in columns.items()}
+
+    def case_events(self, case_id: int) -> Dict[str, np.ndarray]:
+        """케이스 하나의 이벤트 (정렬된 case_id 열 이진 탐색)"""
+        ids = self.columns["case_id"]
+        lo, hi = np.searchsorted(ids, case_id, side="left"), np.searchsorted(ids, case_id, side="right")
+        return {key: array[lo:hi] for key, array in self.columns.items()}
+
+
+def events_to_records(events: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """이벤트 열 배열을 응답용 레코드 목록으로 변환"""
+    return [
+        {"case_id": int(c), "start": float(s), "end": float(e), "duration": float(e - s),
+         "extreme": float(x), "mean": float(m)}
+        for c, s, e, x, m in zip(events["case_id"], events["start"], events["end"],
+                                 events["extreme"], events["mean"])
+    ]
+
+
+def summarize_cases(events: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """케이스별 이벤트 수와 총 지속 시간 (케이스 ID 순)"""
+    ids = events["case_id"]
+    if len(ids) == 0:
+        return []
+    bounds = np.flatnonzero(np.concatenate([[True], ids[1:] != ids[:-1]]))
+    counts = np.diff(np.concatenate([bounds, [len(ids)]]))
+    durations = np.add.reduceat(events["end"] - events["start"], bounds)
+    return [{"case_id": int(c), "events": int(n), "total_duration": float(d)}
+            for c, n, d in zip(ids[bounds], counts, durations)]
+
+
+class EventIndexStore:
+    """
+    규칙별 이벤트 인덱스 (메모리 → 저장된 파일 → 새로 검출 순서로 찾고, 바뀐 케이스만 다시 검출)
+
+    메모리의 인덱스는 max_bytes 예산의 LRU 캐시에 둡니다. 파일로 저장하는 것은 persisted_rules
+    (기본 PRESET_RULES)뿐이며, 요청마다 달라지는 임의 규칙은 메모리에만 두고 밀려나면 다시 검출하므로
+    data/events/의 파일 수가 클라이언트 입력에 따라 늘지 않습니다.
+    """
+
+    def __init__(self, data_dir: str, max_bytes: int = 64 * 1024 * 1024,
+                 persisted_rules: Optional[Iterable[EventRule]] = None):
+        self.data_dir = data_dir
+        self.persisted_rules = set(PRESET_RULES.values() if persisted_rules is None else persisted_rules)
+        self._indexes = LRUCache(max_bytes, sizeof=lambda index: index.nbytes, name="event_indexes")
+        self._locks = [threading.Lock() for _ in range(RULE_LOCK_STRIPES)]
+        self.detected_cases = 0
+
+    def _rule_lock(self, rule: EventRule) -> threading.Lock:
+        return self._locks[hash(rule) % len(self._locks)]
+
+    def _load(self, rule: EventRule) -> EventIndex:
+        path = get_index_path(self.data_dir, rule)
+        if rule in self.persisted_rules and os.path.exists(path):
+            try:
+                index = EventIndex.load(path)
+                if index.rule == rule:
+                    return index
+            except Exception as e:
+                logger.warning(f"Failed to load event index {path}: {e}")
+        return EventIndex(rule)
+
+    def get(self, rule: EventRule, identities: Dict[int, Dict[str, int]], executor: Executor,
+            complete: bool = False, without_signal: Set[int] = frozenset()) -> EventIndex:
+        """
+        identities의 케이스가 모두 최신인 인덱스 반환
+
+        Args:
+            identities: 케이스 ID → 원본 파일 정보
+            executor: 바뀐 케이스를 검출할 프로세스 풀
+            complete: identities가 전체 케이스 목록인지 여부 (True면 없는 케이스의 구간 제거)
+            without_signal: 규칙 신호가 없는 것으로 알려진 케이스 (읽지 않고 빈 결과로 기록)
+        """
+        with self._rule_lock(rule):
+            index = self._indexes.get(rule)
+            if index is None:
+                index = self._load(rule)
+                self._indexes.put(rule, index)
+
+            stale = index.stale_cases(identities)
+            removed = set(index.sources) - set(identities) if complete else set()
+            if not stale and not removed:
+                return index
+
+            results = {case_id: _empty_events() for case_id in stale if case_id in without_signal}
+            errors: Dict[int, str] = {}
+            futures = {executor.submit(detect_case_events, self.data_dir, case_id, rule): case_id
+                       for case_id in stale if case_id not in without_signal}
+            for future in as_completed(futures):
+                case_id = futures[future]
+                try:
+                    results[case_id] = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    errors[case_id] = str(e)
+            self.detected_cases += len(futures)
+
+            index.replace(results, identities, errors, removed)
+            # 크기가 바뀌었으므로 다시 넣어 예산을 맞춤
+            self._indexes.put(rule, index)
+            logger.info(f"Event index {rule.key} updated: {len(stale)} cases scanned, "
+                        f"{len(removed)} removed, {len(index.columns['case_id'])} events")
+            if rule in self.persisted_rules:
+                try:
+                    index.save(get_index_path(self.data_dir, rule))
+                except Exception as e:
+                    logger.warning(f"Failed to save event index {rule.key}: {e}")
+            return index
+
+    def stats(self) -> Dict[str, Any]:
+        indexes = self._indexes.values()
+        return {
+            "cache": self._indexes.stats(),
+            "rules": [{"key": i.rule.key, "cases": len(i.sources), "events": len(i.columns["case_id"]),
+                       "errors": len(i.errors)} for i in indexes],
+            "nbytes": sum(i.nbytes for i in indexes),
+            "detected_cases": self.detected_cases,
+        }
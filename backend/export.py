@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+케이스 전체 해상도 스트리밍 내보내기 (NDJSON, CSV, 선택적 gzip)
+
+케이스를 고정 크기 행 청크로 나누어 청크마다 문자열로 변환해 바로 내보내므로,
+메모리 사용량은 케이스 길이와 상관없이 청크 하나 분량으로 일정하고 첫 바이트는 즉시 전송됩니다.
+신호 값은 저장 정밀도(float32)의 가장 짧은 표현으로 출력합니다 (59.900001525878906이 아닌 59.9).
+"""
+
+import csv
+import io
+import json
+import zlib
+from typing import Callable, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def format_column(values: np.ndarray, missing: str, is_signal: bool = True) -> np.ndarray:
+    """
+    배열을 값 문자열 배열로 변환 (NaN, Infinity는 missing)
+    - 신호 값은 float32로 되돌려 가장 짧은 표현으로 변환하며, 결측이 아닌 값만 변환함
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "iub":
+        return values.astype(str).astype(object)
+    if is_signal:
+        values = values.astype(np.float32)
+    out = np.full(len(values), missing, dtype=object)
+    valid = np.isfinite(values)
+    out[valid] = values[valid].astype(str)
+    return out
+
+
+def _rows(df: pd.DataFrame, missing: str) -> Iterator[tuple]:
+    columns = [format_column(df[col].to_numpy(), missing, col != "time") for col in df.columns]
+    return zip(*columns)
+
+
+def ndjson_chunk(df: pd.DataFrame) -> str:
+    """청크를 한 행당 JSON 객체 한 줄로 변환 ({"time": ..., 신호 이름: ...})"""
+    keys = [json.dumps(col, ensure_ascii=False).replace("%", "%%") for col in df.columns]
+    template = "{" + ",".join(f"{key}:%s" for key in keys) + "}\n"
+    return "".join(template % row for row in _rows(df, "null"))
+
+
+def csv_header(columns: List[str]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(columns)
+    return buffer.getvalue()
+
+
+def csv_chunk(df: pd.DataFrame) -> str:
+    """청크를 CSV 행으로 변환 (결측은 빈 칸, 헤더 제외)"""
+    return "".join(",".join(row) + "\n" for row in _rows(df, ""))
+
+
+def iter_export(read_rows: Callable[[int, int], pd.DataFrame], lo: int, hi: int, columns: List[str],
+                fmt: str, gzip: bool = False, chunk_rows: int = 5000) -> Iterator[bytes]:
+    """
+    행 [lo, hi)를 chunk_rows 행씩 읽어 인코딩한 바이트 청크를 생성
+
+    Args:
+        read_rows: (시작 행, 끝 행) → time 열과 columns 신호를 담은 DataFrame
+        columns: 헤더에 쓸 열 이름 (time 포함)
+        fmt: "ndjson" 또는 "csv"
+        gzip: gzip 스트림으로 압축 (청크마다 flush해 받는 쪽에서 바로 풀 수 있음)
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+
+    def emit(text: str) -> bytes:
+        data = text.encode("utf-8")
+        if compressor is None:
+            return data
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    if fmt == "csv":
+        yield emit(csv_header(columns))
+    encode_chunk = csv_chunk if fmt == "csv" else ndjson_chunk
+
+    for start in range(lo, hi, chunk_rows):
+        chunk = read_rows(start, min(start + chunk_rows, hi))
+        yield emit(encode_chunk(chunk))
+
+    if compressor is not None:
+        yield compressor.flush()
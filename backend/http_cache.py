@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HTTP 조건부 요청(ETag, Last-Modified)과 ETag 기준 서버 응답 캐시
+
+ETag는 원본 파일 정보(크기, 수정 시각)와 정규화된 요청 파라미터, 응답 형식으로 만든 강한 검증자입니다.
+데이터 파일이 바뀌지 않는 한 같은 요청은 같은 ETag를 가지므로, If-None-Match가 일치하면
+데이터를 읽지 않고 304로 응답하고, 서버 응답 캐시에 있으면 다시 계산하지 않고 저장된 본문을 보냅니다.
+"""
+
+import hashlib
+import json
+from email.utils import formatdate
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from cache import LRUCache
+
+# 응답 형식이 바뀌면 올려서 이전 ETag를 무효화
+RESPONSE_VERSION = 5
+
+# 캐시된 응답에서 복사할 헤더
+CACHED_HEADERS = ("content-type", "vary", "cache-control")
+
+
+def make_etag(endpoint: str, identity: Any, params: Dict[str, Any]) -> str:
+    """엔드포인트, 원본 파일 정보, 파라미터로 강한 ETag 생성 ("..." 형태)"""
+    key = json.dumps([RESPONSE_VERSION, endpoint, identity, params], sort_keys=True, default=str)
+    return '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def last_modified(mtime_ns: Optional[int]) -> Optional[str]:
+    """수정 시각(ns)을 HTTP 날짜 형식으로 변환"""
+    if mtime_ns is None:
+        return None
+    return formatdate(mtime_ns / 1e9, usegmt=True)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 확인 (약한 비교, "*" 포함)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """ETag → 응답 본문/헤더 캐시 (메모리 예산 기반 LRU)"""
+
+    def __init__(self, max_bytes: int, name: str = "responses"):
+        self._cache = LRUCache(max_bytes, sizeof=lambda entry: len(entry[0]), name=name)
+
+    def _validators(self, etag: str, modified: Optional[str]) -> Dict[str, str]:
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if modified:
+            headers["Last-Modified"] = modified
+        return headers
+
+    def lookup(self, request: Request, etag: str, modified: Optional[str] = None) -> Optional[Response]:
+        """
+        ETag가 일치하면 304, 캐시에 있으면 저장된 응답, 둘 다 아니면 None
+        """
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=self._validators(etag, modified))
+        entry = self._cache.get(etag)
+        if entry is None:
+            return None
+        body, status_code, headers = entry
+        return Response(body, status_code=status_code, headers=headers)
+
+    def store(self, response: Response, etag: str, modified: Optional[str] = None) -> Response:
+        """응답에 ETag/Last-Modified를 붙이고 캐시에 저장 (성공 응답만)"""
+        response.headers.update(self._validators(etag, modified))
+        if response.status_code == 200:
+            headers = {k: v for k, v in response.headers.items() if k in CACHED_HEADERS}
+            headers.update(self._validators(etag, modified))
+            self._cache.put(etag, (bytes(response.body), response.status_code, headers))
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+이벤트 루프 밖에서 케이스를 로드하는 스레드 풀 (케이스별 single-flight)
+
+같은 케이스에 대한 동시 요청은 하나의 Future를 공유하므로 파일은 한 번만 파싱됩니다.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlightLoader:
+    """크기가 제한된 스레드 풀 + 키별 진행 중 Future 공유"""
+
+    def __init__(self, max_workers: int, name: str = "loader"):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.running = 0
+        self.started = 0
+        self.shared = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.total_wait_seconds = 0.0
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Future:
+        """키에 대한 로드를 시작하거나, 이미 진행 중이면 그 Future를 반환"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.shared += 1
+                return future
+            self.queued += 1
+            future = self._executor.submit(self._run, fn, args, time.perf_counter())
+            self._inflight[key] = future
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return future
+
+    async def load(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """이벤트 루프를 막지 않고 로드 결과를 기다림"""
+        return await asyncio.wrap_future(self.submit(key, fn, *args))
+
+    def _forget(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _run(self, fn: Callable[..., Any], args: tuple, submitted_at: float) -> Any:
+        started_at = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.started += 1
+            self.total_wait_seconds += started_at - submitted_at
+        try:
+            result = fn(*args)
+            ok = True
+            return result
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                self.running -= 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 깊이, 실행 중인 로드 수, 로드 시간 통계"""
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "running": self.running,
+                "inflight_keys": len(self._inflight),
+                "started": self.started,
+                "shared": self.shared,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_load_seconds": self.total_seconds / finished if finished else None,
+                "max_load_seconds": self.max_seconds,
+                "avg_queue_wait_seconds": self.total_wait_seconds / self.started if self.started else None,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,14 +1,39 @@
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, Path, Query, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 import pandas as pd
 import numpy as np
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import os
 import logging
-from pydantic import BaseModel
+import threading
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pydantic import BaseModel, Field
 import json
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.encoders import jsonable_encoder
+from case_store import CaseStore, get_store_dir, source_identity, time_slice_bounds, HEADER_FILE
+from cache import LRUCache
+from downsampling import downsample_frame
+from tiles import SignalPyramid, get_pyramid_path, MAX_LEVEL, MAX_TILE_INDEX, TILE_BUCKETS
+from encoding import frame_to_columns, frame_to_records, finite_or_none, float32_to_float64
+from wire_format import negotiate, encode, MEDIA_TYPE_JSON
+from range_stats import SignalStatsIndex
+from quantile_sketch import percentile_key
+from clinical_store import ClinicalInfoStore
+from manifest import DatasetManifest
+from loader import SingleFlightLoader
+from sparse_case import SparseCase
+from export import iter_export, EXPORT_MEDIA_TYPES
+from http_cache import ResponseCache, make_etag, last_modified
+from replay import ReplayHub, ReplayChannel, sse_event
+from prewarm import AccessLog, Prewarmer, parse_case_list, ACCESS_LOG_FILE
+from cohort import CohortRunner, list_case_ids
+from derived import DerivedEngine, Samples, is_derived, required_signals, available_derived, describe_derived
+from resampling import bucket_edges, fixed_grid, resample
+from events import EventIndexStore, EventRule, PRESET_RULES, events_to_records, summarize_cases
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -35,7 +60,23 @@ class CustomJSONResponse(JSONResponse):
             cls=CustomJSONEncoder,
         ).encode("utf-8")
 
-app = FastAPI(title="VitalLab API", default_response_class=CustomJSONResponse)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작 시 백그라운드 작업 시작 (준비 완료를 늦추지 않음)"""
+    # 데이터셋 매니페스트는 바뀐 케이스만 백그라운드에서 갱신
+    dataset_manifest.refresh_in_background(force=True)
+    # 접근 기록은 주기적으로 저장하고, 예열할 케이스는 백그라운드에서 하나씩 로드
+    stop_autosave = threading.Event()
+    threading.Thread(target=access_log.autosave, args=(ACCESS_LOG_SAVE_INTERVAL, stop_autosave), daemon=True).start()
+    start_prewarm()
+    yield
+    stop_autosave.set()
+    access_log.save()
+    case_loader.shutdown()
+    batch_executor.shutdown(wait=False, cancel_futures=True)
+    cohort_runner.shutdown()
+
+app = FastAPI(title="VitalLab API", default_response_class=CustomJSONResponse, lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -46,8 +87,75 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 임상 정보를 위한 캐시
-clinical_info_cache = {}
+# 데이터 디렉토리 (케이스 CSV, clinical_info.csv, 변환된 저장소)
+DATA_DIR = os.environ.get("VITALAB_DATA_DIR", "data")
+
+# 케이스 데이터 캐시의 메모리 예산 (바이트)
+CACHE_MAX_BYTES = int(os.environ.get("VITALAB_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+# 타일 피라미드 캐시의 메모리 예산 (바이트)
+PYRAMID_CACHE_MAX_BYTES = int(os.environ.get("VITALAB_PYRAMID_CACHE_MAX_BYTES", 128 * 1024 * 1024))
+
+# 구간 통계 인덱스 캐시의 메모리 예산 (바이트)
+STATS_INDEX_CACHE_MAX_BYTES = int(os.environ.get("VITALAB_STATS_INDEX_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# 파생 신호 계산 결과 캐시의 메모리 예산 (바이트)
+DERIVED_CACHE_MAX_BYTES = int(os.environ.get("VITALAB_DERIVED_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# 메모리에 두는 이벤트 인덱스의 메모리 예산 (바이트)
+EVENT_INDEX_CACHE_MAX_BYTES = int(os.environ.get("VITALAB_EVENT_INDEX_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# 리샘플링 응답의 최대 격자 포인트 수
+RESAMPLE_MAX_POINTS = int(os.environ.get("VITALAB_RESAMPLE_MAX_POINTS", 1_000_000))
+
+# 케이스 로드 스레드 수 (동시에 파싱하는 CSV 수의 상한)
+LOADER_WORKERS = int(os.environ.get("VITALAB_LOADER_WORKERS", 4))
+
+# 일괄 조회에서 케이스별 계산을 실행하는 스레드 수와 한 번에 요청할 수 있는 최대 케이스 수
+BATCH_WORKERS = int(os.environ.get("VITALAB_BATCH_WORKERS", 4))
+BATCH_MAX_CASES = int(os.environ.get("VITALAB_BATCH_MAX_CASES", 100))
+
+# ETag 기준 서버 응답 캐시의 메모리 예산 (바이트)
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("VITALAB_RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# 서버 시작 후 예열할 케이스 (쉼표로 구분, 지정하면 접근 기록 상위 N개 대신 사용)
+PREWARM_CASES = parse_case_list(os.environ.get("VITALAB_PREWARM_CASES", ""))
+
+# 지정된 목록이 없을 때 예열할 접근 기록 상위 케이스 수 (0이면 예열하지 않음)
+PREWARM_TOP_N = int(os.environ.get("VITALAB_PREWARM_TOP_N", 10))
+
+# 케이스 접근 기록 저장 주기 (초)
+ACCESS_LOG_SAVE_INTERVAL = float(os.environ.get("VITALAB_ACCESS_LOG_SAVE_INTERVAL", 30))
+
+# 스트리밍 내보내기에서 한 번에 읽고 인코딩하는 행 수
+EXPORT_CHUNK_ROWS = int(os.environ.get("VITALAB_EXPORT_CHUNK_ROWS", 5000))
+
+# 코호트 집계 워커 프로세스 수 (워커 하나가 한 번에 케이스 하나만 메모리에 올림)
+COHORT_WORKERS = int(os.environ.get("VITALAB_COHORT_WORKERS", os.cpu_count() or 1))
+
+# 데이터셋 매니페스트 갱신 확인 주기 (초)
+MANIFEST_REFRESH_INTERVAL = float(os.environ.get("VITALAB_MANIFEST_REFRESH_INTERVAL", 5))
+
+# 임상 정보 색인 (clinical_info.csv가 바뀌면 자동으로 다시 로드)
+clinical_info_store = ClinicalInfoStore(os.path.join(DATA_DIR, "clinical_info.csv"))
+
+# 이벤트 루프 밖에서 케이스를 로드하는 스레드 풀 (같은 케이스 동시 요청은 로드 하나를 공유)
+case_loader = SingleFlightLoader(LOADER_WORKERS, name="case-loader")
+
+# 케이스 목록/신호 목록용 매니페스트 (데이터 파일을 읽지 않고 응답)
+dataset_manifest = DatasetManifest(DATA_DIR, MANIFEST_REFRESH_INTERVAL)
+
+# 케이스별 접근 횟수 (예열 대상 선정용, data/access_log.json에 저장)
+access_log = AccessLog(os.path.join(DATA_DIR, ACCESS_LOG_FILE))
+
+# 일괄 조회의 케이스별 다운샘플링/통계 계산용 스레드 풀
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="batch")
+
+# 코호트 집계 작업 (케이스 데이터 캐시를 거치지 않고 프로세스 풀에서 케이스별 부분 집계)
+cohort_runner = CohortRunner(DATA_DIR, COHORT_WORKERS)
+
+# 규칙별 케이스 간 이벤트 구간 인덱스 (data/events/에 저장, 검출은 코호트 프로세스 풀에서 실행)
+event_index_store = EventIndexStore(DATA_DIR, EVENT_INDEX_CACHE_MAX_BYTES)
 
 # 더미 데이터 생성 함수
 def generate_dummy_data(case_id: int):
@@ -70,8 +178,33 @@ def generate_dummy_data(case_id: int):
     
     return data
 
-# 데이터 캐시 (메모리 최적화)
-data_cache: Dict[int, pd.DataFrame] = {}
+# 서버 시작 후 캐시 예열 진행 상황
+prewarmer = Prewarmer(lambda case_id: prewarm_case(case_id))
+
+# 데이터 캐시 (신호별 희소 표현, 메모리 예산을 넘으면 오래된 케이스부터 제거)
+data_cache = LRUCache(CACHE_MAX_BYTES, sizeof=lambda case: case.nbytes, name="case_data")
+
+# 요청 처리 중 사용하는 케이스 (ensure_case_loaded가 고정, 캐시 예산보다 커서 캐시되지 않은 케이스도
+# 요청 안에서는 다시 파싱하지 않고, 요청 도중 파일이 바뀌어도 한 요청은 같은 데이터로 응답)
+request_cases: contextvars.ContextVar[Dict[int, SparseCase]] = contextvars.ContextVar("request_cases", default={})
+
+# memmap 저장소 캐시 (배열은 OS 페이지 캐시를 통해 워커 간 공유)
+store_cache: Dict[int, CaseStore] = {}
+
+# (케이스 ID, 신호) 별 타일 피라미드 캐시
+pyramid_cache = LRUCache(PYRAMID_CACHE_MAX_BYTES, sizeof=lambda p: p.nbytes, name="tile_pyramids")
+
+# (케이스 ID, 신호) 별 구간 통계 인덱스 캐시
+stats_index_cache = LRUCache(STATS_INDEX_CACHE_MAX_BYTES, sizeof=lambda i: i.nbytes, name="stats_indexes")
+
+# 케이스 재생 생산자 (같은 설정의 시청자는 생산자 하나를 공유)
+replay_hub = ReplayHub()
+
+# ETag → 응답 본문 캐시 (데이터 파일이 바뀌면 ETag가 달라져 자연히 무효화)
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES, name="responses")
+
+# 파생 신호 계산기 (케이스/구간별 결과 메모이제이션)
+derived_engine = DerivedEngine(DERIVED_CACHE_MAX_BYTES)
 
 class ClinicalInfo(BaseModel):
     """환자 임상 정보 모델"""
@@ -86,16 +219,39 @@ class ClinicalInfo(BaseModel):
     dx: Optional[str] = None
     opname: Optional[str] = None
 
-def get_data_for_case(case_id: int) -> pd.DataFrame:
-    """케이스 ID에 따른 데이터 로드 또는 생성"""
-    if case_id in data_cache:
-        return data_cache[case_id]
+def get_cached_case(case_id: int) -> Optional[SparseCase]:
+    """캐시된 케이스 반환 (원본 CSV가 로드 이후 바뀌었으면 캐시에서 제거하고 None)"""
+    case = data_cache.get(case_id)
+    if case is not None and case.source != get_source_identity(case_id):
+        logger.info(f"Source for case {case_id} changed, evicting cached data")
+        data_cache.pop(case_id)
+        return None
+    return case
+
+def get_data_for_case(case_id: int) -> SparseCase:
+    """
+    케이스 ID에 따른 데이터 로드 또는 생성
+    - 신호별 (행 인덱스, float32 값) 희소 표현으로 캐시하며, 조밀한 DataFrame은 get_case_frame에서 필요한 만큼만 생성
+    - 캐시된 케이스는 원본 CSV 크기/수정 시각이 로드 시점과 같을 때만 사용
+    - 현재 요청에 고정된 케이스가 있으면 그 케이스를 사용
+    """
+    pinned = request_cases.get().get(case_id)
+    if pinned is not None:
+        return pinned
+    cached = get_cached_case(case_id)
+    if cached is not None:
+        return cached
         
     # 1. 실제 데이터 파일 확인
-    file_path = f"data/{case_id}.csv"
+    file_path = os.path.join(DATA_DIR, f"{case_id}.csv")
     if os.path.exists(file_path):
         logger.info(f"Loading data from file: {file_path}")
+        # 읽기 전에 파일 정보를 기록해 읽는 도중 바뀌면 다음 요청에서 다시 로드
+        identity = source_identity(file_path)
         df = pd.read_csv(file_path)
+        # 시간 구간 이진 탐색을 위해 시간순 정렬 유지
+        if not df["time"].is_monotonic_increasing:
+            df = df.sort_values("time", kind="stable", ignore_index=True)
     else:
         # 2. 파일이 없으면 더미 데이터 생성
         logger.info(f"Generating dummy data for case: {case_id}")
@@ -103,57 +259,313 @@ def get_data_for_case(case_id: int) -> pd.DataFrame:
         df = pd.DataFrame(dummy_data)
         
         # 데이터 저장 (선택적)
-        os.makedirs("data", exist_ok=True)
+        os.makedirs(DATA_DIR, exist_ok=True)
         df.to_csv(file_path, index=False)
         logger.info(f"Saved dummy data to: {file_path}")
+        identity = source_identity(file_path)
     
     # 캐시에 데이터 저장
-    data_cache[case_id] = df
-    return df
+    case = SparseCase.from_frame(df, identity)
+    data_cache.put(case_id, case)
+    return case
 
-def load_clinical_info_from_csv() -> Dict[str, ClinicalInfo]:
-    """clinical_info.csv 파일에서 모든 임상 정보 로드"""
-    file_path = "data/clinical_info.csv"
-    if not os.path.exists(file_path):
-        logger.warning(f"Clinical info file not found: {file_path}")
-        return {}
-    
+async def ensure_case_loaded(case_id: int) -> None:
+    """
+    CSV 기반 케이스를 이벤트 루프 밖에서 로드해 캐시에 올리고 현재 요청에 고정
+    - 저장소(memmap)가 있으면 바로 반환
+    - 같은 케이스를 동시에 요청하면 하나의 로드를 함께 기다림
+    - 고정된 케이스는 요청이 끝날 때까지 get_data_for_case가 사용 (캐시에 들어가지 못해도 다시 파싱하지 않음)
+    """
+    access_log.record(case_id)
+    if get_case_store(case_id) is not None:
+        return
+    case = get_cached_case(case_id)
+    if case is None:
+        case = await case_loader.load(case_id, get_data_for_case, case_id)
+    request_cases.set({**request_cases.get(), case_id: case})
+
+async def run_in_request_context(executor: Optional[ThreadPoolExecutor], fn, *args):
+    """현재 요청에 고정된 케이스를 유지한 채 스레드 풀에서 fn 실행"""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(executor, context.run, fn, *args)
+
+def prewarm_case(case_id: int) -> None:
+    """
+    예열용 케이스 로드 (예열 스레드에서 호출, 케이스 로드 스레드 풀을 거쳐 요청과 로드를 공유)
+    - 데이터 파일이 없는 케이스는 더미 데이터를 만들지 않고 실패로 처리
+    """
+    if get_case_store(case_id) is not None:
+        return
+    if not os.path.exists(os.path.join(DATA_DIR, f"{case_id}.csv")):
+        raise FileNotFoundError(f"No data file for case {case_id}")
+    if get_cached_case(case_id) is not None:
+        return
+    case_loader.submit(case_id, get_data_for_case, case_id).result()
+
+def start_prewarm() -> None:
+    """지정된 케이스 목록 또는 접근 기록 상위 N개 케이스의 예열 시작 (캐시에서 제거가 시작되면 중단)"""
+    case_ids = PREWARM_CASES or access_log.top(PREWARM_TOP_N)
+    evictions_at_start = data_cache.stats()["evictions"]
+    prewarmer.should_stop = lambda: data_cache.stats()["evictions"] > evictions_at_start
+    prewarmer.start(case_ids)
+
+def get_case_store(case_id: int) -> Optional[CaseStore]:
+    """변환된 memmap 저장소 반환 (없거나 원본 CSV보다 오래되었으면 None)"""
+    store_dir = get_store_dir(DATA_DIR, case_id)
+    if not os.path.exists(os.path.join(store_dir, HEADER_FILE)):
+        store_cache.pop(case_id, None)
+        return None
+
+    csv_path = os.path.join(DATA_DIR, f"{case_id}.csv")
+    store = store_cache.get(case_id)
     try:
-        df = pd.read_csv(file_path)
-        result = {}
-        
-        for _, row in df.iterrows():
-            case_id = str(row.get('caseid'))
-            if case_id:
-                info = ClinicalInfo(
-                    caseid=case_id,
-                    age=str(row.get('age')) if not pd.isna(row.get('age')) else None,
-                    sex=row.get('sex') if not pd.isna(row.get('sex')) else None,
-                    height=str(row.get('height')) if not pd.isna(row.get('height')) else None,
-                    weight=str(row.get('weight')) if not pd.isna(row.get('weight')) else None,
-                    bmi=str(row.get('bmi')) if not pd.isna(row.get('bmi')) else None,
-                    asa=str(row.get('asa')) if not pd.isna(row.get('asa')) else None,
-                    department=row.get('department') if not pd.isna(row.get('department')) else None,
-                    dx=row.get('dx') if not pd.isna(row.get('dx')) else None,
-                    opname=row.get('opname') if not pd.isna(row.get('opname')) else None
-                )
-                result[case_id] = info
-        
-        logger.info(f"Loaded clinical info for {len(result)} cases")
-        return result
+        if store is None or not store.is_fresh(csv_path):
+            store = CaseStore(store_dir)
+            if not store.is_fresh(csv_path):
+                logger.info(f"Store for case {case_id} is stale, falling back to CSV")
+                store_cache.pop(case_id, None)
+                return None
+            store_cache[case_id] = store
     except Exception as e:
-        logger.error(f"Error loading clinical info file: {e}")
-        return {}
-
-def get_clinical_info(case_id: int) -> ClinicalInfo:
-    """케이스 ID에 따른 임상 정보 반환"""
-    # 캐시에 데이터가 없으면 CSV 파일에서 로드
-    if not clinical_info_cache:
-        clinical_info_cache.update(load_clinical_info_from_csv())
+        logger.warning(f"Failed to open store for case {case_id}: {e}")
+        store_cache.pop(case_id, None)
+        return None
+    return store
+
+def get_case_frame(
+    case_id: int,
+    signals: Optional[List[str]] = None,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None
+) -> pd.DataFrame:
+    """
+    time 열과 요청된 신호, [start_time, end_time] 구간만 담은 DataFrame 반환
+    - 저장소가 있으면 요청된 신호 파일의 해당 구간만 memmap으로 읽음
+    - 없으면 캐시된 희소 표현에서 요청된 신호와 구간만 조밀하게 변환
+    - 구간은 정렬된 time 열의 이진 탐색으로 찾음 (전체 불리언 마스크 스캔 없음)
+    """
+    store = get_case_store(case_id)
+    if store is not None:
+        return store.to_frame(signals, start_time, end_time)
+
+    return get_data_for_case(case_id).to_frame(signals, start_time, end_time)
+
+def get_case_reader(case_id: int):
+    """행 구간 단위로 읽을 수 있는 케이스 데이터 (저장소 또는 캐시된 희소 표현, 둘 다 time/row_frame 제공)"""
+    store = get_case_store(case_id)
+    if store is not None:
+        return store
+    return get_data_for_case(case_id)
+
+def read_signal_rows(case_id: int, signal: str, lo: int, hi: int) -> Samples:
+    """
+    원본 신호의 행 [lo, hi) 중 결측이 아닌 샘플 (행 인덱스, float64 값) 반환 (없는 신호면 KeyError)
+    - float32로 저장된 값은 가장 짧은 십진 표현으로 변환 (CSV 값과 같게)
+    """
+    store = get_case_store(case_id)
+    if store is not None:
+        if signal not in store.signals:
+            raise KeyError(signal)
+        values = store.column(signal)[lo:hi]
+        rows = np.flatnonzero(np.isfinite(values))
+        return rows + lo, float32_to_float64(values[rows])
+
+    case = get_data_for_case(case_id)
+    if signal not in case.signals:
+        raise KeyError(signal)
+    sparse = case.signals[signal]
+    a, b = sparse.row_range(lo, hi)
+    return sparse.rows[a:b].astype(np.int64), float32_to_float64(sparse.values[a:b])
+
+def is_signal_available(signal: str, names: List[str]) -> bool:
+    """원본 신호이거나 입력 신호가 모두 있는 파생 신호인지 확인"""
+    return signal in names or (is_derived(signal) and required_signals(signal) <= set(names))
+
+def get_derived_samples(case_id: int, signal: str, start_time: Optional[float] = None,
+                        end_time: Optional[float] = None) -> Samples:
+    """파생 신호의 구간 샘플 (행 인덱스, 값) - 필요한 입력 구간만 읽어 계산하고 결과는 케이스/구간별로 캐시"""
+    if not is_signal_available(signal, get_signal_names(case_id)):
+        raise KeyError(signal)
+    identity = get_source_identity(case_id) or {}
+    case_key = (case_id, identity.get("size"), identity.get("mtime_ns"))
+    return derived_engine.evaluate(case_key, signal, get_case_time(case_id),
+                                   lambda name, lo, hi: read_signal_rows(case_id, name, lo, hi),
+                                   start_time, end_time)
+
+def add_derived_columns(case_id: int, df: pd.DataFrame, signals: List[str],
+                        start_time: Optional[float], end_time: Optional[float]) -> pd.DataFrame:
+    """get_case_frame 결과에 파생 신호 열 추가 (입력 신호가 없는 파생 신호는 제외)"""
+    names = get_signal_names(case_id)
+    lo, _ = time_slice_bounds(get_case_time(case_id), start_time, end_time)
+    for signal in signals:
+        if not is_signal_available(signal, names):
+            continue
+        rows, values = get_derived_samples(case_id, signal, start_time, end_time)
+        column = np.full(len(df), np.nan)
+        column[rows - lo] = values
+        df[signal] = column
+    return df
+
+def get_window_samples(case_id: int, signal: str, start_time: Optional[float],
+                       end_time: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """신호(파생 신호 포함)의 [start_time, end_time] 구간 중 결측이 아닌 샘플 (시간, 값), 시간이 NaN인 샘플은 제외"""
+    time_values = get_case_time(case_id)
+    if signal not in get_signal_names(case_id) and is_derived(signal):
+        rows, values = get_derived_samples(case_id, signal, start_time, end_time)
+    else:
+        rows, values = read_signal_rows(case_id, signal, *time_slice_bounds(time_values, start_time, end_time))
+    times = np.asarray(time_values[rows], dtype=np.float64)
+    keep = np.isfinite(times)
+    return times[keep], values[keep]
+
+def get_signal_samples(case_id: int, signal: str) -> Tuple[np.ndarray, np.ndarray]:
+    """신호의 결측이 아닌 샘플 (시간, 값) 반환 (파생 신호 포함, 없는 신호면 KeyError)"""
+    if signal not in get_signal_names(case_id) and is_derived(signal):
+        rows, values = get_derived_samples(case_id, signal)
+        return np.asarray(get_case_time(case_id))[rows], values
+
+    store = get_case_store(case_id)
+    if store is not None:
+        if signal not in store.signals:
+            raise KeyError(signal)
+        values = store.column(signal)
+        rows = np.flatnonzero(np.isfinite(values))
+        return np.asarray(store.time)[rows], float32_to_float64(values[rows])
+
+    case = get_data_for_case(case_id)
+    if signal not in case.signals:
+        raise KeyError(signal)
+    return case.samples(signal)
+
+def get_case_time(case_id: int) -> np.ndarray:
+    """케이스의 정렬된 시간 배열 (저장소가 있으면 memmap)"""
+    store = get_case_store(case_id)
+    if store is not None:
+        return store.time
+    return get_data_for_case(case_id).time
+
+def get_manifest_entry(case_id: int) -> Optional[Dict[str, Any]]:
+    """
+    현재 원본 파일과 일치하는 매니페스트 항목
+    - 백그라운드 갱신 전에 파일이 바뀌었으면 오래된 항목이므로 None
+    """
+    entry = dataset_manifest.get(case_id)
+    if entry is None:
+        return None
+    identity = {"size": entry["file_size"], "mtime_ns": entry["mtime_ns"]}
+    return entry if identity == get_source_identity(case_id) else None
+
+def get_signal_names(case_id: int) -> List[str]:
+    """케이스의 신호 목록 (매니페스트 → 저장소 헤더 → 데이터 로드 순서로 확인)"""
+    entry = get_manifest_entry(case_id)
+    if entry is not None:
+        return entry["signals"]
+    store = get_case_store(case_id)
+    if store is not None:
+        return store.signals
+    return get_data_for_case(case_id).signal_names
+
+def get_source_identity(case_id: int) -> Optional[Dict[str, int]]:
+    """케이스 원본 데이터의 크기와 수정 시각 (CSV가 없으면 저장소 헤더 기준)"""
+    csv_path = os.path.join(DATA_DIR, f"{case_id}.csv")
+    if os.path.exists(csv_path):
+        stat = os.stat(csv_path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    store = get_case_store(case_id)
+    return store.source if store is not None else None
+
+def get_case_source(case_id: int) -> Optional[Dict[str, int]]:
+    """
+    현재 읽는 케이스 데이터(저장소 또는 캐시된 케이스)의 원본 파일 정보
+    - 데이터에서 만드는 피라미드/인덱스에는 이 값을 기록 (읽는 도중 파일이 바뀌면 다음 요청에서 다시 생성)
+    """
+    store = get_case_store(case_id)
+    if store is not None:
+        return store.source
+    return get_data_for_case(case_id).source
+
+def case_validators(endpoint: str, case_id: int, params: Dict[str, Any], media_type: str = MEDIA_TYPE_JSON,
+                    identity: Optional[Dict[str, int]] = None) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    케이스 응답의 (ETag, Last-Modified) 계산 (원본 파일 정보만 확인, 데이터 파일이 없으면 None)
+    - identity: 응답을 만든 데이터의 파일 정보 (없으면 현재 원본 파일 정보)
+    """
+    if identity is None:
+        identity = get_source_identity(case_id)
+    if identity is None:
+        return None
+    etag = make_etag(endpoint, [case_id, identity], {**params, "media_type": media_type})
+    return etag, last_modified(identity.get("mtime_ns"))
+
+def clinical_validators(params: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """임상 정보 응답의 (ETag, Last-Modified) 계산 (파일이 바뀌었으면 먼저 다시 로드)"""
+    clinical_info_store.refresh()
+    identity = clinical_info_store.identity
+    etag = make_etag("clinical-info", identity, params)
+    return etag, last_modified(identity[1] if identity else None)
+
+def get_signal_pyramid(case_id: int, signal: str) -> SignalPyramid:
+    """
+    신호 타일 피라미드 반환
+    - 메모리 캐시 → 저장된 파일 → 새로 생성 순서로 찾음
+    - 원본 데이터가 바뀌었으면 최신 케이스 데이터로 다시 생성
+    """
+    source = get_source_identity(case_id)
+    pyramid = pyramid_cache.get((case_id, signal))
+    if pyramid is not None and pyramid.source == source:
+        return pyramid
+
+    path = get_pyramid_path(DATA_DIR, case_id, signal)
+    pyramid = None
+    if os.path.exists(path):
+        try:
+            pyramid = SignalPyramid.load(path)
+            if pyramid.source != source:
+                pyramid = None
+        except Exception as e:
+            logger.warning(f"Failed to load tile pyramid {path}: {e}")
+            pyramid = None
+
+    if pyramid is None:
+        built_from = get_case_source(case_id)
+        time_values, values = get_signal_samples(case_id, signal)
+        logger.info(f"Building tile pyramid for case {case_id}, signal {signal}")
+        pyramid = SignalPyramid.build(time_values, values, built_from)
+        try:
+            pyramid.save(path)
+        except Exception as e:
+            logger.warning(f"Failed to save tile pyramid {path}: {e}")
+
+    pyramid_cache.put((case_id, signal), pyramid)
+    return pyramid
+
+def get_stats_index(case_id: int, signal: str) -> SignalStatsIndex:
+    """
+    신호 구간 통계 인덱스 반환 (처음 요청 시 전체 신호로 생성, 원본이 바뀌면 최신 케이스 데이터로 다시 생성)
+    - 인덱스에는 실제로 읽은 데이터의 원본 파일 정보를 기록
+    """
+    source = get_source_identity(case_id)
+    index = stats_index_cache.get((case_id, signal))
+    if index is not None and index.source == source:
+        return index
+
+    built_from = get_case_source(case_id)
+    time_values, values = get_signal_samples(case_id, signal)
+    index = SignalStatsIndex(time_values, values, built_from)
+    stats_index_cache.put((case_id, signal), index)
+    return index
+
+def get_clinical_info(case_id: int, record: Optional[Dict[str, Any]] = None) -> ClinicalInfo:
+    """
+    케이스 ID에 따른 임상 정보 반환
+    - record: 일괄 조회에서 이미 찾은 필드 (없으면 색인에서 조회)
+    """
+    if record is None:
+        record = clinical_info_store.get(case_id)
     
     # CSV 파일에서 데이터를 찾았으면 반환
-    if str(case_id) in clinical_info_cache:
-        return clinical_info_cache[str(case_id)]
+    if record is not None:
+        return ClinicalInfo(caseid=str(case_id), **record)
     
     # 데이터가 없으면 더미 데이터 생성
     logger.warning(f"Clinical info for case {case_id} not found, using dummy data")
@@ -170,19 +582,342 @@ def get_clinical_info(case_id: int) -> ClinicalInfo:
         opname="LAR" if case_id % 4 == 0 else "Lumbar fusion" if case_id % 4 == 1 else "Craniotomy" if case_id % 4 == 2 else "Appendectomy"
     )
 
+class BatchRequest(BaseModel):
+    """여러 케이스 데이터/통계 일괄 조회 요청"""
+    case_ids: List[int]
+    signals: Optional[List[str]] = None
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+    resolution: int = 500
+    method: str = Field("uniform", pattern="^(uniform|minmax|lttb)$")
+    orient: str = Field("records", pattern="^(records|columns)$")
+    include: List[str] = Field(["data", "statistics"], min_length=1)
+    percentiles: List[float] = [5, 50, 95]
+    bins: int = Field(0, ge=0, le=1000)
+
+class CohortThreshold(BaseModel):
+    """코호트 조건 시간 비율 (예: PLETH_SPO2 < 90)"""
+    signal: str
+    op: str = Field(..., pattern="^(<|<=|>|>=)$")
+    value: float
+
+class CohortRequest(BaseModel):
+    """여러 케이스에 걸친 신호별 집계 요청 (case_ids가 없으면 전체 케이스)"""
+    signals: List[str] = Field(..., min_length=1)
+    case_ids: Optional[List[int]] = None
+    percentiles: List[float] = [5, 25, 50, 75, 95]
+    bins: int = Field(0, ge=0, le=1000)
+    ranges: Dict[str, Tuple[float, float]] = {}
+    thresholds: List[CohortThreshold] = []
+    max_hold: float = Field(60.0, gt=0)
+
+def resolve_event_rule(
+    rule: Optional[str],
+    signal: Optional[str],
+    op: Optional[str],
+    threshold: Optional[float],
+    min_duration: float,
+    hysteresis: float,
+    max_gap: float
+) -> EventRule:
+    """이름 있는 규칙 또는 신호/연산자/임계값으로 이벤트 규칙 생성 (잘못된 조합이면 400)"""
+    if rule is not None:
+        if rule not in PRESET_RULES:
+            raise HTTPException(status_code=400, detail=f"Unknown event rule: {rule}")
+        return PRESET_RULES[rule]
+    if signal is None or op is None or threshold is None:
+        raise HTTPException(status_code=400, detail="Either rule or signal, op and threshold are required")
+    return EventRule(signal, op, threshold, min_duration, hysteresis, max_gap)
+
+def get_event_index(rule: EventRule, case_ids: Optional[List[int]] = None):
+    """
+    case_ids(없으면 전체 케이스)가 모두 최신인 이벤트 인덱스 반환
+    - 매니페스트에 규칙 신호가 없는 케이스는 읽지 않음
+    - 바뀐 케이스만 프로세스 풀에서 다시 검출
+    """
+    entries = {e["case_id"]: e for e in dataset_manifest.entries(case_ids)} if dataset_manifest.ready else {}
+    targets = case_ids if case_ids is not None else (sorted(entries) if entries else list_case_ids(DATA_DIR))
+    identities = {}
+    for case_id in targets:
+        entry = entries.get(case_id)
+        identity = ({"size": entry["file_size"], "mtime_ns": entry["mtime_ns"]} if entry
+                    else get_source_identity(case_id))
+        if identity is not None:
+            identities[case_id] = identity
+    without_signal = {case_id for case_id, e in entries.items() if rule.signal not in e["signals"]}
+    return cohort_runner.call(lambda executor: event_index_store.get(
+        rule, identities, executor, complete=case_ids is None, without_signal=without_signal))
+
+def build_case_data(
+    case_id: int,
+    signals: Optional[List[str]],
+    start_time: Optional[float],
+    end_time: Optional[float],
+    resolution: int,
+    method: str
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    요청된 신호와 시간 구간을 다운샘플링한 DataFrame과 메타 정보 반환 (케이스가 로드되어 있어야 함)
+    """
+    derived = [s for s in signals or [] if is_derived(s)]
+    raw_signals = [s for s in signals if s not in derived] if signals else signals
+    df = get_case_frame(case_id, raw_signals, start_time, end_time)
+    if derived:
+        df = add_derived_columns(case_id, df, derived, start_time, end_time)
+    
+    # 신호 선택
+    message = None
+    if signals:
+        valid_signals = [s for s in signals if s in df.columns]
+        if not valid_signals:
+            message = "No valid signals found"
+            df = df[["time"]].iloc[0:0]
+        else:
+            columns = ["time"] + valid_signals
+            df = df[columns]
+    
+    # 다운샘플링 (결과는 최대 resolution행, minmax/lttb는 이 예산을 신호별로 나눠 결측이 아닌 샘플에서 피크를 보존하며 선택)
+    total_points = len(df)
+    if total_points > resolution and total_points > 0:
+        df = downsample_frame(df, resolution, method)
+    
+    # 메타 정보에서도 NaN 처리
+    start_time_value = None
+    end_time_value = None
+    
+    if not df.empty:
+        start_time_value = finite_or_none(df["time"].min())
+        end_time_value = finite_or_none(df["time"].max())
+    
+    meta = {
+        "original_points": total_points,
+        "returned_points": len(df),
+        "start_time": start_time_value,
+        "end_time": end_time_value,
+        "method": method
+    }
+    if message:
+        meta["message"] = message
+    return df, meta
+
+def build_case_statistics(
+    case_id: int,
+    signals: Optional[List[str]],
+    start_time: Optional[float],
+    end_time: Optional[float],
+    percentiles: Optional[List[float]] = None,
+    bins: int = 0
+) -> Dict[str, Dict[str, Any]]:
+    """신호별 구간 통계 계산 (케이스가 로드되어 있어야 함, 없는 신호는 제외)"""
+    # 구간의 전체 행 수 (missing 계산용)
+    row_lo, row_hi = time_slice_bounds(get_case_time(case_id), start_time, end_time)
+    rows = row_hi - row_lo
+    
+    # 신호 선택 및 통계 계산
+    # 신호별 누적합/sparse table 인덱스로 구간 통계를 상수 시간에 계산
+    # (NaN, Infinity, -Infinity 값은 인덱스 생성 시 결측으로 처리)
+    result = {}
+    available = get_signal_names(case_id)
+    valid_signals = signals if signals else available
+    
+    for signal in valid_signals:
+        if signal != "time" and is_signal_available(signal, available):
+            result[signal] = get_stats_index(case_id, signal).query(start_time, end_time, rows, percentiles, bins)
+    return result
+
+def build_batch_entry(case_id: int, batch: BatchRequest) -> Dict[str, Any]:
+    """일괄 조회의 케이스 하나 결과 (케이스가 로드되어 있어야 함)"""
+    entry: Dict[str, Any] = {"case_id": case_id}
+    if "data" in batch.include:
+        df, meta = build_case_data(case_id, batch.signals, batch.start_time, batch.end_time,
+                                   batch.resolution, batch.method)
+        meta["orient"] = batch.orient
+        entry["data"] = frame_to_columns(df) if batch.orient == "columns" else frame_to_records(df)
+        entry["meta"] = meta
+    if "statistics" in batch.include:
+        entry["statistics"] = build_case_statistics(case_id, batch.signals, batch.start_time, batch.end_time,
+                                                    batch.percentiles, batch.bins)
+    return entry
+
+def build_replay_batch(reader, signals: List[str], start: float, end: float, resolution: int) -> Dict[str, Any]:
+    """재생 이벤트 payload: 케이스 시간 [start, end)의 샘플 (resolution개를 넘으면 minmax로 줄임)"""
+    time_values = reader.time
+    lo = int(np.searchsorted(time_values, start, side="left"))
+    hi = int(np.searchsorted(time_values, end, side="left"))
+    df = reader.row_frame(signals, lo, hi)
+    if len(df) > resolution:
+        df = downsample_frame(df, resolution, "minmax")
+    return {"start": start, "end": end, "cursor": end, "data": frame_to_columns(df)}
+
+def binary_response(media_type: str, columns: Dict[str, Any], meta: Dict[str, Any]) -> Response:
+    """협상된 바이너리 형식 (VitaLab 프레임 / Arrow IPC) 응답 생성"""
+    return Response(encode(media_type, columns, meta), media_type=media_type, headers={"Vary": "Accept"})
+
+def render_case_data(case_id: int, signals: Optional[List[str]], start_time: Optional[float],
+                     end_time: Optional[float], resolution: int, method: str, orient: str,
+                     media_type: str) -> Response:
+    """케이스 데이터 응답 생성 (케이스가 로드되어 있어야 함, 스레드 풀에서 실행)"""
+    df, meta = build_case_data(case_id, signals, start_time, end_time, resolution, method)
+    meta["orient"] = orient
+
+    # 바이너리 형식: time과 파생 신호는 float64, 저장된 신호는 float32 열
+    if media_type != MEDIA_TYPE_JSON:
+        columns = {"time": (df["time"].to_numpy(), "float64")}
+        columns.update({col: (df[col].to_numpy(), "float32" if df[col].dtype == np.float32 else "float64")
+                        for col in df.columns if col != "time"})
+        return binary_response(media_type, columns, meta)
+
+    # NaN, Infinity, -Infinity 값은 열 단위로 벡터화하여 None으로 변환 (JSON에서 null)
+    data = frame_to_columns(df) if orient == "columns" else frame_to_records(df)
+    # 이미 JSON 호환 값이므로 응답 객체를 직접 반환해 jsonable_encoder 순회를 건너뜀
+    return CustomJSONResponse({"data": data, "meta": meta}, headers={"Vary": "Accept"})
+
+def render_case_statistics(case_id: int, signals: Optional[List[str]], start_time: Optional[float],
+                           end_time: Optional[float], percentiles: List[float], bins: int,
+                           media_type: str) -> Response:
+    """구간 통계 응답 생성 (케이스가 로드되어 있어야 함, 인덱스 생성을 포함하므로 스레드 풀에서 실행)"""
+    result = build_case_statistics(case_id, signals, start_time, end_time, percentiles, bins)
+    if media_type == MEDIA_TYPE_JSON:
+        return CustomJSONResponse({"statistics": result}, headers={"Vary": "Accept"})
+
+    names = list(result.keys())
+    columns = {
+        key: ([np.nan if result[n][key] is None else result[n][key] for n in names], "float64")
+        for key in ("min", "max", "mean", "std")
+    }
+    columns.update({key: ([result[n][key] for n in names], "int32") for key in ("count", "missing")})
+    for key in dict.fromkeys(percentile_key(p) for p in percentiles):
+        columns[key] = ([np.nan if result[n]["percentiles"][key] is None else result[n]["percentiles"][key]
+                         for n in names], "float64")
+    return binary_response(media_type, columns, {"signals": names})
+
+def render_resample(case_id: int, signals: List[str], start_time: Optional[float], end_time: Optional[float],
+                    interval: Optional[float], grid_signal: Optional[str], policy: str, max_age: Optional[float],
+                    orient: str, media_type: str) -> Response:
+    """리샘플링 응답 생성 (케이스가 로드되어 있어야 함, 스레드 풀에서 실행, 잘못된 격자는 HTTPException)"""
+    names = get_signal_names(case_id)
+    if grid_signal is not None:
+        if not is_signal_available(grid_signal, names):
+            raise HTTPException(status_code=400, detail=f"Grid signal not found: {grid_signal}")
+        grid, _ = get_window_samples(case_id, grid_signal, start_time, end_time)
+    else:
+        span = np.asarray(get_case_time(case_id), dtype=np.float64)
+        span = span[np.isfinite(span)]
+        grid_start = start_time if start_time is not None else (float(span[0]) if len(span) else 0.0)
+        grid_end = end_time if end_time is not None else (float(span[-1]) if len(span) else -1.0)
+        if (grid_end - grid_start) / interval >= RESAMPLE_MAX_POINTS:
+            raise HTTPException(status_code=400, detail=f"At most {RESAMPLE_MAX_POINTS} grid points per request")
+        grid = fixed_grid(grid_start, grid_end, interval)
+    if len(grid) > RESAMPLE_MAX_POINTS:
+        raise HTTPException(status_code=400, detail=f"At most {RESAMPLE_MAX_POINTS} grid points per request")
+
+    # locf/linear는 격자 밖 샘플도 필요하므로 max_age만큼 넓혀 읽음 (제한이 없으면 전체)
+    valid_signals = [s for s in signals if is_signal_available(s, names)]
+    samples = {}
+    if len(grid):
+        if policy == "mean":
+            edges = bucket_edges(grid)
+            read_start, read_end = float(edges[0]), float(edges[-1])
+        elif max_age is None:
+            read_start = read_end = None
+        else:
+            read_start, read_end = float(grid[0]) - max_age, float(grid[-1]) + max_age
+        samples = {s: get_window_samples(case_id, s, read_start, read_end) for s in valid_signals}
+    values = resample(samples, grid, policy, max_age)
+
+    df = pd.DataFrame({"time": grid, **{s: values.get(s, np.full(len(grid), np.nan)) for s in valid_signals}})
+    meta = {
+        "points": len(grid),
+        "policy": policy,
+        "interval": interval,
+        "grid_signal": grid_signal,
+        "max_age": max_age,
+        "start_time": finite_or_none(grid[0]) if len(grid) else None,
+        "end_time": finite_or_none(grid[-1]) if len(grid) else None,
+        "orient": orient,
+    }
+    missing = [s for s in signals if s not in valid_signals]
+    if missing:
+        meta["missing_signals"] = missing
+
+    if media_type != MEDIA_TYPE_JSON:
+        # 리샘플링 값은 서버에서 계산한 float64 (float32로 줄이지 않음)
+        columns = {"time": (grid, "float64")}
+        columns.update({s: (df[s].to_numpy(), "float64") for s in valid_signals})
+        return binary_response(media_type, columns, meta)
+    data = frame_to_columns(df) if orient == "columns" else frame_to_records(df)
+    return CustomJSONResponse({"data": data, "meta": meta}, headers={"Vary": "Accept"})
+
+def build_tile(case_id: int, signal: str, level: int, index: int) -> Tuple[Response, Dict[str, int]]:
+    """타일 응답과 피라미드를 만든 데이터의 파일 정보 (피라미드 생성을 포함하므로 스레드 풀에서 실행)"""
+    pyramid = get_signal_pyramid(case_id, signal)
+    tile = pyramid.tile(level, index)
+    tile["signal"] = signal
+    return CustomJSONResponse(tile), pyramid.source
+
+def build_tile_info(case_id: int, signal: str) -> Dict[str, Any]:
+    """타일 피라미드 정보 (피라미드 생성을 포함하므로 스레드 풀에서 실행)"""
+    pyramid = get_signal_pyramid(case_id, signal)
+    return {
+        "signal": signal,
+        "base_bucket_seconds": pyramid.bucket_seconds(0),
+        "tile_buckets": TILE_BUCKETS,
+        "max_level": pyramid.max_level,
+        "time_span": pyramid.time_span(),
+    }
+
 @app.get("/")
 async def root():
     return {"message": "VitalLab API is running"}
 
+@app.get("/api/admin/cache")
+async def get_cache_stats():
+    """케이스 데이터 캐시 사용량과 적중/실패/제거 카운터 반환"""
+    return {"caches": [data_cache.stats(), pyramid_cache.stats(), stats_index_cache.stats(), response_cache.stats(),
+                       derived_engine.stats()]}
+
+@app.get("/api/ready")
+async def get_readiness():
+    """
+    서버 준비 상태 (예열과 상관없이 요청을 받을 수 있으면 ready)
+    - warm: 예열이 끝났거나 예열할 케이스가 없는지 여부
+    - prewarm: 예열 진행 상황 (전체/로드/실패/건너뛴 케이스 수, 현재 케이스, 경과 시간)
+    """
+    return {
+        "ready": True,
+        "warm": prewarmer.done,
+        "manifest_ready": dataset_manifest.ready,
+        "prewarm": prewarmer.status(),
+    }
+
+@app.get("/api/admin/replay")
+async def get_replay_stats():
+    """재생 생산자 수, 시청자 수, 생산자별 재생 위치/전송 배치/버린 이벤트 수 반환"""
+    return replay_hub.stats()
+
+@app.get("/api/admin/events")
+async def get_event_index_stats():
+    """규칙별 이벤트 인덱스의 케이스/이벤트/오류 수와 검출한 케이스 수 반환"""
+    return event_index_store.stats()
+
+@app.get("/api/admin/loader")
+async def get_loader_stats():
+    """케이스 로드 풀의 큐 깊이, 실행 중/공유된 로드 수, 로드 시간 통계 반환"""
+    return case_loader.stats()
+
 @app.get("/api/cases")
 async def get_cases():
     """사용 가능한 케이스 목록 반환"""
     try:
+        # 매니페스트가 준비되었으면 파일 목록을 다시 읽지 않음
+        if dataset_manifest.ready:
+            return {"cases": dataset_manifest.case_ids()}
+        
         # data 디렉토리 확인
-        os.makedirs("data", exist_ok=True)
+        os.makedirs(DATA_DIR, exist_ok=True)
         
         # 디렉토리 내 CSV 파일 찾기
-        case_files = [f for f in os.listdir("data") if f.endswith(".csv") and f != "clinical_info.csv"]
+        case_files = [f for f in os.listdir(DATA_DIR) if f.endswith(".csv") and f != "clinical_info.csv"]
         
         # 파일 이름에서 케이스 ID 추출
         case_ids = []
@@ -203,181 +938,527 @@ async def get_cases():
         # 오류 발생 시 하드코딩된 목록 반환
         return {"cases": [1, 2, 3, 4, 5, 6, 7, 8]}
 
+@app.get("/api/manifest")
+async def get_manifest(case_ids: List[int] = Query(None)):
+    """
+    케이스별 메타데이터 반환 (케이스 목록 화면용)
+    - 파일 크기/수정 시각, 행 수, 시간 범위, 신호 목록, 신호별 결측 아닌 값 수
+    - case_ids를 주면 해당 케이스만 반환
+    """
+    try:
+        return {"ready": dataset_manifest.ready, "cases": dataset_manifest.entries(case_ids)}
+    except Exception as e:
+        logger.error(f"Error getting manifest: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to load manifest: {str(e)}")
+
+@app.get("/api/clinical-info")
+async def get_clinical_info_bulk(request: Request, case_ids: List[int] = Query(...)):
+    """여러 케이스의 임상 정보를 요청 순서대로 한 번에 반환 (케이스 목록 페이지용)"""
+    try:
+        validators = clinical_validators({"case_ids": case_ids})
+        cached = response_cache.lookup(request, *validators)
+        if cached is not None:
+            return cached
+        records = clinical_info_store.get_many(case_ids)
+        clinical_info = [get_clinical_info(case_id, records[str(case_id)]).model_dump() for case_id in case_ids]
+        return response_cache.store(CustomJSONResponse({"clinical_info": clinical_info}), *validators)
+    except Exception as e:
+        logger.error(f"Error getting clinical info for cases {case_ids}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to load clinical info: {str(e)}")
+
+@app.post("/api/batch")
+async def get_batch(batch: BatchRequest):
+    """
+    여러 케이스의 데이터/통계를 한 번에 반환 (비교 화면용)
+    - 케이스 로드와 계산은 스레드 풀에서 동시에 실행됨
+    - 실패한 케이스는 전체 요청을 실패시키지 않고 {"case_id": ..., "error": ...}로 포함됨
+    - 결과는 요청 순서 (중복 케이스 ID는 한 번만)
+    """
+    if len(batch.case_ids) > BATCH_MAX_CASES:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_CASES} cases per batch")
+    if any(name not in ("data", "statistics") for name in batch.include):
+        raise HTTPException(status_code=400, detail="include must contain only 'data' and 'statistics'")
+    if any(not 0 <= p <= 100 for p in batch.percentiles):
+        raise HTTPException(status_code=400, detail="percentiles must be between 0 and 100")
+
+    async def run_case(case_id: int) -> Dict[str, Any]:
+        try:
+            await ensure_case_loaded(case_id)
+            return await run_in_request_context(batch_executor, build_batch_entry, case_id, batch)
+        except Exception as e:
+            logger.error(f"Error processing batch entry for case {case_id}: {e}")
+            return {"case_id": case_id, "error": str(e)}
+
+    logger.info(f"Batch request - cases: {len(batch.case_ids)}, include: {batch.include}")
+    results = await asyncio.gather(*(run_case(case_id) for case_id in dict.fromkeys(batch.case_ids)))
+    return CustomJSONResponse({"results": results})
+
+@app.post("/api/cohort", status_code=202)
+async def start_cohort_job(cohort: CohortRequest):
+    """
+    여러 케이스에 걸친 신호별 분포/조건 시간 비율 집계 작업 시작
+    - 케이스별 부분 집계를 프로세스 풀에서 계산하고 병합 (결과는 GET /api/cohort/{job_id})
+    - ranges에 범위를 준 신호만 bins개 구간 히스토그램 포함
+    """
+    if any(not 0 <= p <= 100 for p in cohort.percentiles):
+        raise HTTPException(status_code=400, detail="percentiles must be between 0 and 100")
+    if any(lo >= hi for lo, hi in cohort.ranges.values()):
+        raise HTTPException(status_code=400, detail="ranges must satisfy low < high")
+    try:
+        if cohort.case_ids:
+            case_ids = list(dict.fromkeys(cohort.case_ids))
+        else:
+            case_ids = dataset_manifest.case_ids() if dataset_manifest.ready else list_case_ids(DATA_DIR)
+        thresholds: Dict[str, List[Tuple[str, float]]] = {}
+        for t in cohort.thresholds:
+            thresholds.setdefault(t.signal, []).append((t.op, t.value))
+        spec = {
+            "bins": cohort.bins,
+            "ranges": {s: list(r) for s, r in cohort.ranges.items()},
+            "thresholds": thresholds,
+            "max_hold": cohort.max_hold,
+        }
+        job = cohort_runner.submit(case_ids, cohort.signals, spec, cohort.percentiles)
+        logger.info(f"Cohort job {job.job_id} started - cases: {len(case_ids)}, signals: {cohort.signals}")
+        return job.to_dict()
+    except Exception as e:
+        logger.error(f"Error starting cohort job: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to start cohort job: {str(e)}")
+
+@app.get("/api/cohort")
+async def list_cohort_jobs():
+    """코호트 집계 작업 목록 (결과 제외)"""
+    return {"jobs": cohort_runner.jobs()}
+
+@app.get("/api/cohort/{job_id}")
+async def get_cohort_job(job_id: str):
+    """코호트 집계 작업 상태와 진행률 (끝났으면 result 포함)"""
+    job = cohort_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Cohort job {job_id} not found")
+    return CustomJSONResponse(job.to_dict())
+
+@app.delete("/api/cohort/{job_id}")
+async def cancel_cohort_job(job_id: str):
+    """코호트 집계 작업 취소 (이미 처리한 케이스까지의 결과는 유지)"""
+    job = cohort_runner.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Cohort job {job_id} not found")
+    return job.to_dict(include_result=False)
+
+@app.get("/api/derived-signals")
+async def get_derived_signals():
+    """고정 파생 신호 정의와 함수형 파생 신호 형식"""
+    return {
+        "signals": describe_derived(),
+        "functions": {
+            "rolling_mean(SIGNAL,SECONDS)": "직전 SECONDS초 이동 평균",
+            "roc(SIGNAL,SECONDS)": "직전 SECONDS초 동안의 분당 변화율",
+        },
+    }
+
+@app.get("/api/events/rules")
+async def get_event_rules():
+    """이름으로 조회할 수 있는 이벤트 규칙 목록"""
+    return {"rules": {name: rule.to_dict() for name, rule in PRESET_RULES.items()}}
+
+@app.get("/api/events")
+async def find_events(
+    rule: Optional[str] = None,
+    signal: Optional[str] = None,
+    op: Optional[str] = Query(None, pattern="^(<|<=|>|>=)$"),
+    threshold: Optional[float] = None,
+    min_duration: float = Query(60.0, ge=0),
+    hysteresis: float = Query(0.0, ge=0),
+    max_gap: float = Query(60.0, gt=0),
+    case_ids: List[int] = Query(None),
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    limit: int = Query(1000, ge=0, le=100000),
+    offset: int = Query(0, ge=0)
+):
+    """
+    규칙에 맞는 케이스와 이벤트 구간 조회
+    - rule: 이름 있는 규칙 (hypotension 등) 또는 signal/op/threshold/min_duration/hysteresis/max_gap
+    - 인덱스가 없거나 바뀐 케이스만 처음 조회 시 검출, 이후 조회는 저장된 인덱스에서 응답
+    - start_time/end_time: 케이스 시간 구간과 겹치는 이벤트만
+    - cases: 케이스별 이벤트 수/총 지속 시간, events: limit/offset으로 나눈 이벤트 목록
+    """
+    event_rule = resolve_event_rule(rule, signal, op, threshold, min_duration, hysteresis, max_gap)
+    try:
+        index = await asyncio.get_running_loop().run_in_executor(None, get_event_index, event_rule, case_ids)
+        events = index.query(case_ids, start_time, end_time)
+        page = {key: array[offset:offset + limit] for key, array in events.items()}
+        return CustomJSONResponse({
+            "rule": event_rule.to_dict(),
+            "total": len(events["case_id"]),
+            "cases": summarize_cases(events),
+            "events": events_to_records(page),
+            "errors": {str(k): v for k, v in index.errors.items() if case_ids is None or k in case_ids},
+        })
+    except Exception as e:
+        logger.error(f"Error finding events for rule {event_rule.key}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to find events: {str(e)}")
+
+@app.get("/api/case/{case_id}/events")
+async def get_case_events(
+    case_id: int,
+    rule: Optional[str] = None,
+    signal: Optional[str] = None,
+    op: Optional[str] = Query(None, pattern="^(<|<=|>|>=)$"),
+    threshold: Optional[float] = None,
+    min_duration: float = Query(60.0, ge=0),
+    hysteresis: float = Query(0.0, ge=0),
+    max_gap: float = Query(60.0, gt=0)
+):
+    """케이스 하나의 이벤트 구간 (규칙 지정 방법은 /api/events와 같음, 이 케이스만 검출/갱신)"""
+    event_rule = resolve_event_rule(rule, signal, op, threshold, min_duration, hysteresis, max_gap)
+    try:
+        index = await asyncio.get_running_loop().run_in_executor(None, get_event_index, event_rule, [case_id])
+        if case_id in index.errors:
+            raise HTTPException(status_code=500, detail=f"Failed to detect events: {index.errors[case_id]}")
+        return CustomJSONResponse({"rule": event_rule.to_dict(), "events": events_to_records(index.case_events(case_id))})
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting events for case {case_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to load events: {str(e)}")
+
 @app.get("/api/case/{case_id}/clinical-info")
-async def get_case_clinical_info(case_id: int):
+async def get_case_clinical_info(request: Request, case_id: int):
     """케이스에 대한 임상 정보 반환"""
     try:
-        return get_clinical_info(case_id)
+        validators = clinical_validators({"case_id": case_id})
+        cached = response_cache.lookup(request, *validators)
+        if cached is not None:
+            return cached
+        return response_cache.store(CustomJSONResponse(get_clinical_info(case_id).model_dump()), *validators)
     except Exception as e:
         logger.error(f"Error getting clinical info for case {case_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to load clinical info: {str(e)}")
 
 @app.get("/api/case/{case_id}/signals")
-async def get_available_signals(case_id: int):
+async def get_available_signals(request: Request, case_id: int):
     """가용한 신호 목록 반환"""
     try:
-        df = get_data_for_case(case_id)
-        # 시간 열을 제외한 신호 목록 반환
-        signals = [col for col in df.columns if col != "time"]
-        return {"signals": signals}
+        # 현재 파일과 일치하는 매니페스트 항목이 있으면 그 항목을 만든 파일 정보로 ETag 계산
+        entry = get_manifest_entry(case_id)
+        identity = {"size": entry["file_size"], "mtime_ns": entry["mtime_ns"]} if entry else None
+        validators = case_validators("signals", case_id, {}, identity=identity)
+        if validators is not None:
+            cached = response_cache.lookup(request, *validators)
+            if cached is not None:
+                return cached
+        if entry is None:
+            await ensure_case_loaded(case_id)
+        # 시간 열을 제외한 신호 목록 반환 (입력 신호가 모두 있는 고정 파생 신호 포함)
+        names = get_signal_names(case_id)
+        response = CustomJSONResponse({"signals": names + available_derived(names)})
+        return response_cache.store(response, *validators) if validators else response
     except Exception as e:
         logger.error(f"Error getting signals for case {case_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to load signals: {str(e)}")
 
 @app.get("/api/case/{case_id}/data")
 async def get_case_data(
+    request: Request,
     case_id: int, 
     signals: List[str] = Query(None),
     start_time: Optional[float] = None,
     end_time: Optional[float] = None,
-    resolution: int = 500  # 반환할 최대 데이터 포인트 수
+    resolution: int = 500,  # 반환할 최대 데이터 포인트 수
+    method: str = Query("uniform", pattern="^(uniform|minmax|lttb)$"),
+    orient: str = Query("records", pattern="^(records|columns)$")
 ):
     """
     케이스 데이터 반환
     - signals: 요청할 신호 목록
     - start_time: 시작 시간 (초)
     - end_time: 종료 시간 (초)
-    - resolution: 반환할 최대 데이터 포인트 수
+    - resolution: 반환할 최대 행 수 (모든 방법에서 응답 전체 기준, minmax/lttb는 신호별로 나눠 선택)
+    - method: 다운샘플링 방법 (uniform: 균등 선택, minmax: 구간별 최소/최대, lttb: Largest-Triangle-Three-Buckets)
+    - orient: 응답 형태 (records: 행 목록, columns: {"time": [...], "signals": {신호: [...]}})
+    - Accept 헤더로 바이너리 형식 선택 가능 (application/x-vitalab-frame, application/vnd.apache.arrow.stream)
     """
     try:
-        logger.info(f"Data request - case: {case_id}, signals: {signals}, time range: {start_time}-{end_time}, resolution: {resolution}")
-        
-        # 데이터 가져오기
-        df = get_data_for_case(case_id)
-        
-        # 시간 필터링
-        if start_time is not None:
-            df = df[df["time"] >= start_time]
-        if end_time is not None:
-            df = df[df["time"] <= end_time]
-        
-        # 신호 선택
-        if signals:
-            valid_signals = [s for s in signals if s in df.columns]
-            if not valid_signals:
-                return {
-                    "data": [],
-                    "meta": {
-                        "original_points": 0,
-                        "returned_points": 0,
-                        "start_time": None,
-                        "end_time": None,
-                        "message": "No valid signals found"
-                    }
-                }
-            columns = ["time"] + valid_signals
-            df = df[columns]
-        
-        # 다운샘플링
-        total_points = len(df)
-        if total_points > resolution and total_points > 0:
-            # 균등하게 포인트 선택
-            indices = np.linspace(0, total_points - 1, resolution, dtype=int)
-            df = df.iloc[indices]
-        
-        # NaN, Infinity, -Infinity 값 처리를 위한 개선된 방법
-        # 데이터프레임을 딕셔너리 목록으로 변환하기 전에 특수값 처리
-        df_cleaned = df.replace([np.inf, -np.inf], np.nan)
+        logger.info(f"Data request - case: {case_id}, signals: {signals}, time range: {start_time}-{end_time}, resolution: {resolution}, method: {method}")
         
-        # 데이터프레임을 딕셔너리 목록으로 변환
-        records = df_cleaned.to_dict(orient="records")
-        
-        # 각 레코드의 모든 NaN 값을 None으로 변환 (JSON에서 null로 처리됨)
-        for record in records:
-            for key, value in record.items():
-                if pd.isna(value) or value is np.nan or (isinstance(value, float) and (np.isinf(value) or np.isnan(value))):
-                    record[key] = None
-        
-        # 메타 정보에서도 NaN 처리
-        start_time_value = None
-        end_time_value = None
-        
-        if not df.empty:
-            min_time = df["time"].min()
-            max_time = df["time"].max()
-            
-            # 더욱 엄격한 NaN 체크
-            start_time_value = float(min_time) if not (pd.isna(min_time) or np.isnan(min_time) or np.isinf(min_time)) else None
-            end_time_value = float(max_time) if not (pd.isna(max_time) or np.isnan(max_time) or np.isinf(max_time)) else None
-        
-        return {
-            "data": records,
-            "meta": {
-                "original_points": total_points,
-                "returned_points": len(records),
-                "start_time": start_time_value,
-                "end_time": end_time_value
-            }
+        # 파일이 바뀌지 않았으면 데이터를 읽지 않고 304 또는 캐시된 응답 반환
+        media_type = negotiate(request.headers.get("accept"))
+        params = {
+            "signals": signals, "start_time": start_time, "end_time": end_time,
+            "resolution": resolution, "method": method, "orient": orient,
         }
+        validators = case_validators("data", case_id, params, media_type)
+        if validators is not None:
+            cached = response_cache.lookup(request, *validators)
+            if cached is not None:
+                return cached
+        
+        # 데이터 가져오기 (요청된 신호와 시간 구간만) 및 다운샘플링
+        await ensure_case_loaded(case_id)
+        # 본문을 만드는 데이터(요청에 고정된 케이스)의 파일 정보로 ETag를 다시 계산해 본문과 ETag를 일치시킴
+        validators = case_validators("data", case_id, params, media_type, identity=get_case_source(case_id))
+        # 구간 변환/파생 신호 계산/다운샘플링/인코딩은 이벤트 루프 밖에서 실행
+        response = await run_in_request_context(None, render_case_data, case_id, signals, start_time, end_time,
+                                                resolution, method, orient, media_type)
+        return response_cache.store(response, *validators) if validators else response
     except Exception as e:
         logger.error(f"Error processing data for case {case_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to process data: {str(e)}")
 
+@app.get("/api/case/{case_id}/resample")
+async def resample_case_data(
+    request: Request,
+    case_id: int,
+    signals: List[str] = Query(...),
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    interval: Optional[float] = Query(None, gt=0),
+    grid_signal: Optional[str] = None,
+    policy: str = Query("locf", pattern="^(locf|linear|mean)$"),
+    max_age: Optional[float] = Query(None, gt=0),
+    orient: str = Query("columns", pattern="^(records|columns)$")
+):
+    """
+    서로 다른 주기의 신호를 하나의 시간 격자에 맞춰 반환
+    - interval: 고정 간격 격자 (초, start_time부터, 생략하면 케이스 시작 시각부터)
+    - grid_signal: 이 신호의 샘플 시각을 격자로 사용 (interval 대신)
+    - policy: locf (직전 값), linear (선형 보간), mean (격자 구간 평균)
+    - max_age: locf는 직전 값의 최대 나이, linear는 양옆 샘플의 최대 간격 (초, 생략하면 제한 없음)
+    - 파생 신호도 사용 가능, Accept 헤더로 바이너리 형식 선택 가능
+    """
+    if (interval is None) == (grid_signal is None):
+        raise HTTPException(status_code=400, detail="Exactly one of interval or grid_signal is required")
+    try:
+        media_type = negotiate(request.headers.get("accept"))
+        params = {
+            "signals": signals, "start_time": start_time, "end_time": end_time, "interval": interval,
+            "grid_signal": grid_signal, "policy": policy, "max_age": max_age, "orient": orient,
+        }
+        validators = case_validators("resample", case_id, params, media_type)
+        if validators is not None:
+            cached = response_cache.lookup(request, *validators)
+            if cached is not None:
+                return cached
+
+        await ensure_case_loaded(case_id)
+        # 본문을 만드는 데이터(요청에 고정된 케이스)의 파일 정보로 ETag를 다시 계산해 본문과 ETag를 일치시킴
+        validators = case_validators("resample", case_id, params, media_type, identity=get_case_source(case_id))
+        # 격자/파생 신호/리샘플링 계산과 인코딩은 이벤트 루프 밖에서 실행
+        response = await run_in_request_context(None, render_resample, case_id, signals, start_time, end_time,
+                                                interval, grid_signal, policy, max_age, orient, media_type)
+        return response_cache.store(response, *validators) if validators else response
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error resampling data for case {case_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to resample data: {str(e)}")
+
+@app.get("/api/case/{case_id}/export")
+async def export_case_data(
+    case_id: int,
+    signals: List[str] = Query(None),
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = False
+):
+    """
+    케이스 데이터를 다운샘플링 없이 스트리밍으로 내보내기
+    - signals: 내보낼 신호 목록 (없으면 전체)
+    - start_time, end_time: 시간 구간 (초)
+    - format: ndjson (한 행당 JSON 객체 한 줄) 또는 csv
+    - gzip: true면 gzip으로 압축해 전송 (Content-Encoding: gzip)
+    - 고정 크기 행 청크 단위로 읽고 인코딩하므로 케이스 길이와 상관없이 메모리 사용량이 일정함
+    """
+    try:
+        await ensure_case_loaded(case_id)
+        reader = get_case_reader(case_id)
+        available = get_signal_names(case_id)
+        if signals:
+            available_set = set(available)
+            names = [s for s in dict.fromkeys(signals) if s in available_set and s != "time"]
+            if not names:
+                raise HTTPException(status_code=404, detail="No valid signals found")
+        else:
+            names = available
+        lo, hi = time_slice_bounds(reader.time, start_time, end_time)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error preparing export for case {case_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to export data: {str(e)}")
+
+    logger.info(f"Export request - case: {case_id}, signals: {len(names)}, rows: {hi - lo}, format: {format}, gzip: {gzip}")
+    headers = {"Content-Disposition": f'attachment; filename="case_{case_id}.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    # 동기 제너레이터는 스레드 풀에서 순회되므로 인코딩이 이벤트 루프를 막지 않음
+    chunks = iter_export(lambda a, b: reader.row_frame(names, a, b), lo, hi, ["time"] + names,
+                         format, gzip=gzip, chunk_rows=EXPORT_CHUNK_ROWS)
+    return StreamingResponse(chunks, media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
+
+@app.get("/api/case/{case_id}/replay")
+async def replay_case(
+    case_id: int,
+    signals: List[str] = Query(None),
+    start_time: Optional[float] = None,
+    speed: float = Query(1.0, gt=0, le=1000),
+    interval: float = Query(1.0, ge=0.1, le=10),
+    window: float = Query(60.0, ge=0),
+    resolution: int = Query(500, ge=1, le=10000)
+):
+    """
+    케이스 신호를 실시간 또는 배속으로 재생 (Server-Sent Events)
+    - signals: 재생할 신호 목록 (없으면 전체)
+    - start_time: 재생 시작 시간 (초, 없으면 케이스 시작)
+    - speed: 배속 (1이면 실시간), interval: 이벤트 전송 주기 (초)
+    - window: 접속 시 snapshot 이벤트로 보낼 직전 구간 길이 (초)
+    - resolution: 이벤트 하나의 최대 포인트 수 (넘으면 minmax 다운샘플링)
+    - 이벤트: snapshot (접속 시 직전 구간), samples (새 샘플), end (재생 종료), error
+    - 같은 케이스/설정의 시청자는 생산자 하나를 공유하며, 늦게 접속한 시청자는 현재 재생 위치부터 받음
+    """
+    try:
+        await ensure_case_loaded(case_id)
+        reader = get_case_reader(case_id)
+        available = get_signal_names(case_id)
+        if signals:
+            available_set = set(available)
+            names = [s for s in dict.fromkeys(signals) if s in available_set and s != "time"]
+            if not names:
+                raise HTTPException(status_code=404, detail="No valid signals found")
+        else:
+            names = available
+
+        # 재생 범위: 유한한 시간 값의 처음과 끝 (NaN 시간 행은 맨 뒤에 있으므로 제외)
+        time_values = reader.time
+        finite_rows = int(np.searchsorted(time_values, np.inf, side="right"))
+        if finite_rows == 0:
+            raise HTTPException(status_code=404, detail="Case has no samples")
+        case_start, case_end = float(time_values[0]), float(time_values[finite_rows - 1])
+        start = case_start if start_time is None else min(max(start_time, case_start), case_end)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error preparing replay for case {case_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to start replay: {str(e)}")
+
+    loop = asyncio.get_running_loop()
+
+    async def read_batch(batch_start: float, batch_end: float) -> Dict[str, Any]:
+        return await loop.run_in_executor(None, build_replay_batch, reader, names, batch_start, batch_end, resolution)
+
+    # 마지막 샘플까지 포함하도록 재생 끝은 마지막 시간 바로 다음
+    end = float(np.nextafter(case_end, np.inf))
+    key = (case_id, tuple(names), start, speed, interval, resolution)
+
+    async def events():
+        # 생산자는 스트림이 시작될 때 열고 구독하므로, 시작 전에 연결이 끊기면 허브에 아무것도 남지 않음
+        # 구독 직후의 재생 위치부터 snapshot을 만들므로 이후 samples 사이에 빠지거나 겹치는 샘플이 없음
+        channel, queue = replay_hub.subscribe(
+            key, lambda on_close: ReplayChannel(key, read_batch, start, end, speed, interval, on_close))
+        cursor = channel.cursor
+        try:
+            snapshot = await read_batch(max(cursor - window, case_start), cursor) if window > 0 else \
+                {"start": cursor, "end": cursor, "cursor": cursor, "data": {"time": [], "signals": {}}}
+            yield sse_event("snapshot", snapshot)
+            while True:
+                message = await queue.get()
+                if message is None:
+                    break
+                yield message
+        finally:
+            channel.unsubscribe(queue)
+
+    logger.info(f"Replay request - case: {case_id}, signals: {len(names)}, speed: {speed}, start: {start}")
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/api/case/{case_id}/tiles")
+async def get_tile_info(case_id: int, signal: str):
+    """
+    신호 타일 피라미드 정보 반환
+    - 레벨 L의 버킷 폭은 base_bucket_seconds * 2^L 초
+    - 레벨 L, 인덱스 k 타일은 [k * tile_buckets, (k + 1) * tile_buckets) 버킷을 포함
+    """
+    try:
+        await ensure_case_loaded(case_id)
+        return await run_in_request_context(None, build_tile_info, case_id, signal)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Signal not found: {signal}")
+    except Exception as e:
+        logger.error(f"Error getting tile info for case {case_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to load tile info: {str(e)}")
+
+@app.get("/api/case/{case_id}/tiles/{level}/{index}")
+async def get_tile(request: Request, case_id: int, signal: str,
+                   level: int = Path(..., ge=0, le=MAX_LEVEL),
+                   index: int = Path(..., ge=-MAX_TILE_INDEX, le=MAX_TILE_INDEX)):
+    """
+    고정 경계 타일의 버킷별 min/max/mean/count 반환
+    - 빈 버킷은 생략되며 time은 각 버킷의 시작 시간
+    - 응답에는 원본 파일 정보 기반 ETag가 붙으며, 브라우저/프록시는 매번 ETag로 재검증 (바뀌지 않았으면 304)
+    - 범위를 벗어난 level/index는 422
+    """
+    try:
+        params = {"signal": signal, "level": level, "index": index}
+        validators = case_validators("tile", case_id, params)
+        if validators is not None:
+            cached = response_cache.lookup(request, *validators)
+            if cached is not None:
+                return cached
+
+        await ensure_case_loaded(case_id)
+        # 피라미드 생성은 이벤트 루프 밖에서 실행하고, 피라미드를 만든 데이터의 파일 정보로 ETag 계산
+        response, source = await run_in_request_context(None, build_tile, case_id, signal, level, index)
+        validators = case_validators("tile", case_id, params, identity=source or None)
+        return response_cache.store(response, *validators) if validators else response
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Signal not found: {signal}")
+    except Exception as e:
+        logger.error(f"Error getting tile for case {case_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to load tile: {str(e)}")
+
 @app.get("/api/case/{case_id}/statistics")
 async def get_case_statistics(
+    request: Request,
     case_id: int,
     signals: List[str] = Query(None),
     start_time: Optional[float] = None,
-    end_time: Optional[float] = None
+    end_time: Optional[float] = None,
+    percentiles: List[float] = Query([5, 50, 95]),
+    bins: int = Query(0, ge=0, le=1000)
 ):
     """
     선택된 신호들에 대한 통계 정보 반환
     - min, max, mean, std 등 기본 통계 제공
+    - percentiles: 분위수 목록 (0~100, 기본 5/50/95), 블록별 스케치를 병합한 근사값
+    - bins: 0보다 크면 [min, max] 균등 구간 히스토그램 포함
+    - Accept 헤더로 바이너리 형식 선택 가능 (신호 하나가 한 행, meta.signals에 행 순서, 히스토그램 제외)
     """
+    if any(not 0 <= p <= 100 for p in percentiles):
+        raise HTTPException(status_code=400, detail="percentiles must be between 0 and 100")
     try:
-        # 데이터 가져오기
-        df = get_data_for_case(case_id)
-        
-        # 시간 필터링
-        if start_time is not None:
-            df = df[df["time"] >= start_time]
-        if end_time is not None:
-            df = df[df["time"] <= end_time]
-        
-        # NaN, Infinity, -Infinity 값 처리 (더 철저히)
-        df = df.replace([np.inf, -np.inf], np.nan)
-        
-        # 신호 선택 및 통계 계산
-        result = {}
-        valid_signals = signals if signals else [col for col in df.columns if col != "time"]
-        
-        for signal in valid_signals:
-            if signal in df.columns and signal != "time":
-                # NaN 값 제거
-                signal_data = df[signal].dropna()
-                
-                if len(signal_data) > 0:
-                    # 안전한 통계값 계산 함수
-                    def safe_stat(func, default=None):
-                        try:
-                            val = func()
-                            # np.isnan, np.isinf, pd.isna 모두 체크
-                            if val is None or pd.isna(val) or (isinstance(val, float) and (np.isnan(val) or np.isinf(val))):
-                                return default
-                            return float(val)
-                        except:
-                            return default
-                    
-                    # 각 통계값 안전하게 계산
-                    result[signal] = {
-                        "min": safe_stat(lambda: signal_data.min()),
-                        "max": safe_stat(lambda: signal_data.max()),
-                        "mean": safe_stat(lambda: signal_data.mean()),
-                        "std": safe_stat(lambda: signal_data.std()),
-                        "count": int(len(signal_data)),
-                        "missing": int(df[signal].isna().sum())
-                    }
-                else:
-                    result[signal] = {
-                        "min": None,
-                        "max": None,
-                        "mean": None,
-                        "std": None,
-                        "count": 0,
-                        "missing": int(len(df))
-                    }
+        # 파일이 바뀌지 않았으면 데이터를 읽지 않고 304 또는 캐시된 응답 반환
+        media_type = negotiate(request.headers.get("accept"))
+        params = {
+            "signals": signals, "start_time": start_time, "end_time": end_time,
+            "percentiles": percentiles, "bins": bins,
+        }
+        validators = case_validators("statistics", case_id, params, media_type)
+        if validators is not None:
+            cached = response_cache.lookup(request, *validators)
+            if cached is not None:
+                return cached
         
-        return {"statistics": result}
+        await ensure_case_loaded(case_id)
+        # 본문을 만드는 데이터(요청에 고정된 케이스)의 파일 정보로 ETag를 다시 계산해 본문과 ETag를 일치시킴
+        validators = case_validators("statistics", case_id, params, media_type, identity=get_case_source(case_id))
+        # 통계 인덱스/분위수 스케치 생성은 이벤트 루프 밖에서 실행
+        response = await run_in_request_context(None, render_case_statistics, case_id, signals, start_time,
+                                                end_time, percentiles, bins, media_type)
+        return response_cache.store(response, *validators) if validators else response
     except Exception as e:
         logger.error(f"Error calculating statistics for case {case_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to calculate statistics: {str(e)}")
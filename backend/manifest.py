@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+데이터셋 매니페스트 (케이스별 파일 정보, 행 수, 시간 범위, 신호 목록, 신호별 결측 아닌 값 수)
+
+케이스 목록과 신호 목록 요청을 데이터 파일을 읽지 않고 메타데이터만으로 처리합니다.
+파일의 크기/수정 시각이 바뀐 케이스만 다시 읽어 갱신하며 (mtime 기반),
+결과는 data/manifest.json에 저장되어 재시작 후에도 재사용됩니다.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from case_store import CaseStore, get_store_dir, is_store_fresh, STORE_DIR_NAME
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+def _finite_span(time: np.ndarray) -> List[Optional[float]]:
+    finite = time[np.isfinite(time)]
+    if len(finite) == 0:
+        return [None, None]
+    return [float(finite.min()), float(finite.max())]
+
+
+def build_entry(data_dir: str, case_id: int, identity: Dict[str, int]) -> Dict[str, Any]:
+    """
+    케이스 하나의 매니페스트 항목 생성
+    - 최신 저장소가 있으면 memmap 배열에서, 없으면 CSV를 읽어 계산
+    """
+    csv_path = os.path.join(data_dir, f"{case_id}.csv")
+    store_dir = get_store_dir(data_dir, case_id)
+
+    if is_store_fresh(store_dir, csv_path):
+        store = CaseStore(store_dir)
+        time_values = np.asarray(store.time, dtype=np.float64)
+        signals = store.signals
+        counts = {name: int(np.isfinite(store.column(name)).sum()) for name in signals}
+    else:
+        df = pd.read_csv(csv_path)
+        time_values = df["time"].to_numpy(dtype=np.float64)
+        signals = [col for col in df.columns if col != "time"]
+        values = df[signals].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+        counts = dict(zip(signals, np.isfinite(values).sum(axis=0).astype(int).tolist()))
+
+    start_time, end_time = _finite_span(time_values)
+    return {
+        "case_id": case_id,
+        "file_size": identity["size"],
+        "mtime_ns": identity["mtime_ns"],
+        "rows": int(len(time_values)),
+        "start_time": start_time,
+        "end_time": end_time,
+        "signals": signals,
+        "non_null_counts": counts,
+    }
+
+
+class DatasetManifest:
+    """데이터 디렉토리의 케이스 매니페스트 (refresh_interval초마다 변경 확인)"""
+
+    def __init__(self, data_dir: str, refresh_interval: float = 5.0):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, MANIFEST_FILE)
+        self.refresh_interval = refresh_interval
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._last_refresh = 0.0
+        self._loaded = False
+        # 백그라운드 갱신 스레드가 실행 중인지 여부 (조회는 갱신을 기다리지 않음)
+        self._refreshing = False
+        self._refreshing_lock = threading.Lock()
+
+    def _load(self) -> None:
+        """저장된 매니페스트 읽기 (없거나 형식이 다르면 빈 상태로 시작)"""
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("version") == MANIFEST_VERSION:
+                self._entries = {int(e["case_id"]): e for e in saved["cases"]}
+        except Exception as e:
+            logger.warning(f"Failed to read manifest {self.path}: {e}")
+
+    def _save(self) -> None:
+        tmp_path = f"{self.path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION,
+                       "cases": [self._entries[k] for k in sorted(self._entries)]}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _scan(self) -> Dict[int, Dict[str, int]]:
+        """케이스 ID → 원본 파일 크기/수정 시각 (CSV, CSV 없이 저장소만 있는 케이스 포함)"""
+        found = {}
+        with os.scandir(self.data_dir) as it:
+            for entry in it:
+                name = entry.name
+                if entry.is_file() and name.endswith(".csv") and name[:-4].isdigit():
+                    stat = entry.stat()
+                    found[int(name[:-4])] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+        store_root = os.path.join(self.data_dir, STORE_DIR_NAME)
+        if os.path.isdir(store_root):
+            for name in os.listdir(store_root):
+                if name.isdigit() and int(name) not in found:
+                    try:
+                        found[int(name)] = CaseStore(os.path.join(store_root, name)).source
+                    except Exception:
+                        continue
+        return found
+
+    @property
+    def ready(self) -> bool:
+        """디렉토리 전체를 한 번 이상 확인했는지 여부"""
+        return self._last_refresh > 0
+
+    def _due(self) -> bool:
+        return not self.ready or time.monotonic() - self._last_refresh >= self.refresh_interval
+
+    def refresh(self, force: bool = False, wait: bool = True) -> int:
+        """
+        바뀐 케이스만 다시 읽어 매니페스트 갱신
+
+        Args:
+            force (bool): 갱신 주기와 상관없이 바로 확인
+            wait (bool): 다른 스레드가 갱신 중일 때 기다릴지 여부 (False면 현재 항목 사용)
+
+        Returns:
+            int: 추가/갱신/삭제된 케이스 수
+        """
+        if not force and not self._due():
+            return 0
+
+        if not self._lock.acquire(blocking=wait):
+            return 0
+        try:
+            if not self._loaded:
+                self._load()
+            if not force and not self._due():
+                return 0
+
+            os.makedirs(self.data_dir, exist_ok=True)
+            found = self._scan()
+            changed = 0
+
+            for case_id in set(self._entries) - set(found):
+                self._entries.pop(case_id, None)
+                changed += 1
+
+            # 바뀐 케이스는 하나씩 바로 반영해 갱신 중에도 이미 읽은 항목을 조회할 수 있게 함
+            for case_id, identity in found.items():
+                entry = self._entries.get(case_id)
+                if entry and entry["file_size"] == identity["size"] and entry["mtime_ns"] == identity["mtime_ns"]:
+                    continue
+                try:
+                    self._entries[case_id] = build_entry(self.data_dir, case_id, identity)
+                    changed += 1
+                except Exception as e:
+                    logger.error(f"Failed to index case {case_id}: {e}")
+
+            self._last_refresh = time.monotonic()
+            if changed:
+                logger.info(f"Manifest updated: {changed} cases changed, {len(self._entries)} total")
+                try:
+                    self._save()
+                except Exception as e:
+                    logger.warning(f"Failed to save manifest {self.path}: {e}")
+            return changed
+        finally:
+            self._lock.release()
+
+    def refresh_in_background(self, force: bool = False) -> bool:
+        """
+        백그라운드 스레드에서 갱신 시작 (갱신 주기가 지나지 않았거나 이미 갱신 중이면 무시)
+        - 디렉토리 확인과 바뀐 파일 읽기가 요청 처리를 막지 않음
+
+        Returns:
+            bool: 새 갱신 스레드를 시작했는지 여부
+        """
+        if not force and not self._due():
+            return False
+        with self._refreshing_lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, args=(force,), name="manifest-refresh", daemon=True).start()
+        return True
+
+    def _background_refresh(self, force: bool) -> None:
+        try:
+            self.refresh(force=force)
+        except Exception as e:
+            logger.error(f"Failed to refresh manifest: {e}")
+        finally:
+            with self._refreshing_lock:
+                self._refreshing = False
+
+    def _refresh_for_query(self) -> None:
+        """
+        조회 전 갱신: 첫 전체 확인이 끝난 뒤에만 백그라운드 갱신을 시작하고,
+        갱신을 기다리지 않고 마지막으로 갱신된 항목으로 바로 응답
+        """
+        if self.ready:
+            self.refresh_in_background()
+
+    def case_ids(self) -> List[int]:
+        self._refresh_for_query()
+        return sorted(self._entries)
+
+    def get(self, case_id: int) -> Optional[Dict[str, Any]]:
+        self._refresh_for_query()
+        return self._entries.get(case_id)
+
+    def entries(self, case_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """매니페스트 항목 목록 (case_ids를 주면 해당 케이스만, 케이스 ID 순)"""
+        self._refresh_for_query()
+        entries = dict(self._entries)
+        keys = sorted(entries) if case_ids is None else [k for k in case_ids if k in entries]
+        return [entries[k] for k in keys]
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="데이터셋 매니페스트 생성/갱신")
+    parser.add_argument("-d", "--directory", default="./data", help="CSV 파일이 있는 디렉토리 경로")
+
+    args = parser.parse_args()
+    if not os.path.exists(args.directory):
+        print(f"Error: Directory '{args.directory}' not found.")
+        sys.exit(1)
+    manifest = DatasetManifest(args.directory)
+    changed = manifest.refresh(force=True)
+    print(f"작업 완료: 총 {len(manifest.case_ids())}개 케이스 중 {changed}개 케이스가 갱신되었습니다.")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+케이스 접근 기록과 서버 시작 후 캐시 예열
+
+AccessLog는 케이스별 접근 횟수를 세어 data/access_log.json에 주기적으로 저장하고,
+Prewarmer는 지정된 케이스 목록(또는 접근 횟수 상위 N개)을 백그라운드 스레드에서 하나씩 로드합니다.
+예열은 서버 준비를 늦추지 않으며, 진행 상황은 status()로 확인합니다.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ACCESS_LOG_FILE = "access_log.json"
+
+
+def parse_case_list(value: str) -> List[int]:
+    """쉼표로 구분된 케이스 ID 목록 파싱 ("1, 2,3" → [1, 2, 3], 숫자가 아닌 항목은 무시)"""
+    return [int(item) for item in (part.strip() for part in value.split(",")) if item.isdigit()]
+
+
+class AccessLog:
+    """케이스별 접근 횟수 (재시작 후에도 유지되도록 파일에 저장)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._counts: Dict[int, int] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+            self._counts = {int(case_id): int(count) for case_id, count in saved.get("counts", {}).items()}
+        except Exception as e:
+            logger.warning(f"Failed to read access log {self.path}: {e}")
+
+    def record(self, case_id: int) -> None:
+        with self._lock:
+            self._counts[case_id] = self._counts.get(case_id, 0) + 1
+            self._dirty = True
+
+    def top(self, n: int) -> List[int]:
+        """접근 횟수가 많은 순서로 케이스 ID n개 (같으면 작은 ID 먼저)"""
+        with self._lock:
+            ranked = sorted(self._counts.items(), key=lambda item: (-item[1], item[0]))
+        return [case_id for case_id, _ in ranked[:n]]
+
+    def save(self) -> bool:
+        """바뀐 내용이 있으면 파일에 저장 (저장했으면 True)"""
+        with self._lock:
+            if not self._dirty:
+                return False
+            counts = {str(case_id): count for case_id, count in self._counts.items()}
+            self._dirty = False
+        tmp_path = f"{self.path}.tmp-{os.getpid()}"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"counts": counts}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Failed to save access log {self.path}: {e}")
+            with self._lock:
+                self._dirty = True
+            return False
+        return True
+
+    def autosave(self, interval: float, stop: threading.Event) -> None:
+        """stop이 설정될 때까지 interval초마다 저장 (백그라운드 스레드용, 종료 시 한 번 더 저장)"""
+        while not stop.wait(interval):
+            self.save()
+        self.save()
+
+
+class Prewarmer:
+    """케이스 목록을 백그라운드에서 차례로 로드하며 진행 상황을 기록"""
+
+    def __init__(self, load: Callable[[int], Any], should_stop: Optional[Callable[[], bool]] = None):
+        """
+        Args:
+            load: 케이스 하나를 캐시에 올리는 함수 (예외는 실패로 기록)
+            should_stop: 케이스마다 확인해 True면 남은 케이스를 건너뜀 (예: 캐시 예산 초과)
+        """
+        self.load = load
+        self.should_stop = should_stop
+        self.state = "idle"
+        self.case_ids: List[int] = []
+        self.loaded = 0
+        self.failed = 0
+        self.skipped = 0
+        self.current: Optional[int] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def start(self, case_ids: List[int]) -> Optional[threading.Thread]:
+        """예열 스레드 시작 (케이스가 없으면 시작하지 않음)"""
+        self.case_ids = list(dict.fromkeys(case_ids))
+        if not self.case_ids:
+            self.state = "disabled"
+            return None
+        self.state = "running"
+        self.started_at = time.monotonic()
+        thread = threading.Thread(target=self._run, name="prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def _run(self) -> None:
+        logger.info(f"Prewarming {len(self.case_ids)} cases")
+        for position, case_id in enumerate(self.case_ids):
+            if self.should_stop is not None and self.should_stop():
+                self.skipped = len(self.case_ids) - position
+                logger.info(f"Prewarm stopped early, skipping {self.skipped} cases")
+                break
+            self.current = case_id
+            try:
+                self.load(case_id)
+                self.loaded += 1
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Failed to prewarm case {case_id}: {e}")
+        self.current = None
+        self.finished_at = time.monotonic()
+        self.state = "done"
+        logger.info(f"Prewarm finished: {self.loaded} loaded, {self.failed} failed, "
+                    f"{self.finished_at - self.started_at:.1f}s")
+
+    @property
+    def done(self) -> bool:
+        return self.state in ("done", "disabled")
+
+    def status(self) -> Dict[str, Any]:
+        """예열 진행 상황 (state: idle, running, done, disabled)"""
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return {
+            "state": self.state,
+            "total": len(self.case_ids),
+            "loaded": self.loaded,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "current": self.current,
+            "elapsed_seconds": elapsed,
+        }
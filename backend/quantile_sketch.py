@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+고정 시간 블록별 병합 가능한 분위수 스케치 (t-digest 방식 centroid)
+
+결측이 아닌 샘플을 BLOCK_SECONDS초 블록으로 나누고, 블록마다 정렬된 값을 t-digest의 k1 스케일
+함수로 최대 CENTROIDS_PER_BLOCK개의 (평균, 개수) centroid로 요약합니다. 스케일 함수는 양 끝(꼬리)의
+centroid를 작게 만들어 p5/p95 같은 꼬리 분위수의 오차를 줄입니다.
+
+임의 구간의 분위수/히스토그램은 구간에 완전히 포함된 블록의 centroid와 양 끝 부분 블록의 원본 샘플
+(가중치 1)을 합쳐 계산하므로, 원본 데이터 전체를 정렬하지 않습니다. 생성은 lexsort와 reduceat으로
+벡터화되어 있습니다.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+BLOCK_SECONDS = 60.0
+CENTROIDS_PER_BLOCK = 64
+
+
+def percentile_key(percentile: float) -> str:
+    """분위수 응답 키 (5 → "p5", 99.9 → "p99.9")"""
+    return f"p{percentile:g}"
+
+
+def compress_centroids(means: np.ndarray, weights: np.ndarray,
+                       centroids: int = CENTROIDS_PER_BLOCK) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (평균, 개수) 목록을 k1 스케일로 최대 centroids개로 합침 (병합한 스케치를 다시 줄일 때 사용)
+
+    Returns:
+        값 순으로 정렬된 (centroid 평균, 개수)
+    """
+    order = np.argsort(means, kind="stable")
+    means, weights = means[order], weights[order]
+    if len(means) <= centroids:
+        return means, weights
+    cumulative = np.cumsum(weights)
+    q = (cumulative - weights / 2.0) / cumulative[-1]
+    group = np.clip(np.floor(centroids * (np.arcsin(2 * q - 1) / np.pi + 0.5)), 0, centroids - 1)
+    bounds = np.flatnonzero(np.concatenate([[True], group[1:] != group[:-1]]))
+    merged_weights = np.add.reduceat(weights, bounds)
+    return np.add.reduceat(means * weights, bounds) / merged_weights, merged_weights
+
+
+def interpolate_quantiles(means: np.ndarray, weights: np.ndarray, percentiles: List[float],
+                          vmin: float, vmax: float) -> Dict[str, Any]:
+    """
+    값 순으로 정렬된 centroid에서 분위수 계산 (numpy 'linear' 방식과 같은 순위 정의)
+    - 각 centroid는 자신이 요약한 순위 구간의 가운데에 위치한다고 보고 순위 사이를 선형 보간
+    - vmin/vmax(정확한 최소/최대)를 양 끝 기준점으로 사용
+    """
+    if len(means) == 0:
+        return {percentile_key(p): None for p in percentiles}
+    total = int(weights.sum())
+    positions = np.cumsum(weights) - weights + (weights - 1) / 2.0
+
+    xp, fp = [positions], [means]
+    if positions[0] > 0:
+        xp.insert(0, [0.0])
+        fp.insert(0, [vmin])
+    if positions[-1] < total - 1:
+        xp.append([total - 1.0])
+        fp.append([vmax])
+    targets = np.asarray(percentiles, dtype=np.float64) / 100.0 * (total - 1)
+    result = np.interp(targets, np.concatenate(xp), np.concatenate(fp))
+    return {percentile_key(p): float(v) for p, v in zip(percentiles, result)}
+
+
+class BlockQuantileSketch:
+    """한 신호의 블록별 centroid 요약 (time은 정렬되어 있고 NaN 시간은 맨 뒤)"""
+
+    def __init__(self, time: np.ndarray, values: np.ndarray,
+                 block_seconds: float = BLOCK_SECONDS, centroids: int = CENTROIDS_PER_BLOCK):
+        self.values = values
+        n = len(values)
+        if n == 0:
+            self.block_starts = self.block_ends = np.zeros(0, dtype=np.int64)
+            self.offsets = np.zeros(1, dtype=np.int64)
+            self.means = np.zeros(0)
+            self.weights = np.zeros(0, dtype=np.int64)
+            return
+
+        # 샘플별 블록 번호 (시간이 NaN인 샘플은 마지막 블록 다음의 별도 블록)
+        finite = np.isfinite(time)
+        block_ids = np.zeros(n, dtype=np.int64)
+        if finite.any():
+            t0 = time[finite][0]
+            block_ids[finite] = np.floor((time[finite] - t0) / block_seconds).astype(np.int64)
+            block_ids[~finite] = block_ids[finite].max() + 1
+
+        change = np.flatnonzero(np.diff(block_ids)) + 1
+        self.block_starts = np.concatenate([[0], change]).astype(np.int64)
+        self.block_ends = np.concatenate([change, [n]]).astype(np.int64)
+        sizes = self.block_ends - self.block_starts
+        block = np.repeat(np.arange(len(sizes)), sizes)
+
+        # 블록 안에서 값 순서로 정렬한 뒤, 블록 내 순위를 k1 스케일로 centroid 번호에 대응
+        sorted_values = values[np.lexsort((values, block_ids))]
+        rank = np.arange(n) - self.block_starts[block]
+        q = (rank + 0.5) / sizes[block]
+        group = np.floor(centroids * (np.arcsin(2 * q - 1) / np.pi + 0.5)).astype(np.int64)
+        key = block * centroids + np.clip(group, 0, centroids - 1)
+
+        bounds = np.flatnonzero(np.concatenate([[True], key[1:] != key[:-1]]))
+        self.weights = np.diff(np.concatenate([bounds, [n]]))
+        self.means = np.add.reduceat(sorted_values, bounds) / self.weights
+        # 블록 b의 centroid는 means[offsets[b]:offsets[b + 1]]
+        self.offsets = np.concatenate([np.searchsorted(bounds, self.block_starts), [len(bounds)]])
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.block_starts, self.block_ends, self.offsets, self.means, self.weights]
+        return sum(a.nbytes for a in arrays)
+
+    def _merged(self, lo: int, hi: int) -> Tuple[np.ndarray, np.ndarray]:
+        """샘플 [lo, hi) 구간의 (값 순으로 정렬된 centroid 평균, 개수)"""
+        first = int(np.searchsorted(self.block_starts, lo, side="left"))
+        last = int(np.searchsorted(self.block_ends, hi, side="right"))
+        if first >= last:
+            raw = self.values[lo:hi]
+            means, weights = raw, np.ones(len(raw), dtype=np.int64)
+        else:
+            raw = np.concatenate([self.values[lo:self.block_starts[first]],
+                                  self.values[self.block_ends[last - 1]:hi]])
+            c_lo, c_hi = self.offsets[first], self.offsets[last]
+            means = np.concatenate([self.means[c_lo:c_hi], raw])
+            weights = np.concatenate([self.weights[c_lo:c_hi], np.ones(len(raw), dtype=np.int64)])
+        order = np.argsort(means, kind="stable")
+        return means[order], weights[order]
+
+    def quantiles(self, lo: int, hi: int, percentiles: List[float], vmin: float, vmax: float) -> Dict[str, Any]:
+        """샘플 [lo, hi) 구간의 분위수 (vmin/vmax는 구간의 정확한 최소/최대)"""
+        if hi <= lo:
+            return {percentile_key(p): None for p in percentiles}
+        means, weights = self._merged(lo, hi)
+        return interpolate_quantiles(means, weights, percentiles, vmin, vmax)
+
+    def histogram(self, lo: int, hi: int, bins: int, vmin: float, vmax: float) -> Dict[str, Any]:
+        """샘플 [lo, hi) 구간의 [vmin, vmax] 균등 구간 히스토그램 (centroid는 평균이 속한 구간에 합산)"""
+        if hi <= lo:
+            return {"edges": [], "counts": []}
+        means, weights = self._merged(lo, hi)
+        counts, edges = np.histogram(means, bins=bins, range=(vmin, vmax), weights=weights)
+        return {"edges": edges.tolist(), "counts": counts.astype(np.int64).tolist()}
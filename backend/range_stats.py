@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+신호별 구간 통계 인덱스 (누적합 + 블록 sparse table)
+
+결측이 아닌 샘플에 대해 값, 값의 제곱의 누적합을 만들어 두면 임의 구간의
+count/mean/std를 상수 시간에 계산할 수 있습니다. min/max는 BLOCK_SIZE개 샘플 블록의
+최소/최대로 sparse table을 만들어, 구간 양 끝의 부분 블록(최대 2 * BLOCK_SIZE개)만
+직접 계산합니다. 구간 경계는 샘플 시간의 이진 탐색으로 찾습니다.
+분위수와 히스토그램은 고정 시간 블록별 centroid 스케치(quantile_sketch)를 병합해 계산합니다.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from case_store import time_slice_bounds
+from quantile_sketch import BlockQuantileSketch
+
+BLOCK_SIZE = 64
+
+
+def _build_sparse_table(values: np.ndarray, reduce) -> List[np.ndarray]:
+    """table[k][i] = reduce(values[i : i + 2^k])"""
+    table = [values]
+    width = 1
+    while width * 2 <= len(values):
+        prev = table[-1]
+        table.append(reduce(prev[:-width], prev[width:]))
+        width *= 2
+    return table
+
+
+def _query_sparse_table(table: List[np.ndarray], lo: int, hi: int, reduce) -> float:
+    """[lo, hi) 블록 구간의 reduce 값 (hi > lo)"""
+    k = (hi - lo).bit_length() - 1
+    return reduce(table[k][lo], table[k][hi - (1 << k)])
+
+
+class SignalStatsIndex:
+    """한 신호의 구간 통계 인덱스"""
+
+    def __init__(self, time: np.ndarray, values: np.ndarray, source: Optional[Dict[str, int]] = None):
+        time = np.asarray(time, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        valid = np.isfinite(values)
+
+        # 시간이 NaN인 샘플도 케이스 행 순서(맨 뒤)대로 유지해 구간 의미를 DataFrame과 맞춤
+        self.time = time[valid]
+        self.values = values[valid]
+        self.source = source or {}
+
+        # 누적합은 전체 평균을 뺀 값으로 계산해 분산의 자릿수 손실을 줄임
+        self.offset = float(self.values.mean()) if len(self.values) else 0.0
+        shifted = self.values - self.offset
+        self.csum = np.concatenate([[0.0], np.cumsum(shifted)])
+        self.csum2 = np.concatenate([[0.0], np.cumsum(shifted * shifted)])
+
+        n_blocks = len(self.values) // BLOCK_SIZE
+        blocks = self.values[:n_blocks * BLOCK_SIZE].reshape(n_blocks, BLOCK_SIZE)
+        self.min_table = _build_sparse_table(blocks.min(axis=1), np.minimum) if n_blocks else []
+        self.max_table = _build_sparse_table(blocks.max(axis=1), np.maximum) if n_blocks else []
+
+        self.sketch = BlockQuantileSketch(self.time, self.values)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.time, self.values, self.csum, self.csum2] + self.min_table + self.max_table
+        return sum(a.nbytes for a in arrays) + self.sketch.nbytes
+
+    def _min_max(self, lo: int, hi: int) -> Any:
+        """샘플 [lo, hi) 구간의 (min, max)"""
+        first_block = -(-lo // BLOCK_SIZE)
+        last_block = hi // BLOCK_SIZE
+        if first_block >= last_block:
+            segment = self.values[lo:hi]
+            return segment.min(), segment.max()
+
+        vmin = _query_sparse_table(self.min_table, first_block, last_block, min)
+        vmax = _query_sparse_table(self.max_table, first_block, last_block, max)
+        for segment in (self.values[lo:first_block * BLOCK_SIZE], self.values[last_block * BLOCK_SIZE:hi]):
+            if len(segment):
+                vmin = min(vmin, segment.min())
+                vmax = max(vmax, segment.max())
+        return vmin, vmax
+
+    def query(self, start_time: Optional[float], end_time: Optional[float], rows: int,
+              percentiles: Optional[List[float]] = None, bins: int = 0) -> Dict[str, Any]:
+        """
+        [start_time, end_time] 구간 통계 (std는 표본 표준편차, ddof=1)
+
+        Args:
+            rows: 같은 구간의 케이스 전체 행 수 (missing 계산용)
+            percentiles: 계산할 분위수 목록 (0~100, 결과의 "percentiles"에 p5, p50 등의 키로 포함)
+            bins: 0보다 크면 [min, max] 균등 구간 히스토그램을 "histogram"에 포함
+        """
+        lo, hi = time_slice_bounds(self.time, start_time, end_time)
+        count = hi - lo
+        if count == 0:
+            result = {"min": None, "max": None, "mean": None, "std": None, "count": 0, "missing": int(rows)}
+            if percentiles:
+                result["percentiles"] = self.sketch.quantiles(lo, hi, percentiles, np.nan, np.nan)
+            if bins > 0:
+                result["histogram"] = self.sketch.histogram(lo, hi, bins, np.nan, np.nan)
+            return result
+
+        s1 = self.csum[hi] - self.csum[lo]
+        s2 = self.csum2[hi] - self.csum2[lo]
+        mean = s1 / count
+        std = None
+        if count > 1:
+            variance = max((s2 - s1 * mean) / (count - 1), 0.0)
+            std = float(np.sqrt(variance))
+
+        vmin, vmax = self._min_max(lo, hi)
+        result = {
+            "min": float(vmin),
+            "max": float(vmax),
+            "mean": float(mean + self.offset),
+            "std": std,
+            "count": int(count),
+            "missing": int(rows - count),
+        }
+        if percentiles:
+            result["percentiles"] = self.sketch.quantiles(lo, hi, percentiles, vmin, vmax)
+        if bins > 0:
+            result["histogram"] = self.sketch.histogram(lo, hi, bins, vmin, vmax)
+        return result
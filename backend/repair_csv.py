@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+VitalDB CSV 파일 끝의 널 문자(0x00) 줄을 제거하는 복구 도구
+
+파일 전체를 읽지 않고 끝에서부터 블록 단위로 마지막 줄만 검사하며, 마지막 줄이 널 문자로만
+이루어져 있으면 그 줄의 시작 위치로 truncate해 제자리에서 복구합니다 (파일을 다시 쓰지 않음).
+여러 파일은 스레드 풀에서 병렬로 처리하며, --dry-run은 파일을 바꾸지 않고 복구 대상만 보고합니다.
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+# 파일 끝에서 한 번에 읽는 크기
+TAIL_BLOCK_SIZE = 64 * 1024
+
+# bytes.strip()이 제거하는 공백 문자
+WHITESPACE = b" \t\n\r\x0b\x0c"
+
+
+def find_null_trailer(f: BinaryIO, size: int) -> Optional[int]:
+    """
+    마지막 줄이 (앞뒤 공백을 제외하고) 널 문자로만 이루어져 있으면 그 줄의 시작 위치, 아니면 None
+
+    마지막 줄은 readlines()와 같이 끝의 줄바꿈을 포함하며, 널 문자/공백이 아닌 바이트를 만나면
+    더 읽지 않고 바로 None을 반환하므로 정상 파일은 블록 하나만 읽습니다.
+    """
+    # 파일 끝의 줄바꿈은 마지막 줄에 포함되므로 그 앞에서부터 이전 줄바꿈을 찾음
+    end = size
+    if end > 0:
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            end -= 1
+
+    has_null = False
+    pos = end
+    while pos > 0:
+        start = max(0, pos - TAIL_BLOCK_SIZE)
+        f.seek(start)
+        block = f.read(pos - start)
+        newline = block.rfind(b"\n")
+        line_part = block[newline + 1:]
+        stripped = line_part.translate(None, WHITESPACE)
+        if stripped.count(0) != len(stripped):
+            return None
+        has_null = has_null or len(stripped) > 0
+        if newline >= 0:
+            pos = start + newline + 1
+            break
+        pos = start
+
+    # 공백만 있는 줄은 그대로 두고, 널 문자 사이에 공백이 있는 줄은 strip() 기준으로 다시 확인
+    if not has_null:
+        return None
+    f.seek(pos)
+    line = f.read(size - pos).strip()
+    return pos if line.count(0) == len(line) else None
+
+
+def repair_file(path: str, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    파일 끝의 널 문자 줄을 제자리에서 제거 (연속된 널 문자 줄은 모두 제거)
+
+    Returns:
+        {"file", "size", "status" (clean/repaired/would_repair/empty/error), "removed_bytes", "removed_lines"}
+    """
+    result: Dict[str, Any] = {
+        "file": os.path.basename(path), "size": None, "status": "clean", "removed_bytes": 0, "removed_lines": 0,
+    }
+    try:
+        size = os.path.getsize(path)
+        result["size"] = size
+        if size == 0:
+            result["status"] = "empty"
+            return result
+
+        with open(path, "rb" if dry_run else "r+b") as f:
+            new_size = size
+            while new_size > 0:
+                offset = find_null_trailer(f, new_size)
+                if offset is None:
+                    break
+                new_size = offset
+                result["removed_lines"] += 1
+            if new_size < size:
+                if not dry_run:
+                    f.truncate(new_size)
+                result["status"] = "would_repair" if dry_run else "repaired"
+                result["removed_bytes"] = size - new_size
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    return result
+
+
+def repair_directory(directory: str = "./data", dry_run: bool = False, workers: int = 8,
+                     on_result: Optional[Callable[[int, int, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    디렉토리 내 모든 CSV 파일을 병렬로 검사/복구
+
+    Args:
+        directory: CSV 파일이 있는 디렉토리
+        dry_run: True이면 파일을 바꾸지 않고 복구 대상만 보고
+        workers: 병렬 스레드 수
+        on_result: 파일 하나가 끝날 때마다 (완료 수, 전체 수, 결과)로 호출
+
+    Returns:
+        파일별 결과(파일 이름 순)와 상태별 개수, 제거한 바이트 수를 담은 보고서
+    """
+    csv_files = sorted(f for f in os.listdir(directory) if f.endswith(".csv"))
+    started = time.perf_counter()
+    results: List[Dict[str, Any]] = []
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(repair_file, os.path.join(directory, filename), dry_run) for filename in csv_files]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(done, len(csv_files), result)
+
+    results.sort(key=lambda r: r["file"])
+    counts = {status: 0 for status in ("clean", "repaired", "would_repair", "empty", "error")}
+    for result in results:
+        counts[result["status"]] += 1
+    return {
+        "directory": os.path.abspath(directory),
+        "dry_run": dry_run,
+        "total_files": len(results),
+        "counts": counts,
+        "removed_bytes": sum(r["removed_bytes"] for r in results),
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "files": results,
+    }
+
+
+def print_result(done: int, total: int, result: Dict[str, Any]) -> None:
+    filename = result["file"]
+    status = result["status"]
+    if status == "repaired":
+        print(f"[{done}/{total}] {filename}: 마지막 널 문자 줄 제거됨 ({result['removed_bytes']}바이트)")
+    elif status == "would_repair":
+        print(f"[{done}/{total}] {filename}: 널 문자 줄 제거 대상 ({result['removed_bytes']}바이트)")
+    elif status == "empty":
+        print(f"[{done}/{total}] {filename}: 파일이 비어 있습니다. 건너뜁니다.")
+    elif status == "error":
+        print(f"[{done}/{total}] {filename} 처리 중 오류 발생: {result['error']}")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="CSV 파일 끝의 널 문자 줄 제거 (파일 끝만 읽고 제자리에서 복구)")
+    parser.add_argument("-d", "--directory", default="./data", help="CSV 파일이 있는 디렉토리 경로")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="파일을 바꾸지 않고 복구 대상만 보고")
+    parser.add_argument("-j", "--workers", type=int, default=8, help="병렬 스레드 수")
+    parser.add_argument("-o", "--output", help="결과 보고서 JSON 파일 경로")
+    parser.add_argument("-v", "--verbose", action="store_true", help="정상 파일도 출력")
+
+    args = parser.parse_args()
+    if not os.path.exists(args.directory):
+        print(f"Error: Directory '{args.directory}' not found.")
+        sys.exit(1)
+
+    def on_result(done: int, total: int, result: Dict[str, Any]) -> None:
+        if result["status"] == "clean":
+            if args.verbose:
+                print(f"[{done}/{total}] {result['file']}: 마지막 줄 정상")
+        else:
+            print_result(done, total, result)
+
+    report = repair_directory(args.directory, args.dry_run, args.workers, on_result)
+    counts = report["counts"]
+    if args.dry_run:
+        print(f"\n검사 완료: 총 {report['total_files']}개 파일 중 {counts['would_repair']}개 파일에 널 문자 줄이 있습니다 "
+              f"({report['removed_bytes']}바이트, 오류 {counts['error']}개, {report['elapsed_seconds']}초)")
+    else:
+        print(f"\n작업 완료: 총 {report['total_files']}개 파일 중 {counts['repaired']}개 파일에서 널 문자 줄이 제거되었습니다 "
+              f"({report['removed_bytes']}바이트, 오류 {counts['error']}개, {report['elapsed_seconds']}초)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"보고서 저장: {args.output}")
+    if counts["error"]:
+        sys.exit(1)
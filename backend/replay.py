@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+케이스 실시간 재생 (Server-Sent Events)
+
+같은 케이스를 같은 설정으로 보는 모든 시청자는 하나의 ReplayChannel(생산자)을 공유합니다.
+생산자는 interval초마다 재생 시계(시작 시각 + 경과 시간 * 배속)까지의 새 샘플을 한 번 읽고
+한 번 인코딩한 뒤, 같은 바이트를 각 시청자 큐에 넣기만 하므로 시청자 수가 늘어도 비용이 거의 늘지 않습니다.
+느린 시청자의 큐가 가득 차면 가장 오래된 이벤트를 버립니다.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 시청자별로 쌓아 둘 수 있는 최대 이벤트 수
+QUEUE_SIZE = 64
+
+
+def sse_event(event: str, payload: Dict[str, Any]) -> bytes:
+    """SSE 이벤트 하나를 바이트로 인코딩 (data는 한 줄 JSON)"""
+    data = json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+    return f"event: {event}\ndata: {data}\n\n".encode("utf-8")
+
+
+class ReplayChannel:
+    """한 재생 설정의 공유 생산자"""
+
+    def __init__(self, key: Hashable, read_batch: Callable[[float, float], Awaitable[Dict[str, Any]]],
+                 start_time: float, end_time: float, speed: float, interval: float,
+                 on_close: Callable[["ReplayChannel"], None]):
+        """
+        Args:
+            read_batch: (구간 시작, 구간 끝) → 샘플 [시작, 끝)의 이벤트 payload
+            start_time, end_time: 재생할 케이스 시간 범위 (초)
+            speed: 배속 (1이면 실시간)
+            interval: 이벤트 전송 주기 (실제 초)
+            on_close: 생산자가 끝나면 호출 (허브에서 제거)
+        """
+        self.key = key
+        self.read_batch = read_batch
+        self.start_time = start_time
+        self.end_time = end_time
+        self.speed = speed
+        self.interval = interval
+        self.on_close = on_close
+        self.cursor = start_time
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.batches = 0
+        self.dropped = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.subscribers.add(queue)
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+        if not self.subscribers and self._task is not None:
+            self._task.cancel()
+            self._close()
+
+    def _close(self) -> None:
+        self.on_close(self)
+
+    def _publish(self, message: Optional[bytes]) -> None:
+        """모든 시청자 큐에 같은 메시지 추가 (None은 재생 종료)"""
+        for queue in list(self.subscribers):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(message)
+
+    async def _run(self) -> None:
+        started = time.monotonic()
+        try:
+            while self.cursor < self.end_time:
+                await asyncio.sleep(self.interval)
+                target = min(self.start_time + (time.monotonic() - started) * self.speed, self.end_time)
+                if target <= self.cursor:
+                    continue
+                payload = await self.read_batch(self.cursor, target)
+                self.cursor = target
+                self.batches += 1
+                self._publish(sse_event("samples", payload))
+            self._publish(sse_event("end", {"cursor": self.cursor}))
+            self._publish(None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Replay producer {self.key} failed: {e}")
+            self._publish(sse_event("error", {"detail": str(e)}))
+            self._publish(None)
+        finally:
+            self._close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "key": repr(self.key),
+            "subscribers": len(self.subscribers),
+            "cursor": self.cursor,
+            "end_time": self.end_time,
+            "speed": self.speed,
+            "batches": self.batches,
+            "dropped": self.dropped,
+        }
+
+
+class ReplayHub:
+    """재생 설정(키)별 공유 생산자 목록"""
+
+    def __init__(self):
+        self._channels: Dict[Hashable, ReplayChannel] = {}
+        self.created = 0
+
+    def get(self, key: Hashable) -> Optional[ReplayChannel]:
+        return self._channels.get(key)
+
+    def subscribe(self, key: Hashable, factory: Callable[[Callable[[ReplayChannel], None]], ReplayChannel]
+                  ) -> Tuple[ReplayChannel, asyncio.Queue]:
+        """
+        키의 생산자에 구독하고 (생산자, 큐) 반환 (없으면 factory(on_close)로 생성)
+
+        생성과 구독을 await 없이 한 번에 하므로 구독자 없는 생산자가 허브에 남지 않습니다.
+        스트리밍 제너레이터 안에서 호출하고 finally에서 channel.unsubscribe(queue)로 해제해야 합니다.
+        """
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = factory(self._remove)
+            self._channels[key] = channel
+            self.created += 1
+        return channel, channel.subscribe()
+
+    def _remove(self, channel: ReplayChannel) -> None:
+        if self._channels.get(channel.key) is channel:
+            del self._channels[channel.key]
+
+    def stats(self) -> Dict[str, Any]:
+        channels = list(self._channels.values())
+        return {
+            "channels": len(channels),
+            "subscribers": sum(len(c.subscribers) for c in channels),
+            "created": self.created,
+            "producers": [c.stats() for c in channels],
+        }
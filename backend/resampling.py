@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+서로 다른 주기의 신호를 하나의 시간 격자에 맞추는 리샘플링
+
+격자는 고정 간격(fixed_grid) 또는 다른 신호의 샘플 시각이며, 신호마다 결측이 아닌 샘플
+(정렬된 시간, 값)만으로 격자 값을 계산합니다. 행 단위 병합 없이 searchsorted/reduceat으로 벡터화되어 있습니다.
+
+- locf: 격자 시각 이전의 마지막 샘플 값 (max_age초보다 오래되었으면 결측)
+- linear: 격자 시각 양옆 샘플의 선형 보간 (두 샘플 간격이 max_age초보다 크면 결측, 샘플 범위 밖은 결측)
+- mean: 격자 시각 g_i에서 다음 격자 시각 g_{i+1} 전까지 [g_i, g_{i+1}) 구간 샘플의 평균
+  (마지막 구간 폭은 격자 간격의 중앙값, 샘플이 없으면 결측)
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+RESAMPLE_POLICIES = ("locf", "linear", "mean")
+
+
+def fixed_grid(start_time: float, end_time: float, interval: float) -> np.ndarray:
+    """[start_time, end_time] 구간의 interval초 간격 격자 (start_time부터 시작)"""
+    if interval <= 0:
+        raise ValueError("interval must be positive")
+    if end_time < start_time:
+        return np.zeros(0)
+    count = int(np.floor((end_time - start_time) / interval + 1e-9)) + 1
+    return start_time + np.arange(count) * interval
+
+
+def locf_index(time: np.ndarray, grid: np.ndarray, max_age: float) -> np.ndarray:
+    """격자 시각마다 그 이전(같은 시각 포함) 마지막 샘플의 인덱스 (없거나 max_age초보다 오래되었으면 -1)"""
+    idx = np.searchsorted(time, grid, side="right") - 1
+    if len(time) == 0:
+        return idx
+    valid = (idx >= 0) & (grid - time[np.maximum(idx, 0)] <= max_age)
+    return np.where(valid, idx, -1)
+
+
+def resample_locf(time: np.ndarray, values: np.ndarray, grid: np.ndarray, max_age: float) -> np.ndarray:
+    idx = locf_index(time, grid, max_age)
+    if len(values) == 0:
+        return np.full(len(grid), np.nan)
+    return np.where(idx >= 0, values[np.maximum(idx, 0)], np.nan)
+
+
+def resample_linear(time: np.ndarray, values: np.ndarray, grid: np.ndarray, max_age: float) -> np.ndarray:
+    n = len(time)
+    if n == 0:
+        return np.full(len(grid), np.nan)
+    right = np.searchsorted(time, grid, side="left")
+    exact = (right < n) & (time[np.minimum(right, n - 1)] == grid)
+    left = right - 1
+    inside = (left >= 0) & (right < n)
+    lo, hi = np.clip(left, 0, n - 1), np.clip(right, 0, n - 1)
+    gap = time[hi] - time[lo]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = np.where(gap > 0, (grid - time[lo]) / gap, 0.0)
+    result = np.where(inside & (gap <= max_age), values[lo] + weight * (values[hi] - values[lo]), np.nan)
+    return np.where(exact, values[hi], result)
+
+
+def bucket_edges(grid: np.ndarray) -> np.ndarray:
+    """격자 시각별 구간 경계 (len(grid) + 1개, 마지막 구간 폭은 격자 간격의 중앙값)"""
+    if len(grid) == 0:
+        return np.zeros(0)
+    last_width = float(np.median(np.diff(grid))) if len(grid) > 1 else 1.0
+    return np.concatenate([grid, [grid[-1] + last_width]])
+
+
+def resample_mean(time: np.ndarray, values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    if len(grid) == 0:
+        return np.zeros(0)
+    bounds = np.searchsorted(time, bucket_edges(grid), side="left")
+    counts = np.diff(bounds)
+    # reduceat은 빈 구간에서 해당 위치 값을 그대로 돌려주므로 개수가 0인 구간은 결측으로 덮어씀
+    padded = np.concatenate([values, [0.0]])
+    sums = np.add.reduceat(padded, bounds)[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def resample(samples: Dict[str, Tuple[np.ndarray, np.ndarray]], grid: np.ndarray, policy: str,
+             max_age: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """
+    신호별 (정렬된 시간, 값) 샘플을 격자에 맞춤
+
+    Args:
+        samples: 신호 → (시간, 값), 결측이 아닌 샘플만
+        grid: 정렬된 격자 시각
+        policy: "locf", "linear", "mean"
+        max_age: locf/linear의 최대 허용 시간 (초, None이면 제한 없음)
+
+    Returns:
+        신호 → 격자 길이의 float64 값 (결측은 NaN)
+    """
+    if policy not in RESAMPLE_POLICIES:
+        raise ValueError(f"Unknown resample policy: {policy}")
+    limit = np.inf if max_age is None else max_age
+    result = {}
+    for name, (time, values) in samples.items():
+        time = np.asarray(time, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        if policy == "locf":
+            result[name] = resample_locf(time, values, grid, limit)
+        elif policy == "linear":
+            result[name] = resample_linear(time, values, grid, limit)
+        else:
+            result[name] = resample_mean(time, values, grid)
+    return result
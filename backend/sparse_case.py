@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+신호별 희소 표현의 케이스 데이터
+
+VitalDB 와이드 CSV는 장비마다 샘플링 주기가 달라 대부분의 칸이 비어 있습니다.
+SparseCase는 신호마다 결측이 아닌 샘플의 (행 인덱스 int32, 값 float32) 배열만 보관하고,
+DataFrame이 필요할 때만 요청된 신호와 행 구간을 조밀하게 만듭니다.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from case_store import time_slice_bounds
+from encoding import float32_to_float64
+
+ROW_DTYPE = np.int32
+VALUE_DTYPE = np.float32
+
+
+class SparseSignal:
+    """한 신호의 결측이 아닌 샘플 (rows는 오름차순 행 인덱스)"""
+
+    __slots__ = ("rows", "values")
+
+    def __init__(self, rows: np.ndarray, values: np.ndarray):
+        self.rows = rows
+        self.values = values
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes + self.values.nbytes
+
+    def row_range(self, lo: int, hi: int) -> Tuple[int, int]:
+        """행 [lo, hi)에 속하는 샘플의 범위"""
+        return (int(np.searchsorted(self.rows, lo, side="left")),
+                int(np.searchsorted(self.rows, hi, side="left")))
+
+
+class SparseCase:
+    """시간순으로 정렬된 케이스의 신호별 희소 표현"""
+
+    def __init__(self, time: np.ndarray, signals: Dict[str, SparseSignal],
+                 source: Optional[Dict[str, int]] = None):
+        self.time = time
+        self.signals = signals
+        # 로드한 원본 CSV의 크기/수정 시각 (캐시된 케이스가 최신인지 확인용)
+        self.source = source
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, source: Optional[Dict[str, int]] = None) -> "SparseCase":
+        """시간순 정렬된 와이드 DataFrame에서 생성 (NaN/Infinity 값은 결측으로 취급)"""
+        signals = {}
+        for col in df.columns:
+            if col == "time":
+                continue
+            values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+            rows = np.flatnonzero(np.isfinite(values))
+            signals[col] = SparseSignal(rows.astype(ROW_DTYPE), values[rows].astype(VALUE_DTYPE))
+        return cls(df["time"].to_numpy().copy(), signals, source)
+
+    @property
+    def rows(self) -> int:
+        return len(self.time)
+
+    @property
+    def signal_names(self) -> List[str]:
+        """시간 열을 제외한 신호 목록 (원본 열 순서)"""
+        return list(self.signals)
+
+    @property
+    def nbytes(self) -> int:
+        return self.time.nbytes + sum(s.nbytes for s in self.signals.values())
+
+    def samples(self, name: str, start_time: Optional[float] = None,
+                end_time: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """신호의 결측이 아닌 샘플 (시간, float64 값) — NaN 필터링 없이 바로 반환 (값은 가장 짧은 십진 표현)"""
+        signal = self.signals[name]
+        lo, hi = signal.row_range(*time_slice_bounds(self.time, start_time, end_time))
+        rows = signal.rows[lo:hi]
+        return self.time[rows], float32_to_float64(signal.values[lo:hi])
+
+    def to_frame(self, signals: Optional[List[str]] = None, start_time: Optional[float] = None,
+                 end_time: Optional[float] = None) -> pd.DataFrame:
+        """
+        요청된 신호와 시간 구간만 조밀한 DataFrame으로 변환 (없는 신호는 무시)
+        - 구간은 이진 탐색으로 찾으며 비용은 O(log n + 구간 행 수 + 구간 샘플 수)
+        """
+        lo, hi = time_slice_bounds(self.time, start_time, end_time)
+        return self.row_frame(signals, lo, hi)
+
+    def row_frame(self, signals: Optional[List[str]], lo: int, hi: int) -> pd.DataFrame:
+        """행 [lo, hi)의 요청된 신호만 조밀한 DataFrame으로 변환 (값은 저장된 float32 그대로, 결측은 NaN)"""
+        names = self.signal_names if signals is None else [s for s in signals if s in self.signals]
+        data = {"time": self.time[lo:hi].copy()}
+        for name in names:
+            signal = self.signals[name]
+            a, b = signal.row_range(lo, hi)
+            column = np.full(hi - lo, np.nan, dtype=VALUE_DTYPE)
+            column[signal.rows[a:b] - lo] = signal.values[a:b]
+            data[name] = column
+        return pd.DataFrame(data)
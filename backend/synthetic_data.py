@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+부하 테스트용 합성 케이스 생성기
+
+VitalDB 내보내기와 비슷한 와이드 케이스를 벡터화 연산으로 생성합니다.
+- 수백 개 신호, 신호별로 다른 샘플링 주기 (파형은 매 행, 수치는 1~2초, 설정값은 수십 초~수 분)
+- 실제 내보내기와 비슷한 결측 패턴 (장비 연결 전/해제 후 구간, 연속 결측 구간, 산발적 결측)
+- 서버가 읽는 형식으로 기록: 케이스 CSV, memmap 저장소, clinical_info.csv
+
+출력 디렉토리는 명시적으로 지정해야 하며, 서버의 데이터 디렉토리에는 쓰지 않습니다.
+
+사용 예:
+    python synthetic_data.py -o /tmp/vitalab-bench -n 1000 --signals 300 --hours 4 -j 8
+    VITALAB_DATA_DIR=/tmp/vitalab-bench uvicorn main:app
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from case_store import get_store_dir, source_identity, write_store
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow는 선택 의존성 (있으면 CSV 기록이 수 배 빠름)
+    pa = None
+
+# (신호 이름, 샘플 주기(초, 0이면 매 행), 기준값, 변동 폭, 최소, 최대)
+BASE_SIGNALS: List[Tuple[str, float, float, float, float, float]] = [
+    ("SNUADC/ECG_II", 0, 0.0, 0.5, -2.0, 2.0),
+    ("SNUADC/ART", 0, 90.0, 25.0, 20.0, 250.0),
+    ("SNUADC/PLETH", 0, 50.0, 20.0, 0.0, 100.0),
+    ("BIS/EEG1_WAV", 0, 0.0, 30.0, -200.0, 200.0),
+    ("Solar8000/HR", 2, 75.0, 12.0, 30.0, 200.0),
+    ("Solar8000/PLETH_SPO2", 2, 98.0, 1.5, 70.0, 100.0),
+    ("Solar8000/ART_SBP", 2, 120.0, 18.0, 50.0, 250.0),
+    ("Solar8000/ART_DBP", 2, 65.0, 10.0, 20.0, 150.0),
+    ("Solar8000/ART_MBP", 2, 85.0, 12.0, 30.0, 180.0),
+    ("Solar8000/ETCO2", 2, 35.0, 4.0, 0.0, 60.0),
+    ("Solar8000/BT", 10, 36.5, 0.4, 33.0, 40.0),
+    ("Solar8000/NIBP_SBP", 300, 125.0, 15.0, 60.0, 220.0),
+    ("BIS/BIS", 1, 45.0, 10.0, 0.0, 100.0),
+    ("BIS/SQI", 1, 90.0, 8.0, 0.0, 100.0),
+    ("Primus/MAWP_MBAR", 2, 8.0, 2.0, 0.0, 40.0),
+    ("Primus/FIO2", 2, 50.0, 5.0, 21.0, 100.0),
+    ("Primus/SET_FRESH_FLOW", 60, 2000.0, 500.0, 0.0, 10000.0),
+    ("Orchestra/PPF20_RATE", 10, 20.0, 8.0, 0.0, 200.0),
+    ("Orchestra/RFTN20_CE", 10, 3.0, 1.0, 0.0, 20.0),
+]
+
+# 추가 신호의 장비 이름과 샘플 주기 후보 (초, 0이면 매 행)
+EXTRA_DEVICES = ["Solar8000", "Primus", "BIS", "Orchestra", "SNUADC", "Vigileo", "EV1000"]
+EXTRA_INTERVALS = [0, 1, 2, 2, 2, 5, 10, 30, 60, 300]
+
+DEPARTMENTS = ["General surgery", "Thoracic surgery", "Urology", "Gynecology"]
+DIAGNOSES = ["Rectal cancer", "Gastric cancer", "Lung cancer", "Prostate cancer", "Cholelithiasis"]
+OPERATIONS = ["Low anterior resection", "Gastrectomy", "Lobectomy", "Prostatectomy", "Cholecystectomy"]
+
+
+def signal_specs(n_signals: int, rng: np.random.Generator) -> List[Tuple[str, float, float, float, float, float]]:
+    """기본 신호 목록에 임의 주기의 추가 신호를 더해 n_signals개 신호 사양 생성"""
+    specs = BASE_SIGNALS[:n_signals]
+    for idx in range(n_signals - len(specs)):
+        device = EXTRA_DEVICES[idx % len(EXTRA_DEVICES)]
+        baseline = float(rng.uniform(1, 200))
+        specs.append((f"{device}/TRACK_{idx:03d}", float(rng.choice(EXTRA_INTERVALS)),
+                      baseline, baseline * 0.1, 0.0, baseline * 3))
+    return specs
+
+
+def _gap_mask(length: int, gaps: int, max_gap: int, rng: np.random.Generator) -> np.ndarray:
+    """길이 length에서 임의 위치의 연속 결측 구간 gaps개를 True로 표시"""
+    mask = np.zeros(length + 1, dtype=np.int32)
+    if length == 0 or gaps == 0:
+        return mask[:length].astype(bool)
+    starts = rng.integers(0, length, gaps)
+    ends = np.minimum(starts + rng.integers(1, max(max_gap, 2), gaps), length)
+    np.add.at(mask, starts, 1)
+    np.add.at(mask, ends, -1)
+    return np.cumsum(mask)[:length] > 0
+
+
+def generate_case(case_id: int, n_signals: int = 200, duration: float = 4 * 3600,
+                  step: float = 1.0, seed: int = 0) -> pd.DataFrame:
+    """
+    합성 케이스 하나 생성 (행 반복 없이 신호 단위로 벡터화)
+
+    Args:
+        case_id (int): 케이스 ID (seed와 함께 난수 시드로 사용, 같은 인자면 같은 결과)
+        n_signals (int): 신호 수
+        duration (float): 케이스 길이 (초)
+        step (float): time 열 간격 (초, 파형 신호의 샘플 주기)
+        seed (int): 기본 난수 시드
+
+    Returns:
+        pd.DataFrame: time 열과 신호 열 (float32, 결측은 NaN)
+    """
+    rng = np.random.default_rng([seed, case_id])
+    rows = int(duration / step)
+    time_values = np.arange(rows) * step
+    if float(step).is_integer():
+        time_values = time_values.astype(np.int64)
+
+    columns: Dict[str, np.ndarray] = {"time": time_values}
+    for name, interval, baseline, spread, vmin, vmax in signal_specs(n_signals, rng):
+        column = np.full(rows, np.nan, dtype=np.float32)
+        every = max(1, int(round(interval / step))) if interval else 1
+
+        # 장비 연결 구간: 케이스 시작 후 늦게 연결되거나 끝나기 전에 해제됨
+        first = int(rng.integers(0, max(1, rows // 10))) if rng.random() < 0.5 else 0
+        last = rows - int(rng.integers(0, max(1, rows // 20))) if rng.random() < 0.3 else rows
+        idx = np.arange(first + int(rng.integers(0, every)), last, every)
+        n = len(idx)
+        if n == 0:
+            columns[name] = column
+            continue
+
+        t = idx * step
+        if interval == 0:
+            # 파형: 주기적 신호 + 잡음
+            period = float(rng.uniform(0.6, 1.2))
+            values = baseline + spread * np.sin(2 * np.pi * t / period) + rng.normal(0, spread * 0.05, n)
+        else:
+            # 수치: 느린 추세(누적 잡음) + 수 분 주기 변동 + 측정 잡음
+            drift = np.cumsum(rng.normal(0, 1, n))
+            drift = (drift - drift.mean()) / (drift.std() or 1.0)
+            values = (baseline + spread * 0.6 * drift
+                      + spread * 0.3 * np.sin(2 * np.pi * t / rng.uniform(300, 1800))
+                      + rng.normal(0, spread * 0.1, n))
+            values = np.round(values, 1)
+        values = np.clip(values, vmin, vmax)
+
+        # 결측 패턴: 연속 결측 구간(센서 탈락)과 산발적 결측
+        missing = _gap_mask(n, int(rng.poisson(3)), max(2, n // 50), rng) | (rng.random(n) < 0.002)
+        column[idx[~missing]] = values[~missing]
+        columns[name] = column
+    return pd.DataFrame(columns)
+
+
+def generate_clinical_info(case_ids: List[int], seed: int = 0) -> pd.DataFrame:
+    """clinical_info.csv 형식의 합성 임상 정보 (서버가 읽는 열만)"""
+    rng = np.random.default_rng([seed, 0x5EED])
+    n = len(case_ids)
+    height = np.round(rng.normal(165, 9, n), 1)
+    weight = np.round(rng.normal(65, 12, n), 1)
+    return pd.DataFrame({
+        "caseid": case_ids,
+        "age": rng.integers(18, 90, n),
+        "sex": rng.choice(["M", "F"], n),
+        "height": height,
+        "weight": weight,
+        "bmi": np.round(weight / (height / 100) ** 2, 1),
+        "asa": rng.integers(1, 5, n),
+        "department": rng.choice(DEPARTMENTS, n),
+        "dx": rng.choice(DIAGNOSES, n),
+        "opname": rng.choice(OPERATIONS, n),
+    })
+
+
+def write_csv(df: pd.DataFrame, csv_path: str) -> None:
+    """케이스 CSV 기록 (pyarrow가 있으면 pyarrow CSV writer, 없으면 pandas)"""
+    if pa is not None:
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), csv_path)
+    else:
+        df.to_csv(csv_path, index=False)
+
+
+def write_case(output_dir: str, case_id: int, output_format: str, n_signals: int,
+               duration: float, step: float, seed: int) -> int:
+    """케이스 하나를 생성해 지정한 형식(csv, store, both)으로 기록하고 행 수 반환"""
+    df = generate_case(case_id, n_signals, duration, step, seed)
+    csv_path = os.path.join(output_dir, f"{case_id}.csv")
+    store_dir = get_store_dir(output_dir, case_id)
+
+    if output_format in ("csv", "both"):
+        write_csv(df, csv_path)
+    if output_format in ("store", "both"):
+        # CSV도 쓰면 저장소가 그 CSV와 일치하는 최신 상태로 기록되고, 저장소만 쓰면 기록한 배열 파일이 원본
+        write_store(df, store_dir, source_identity(csv_path) if output_format == "both" else None)
+    return len(df)
+
+
+def _is_live_data_dir(path: str) -> bool:
+    """서버가 사용하는 데이터 디렉토리인지 확인 (VITALAB_DATA_DIR, 기본 backend/data)"""
+    live_dirs = {os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")}
+    if os.environ.get("VITALAB_DATA_DIR"):
+        live_dirs.add(os.environ["VITALAB_DATA_DIR"])
+    target = os.path.realpath(path)
+    return any(os.path.realpath(live) == target for live in live_dirs)
+
+
+def generate_directory(output_dir: str, count: int, start_id: int = 1, output_format: str = "csv",
+                       n_signals: int = 200, duration: float = 4 * 3600, step: float = 1.0,
+                       seed: int = 0, workers: int = 1, clinical: bool = True) -> int:
+    """
+    합성 케이스 count개를 프로세스 풀에서 생성해 output_dir에 기록
+
+    Returns:
+        int: 생성된 케이스 수
+    """
+    if _is_live_data_dir(output_dir):
+        raise ValueError(f"Refusing to write synthetic cases into the live data directory: {output_dir}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    case_ids = list(range(start_id, start_id + count))
+    started = time.perf_counter()
+    generated = 0
+    total_rows = 0
+
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(write_case, output_dir, case_id, output_format, n_signals, duration, step, seed): case_id
+            for case_id in case_ids
+        }
+        for idx, (future, case_id) in enumerate(futures.items(), 1):
+            try:
+                total_rows += future.result()
+                generated += 1
+                if idx % 100 == 0 or idx == len(case_ids):
+                    print(f"[{idx}/{len(case_ids)}] 케이스 {case_id}까지 생성됨")
+            except Exception as e:
+                print(f"[{idx}/{len(case_ids)}] 케이스 {case_id} 생성 중 오류 발생: {str(e)}")
+
+    if clinical:
+        generate_clinical_info(case_ids, seed).to_csv(os.path.join(output_dir, "clinical_info.csv"), index=False)
+
+    elapsed = time.perf_counter() - started
+    print(f"\n작업 완료: {generated}개 케이스 ({total_rows}행, 케이스당 {n_signals}개 신호)를 {elapsed:.1f}초에 생성했습니다.")
+    return generated
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="부하 테스트용 합성 케이스 생성 (서버 데이터 디렉토리에는 쓰지 않음)")
+    parser.add_argument("-o", "--output", required=True, help="출력 디렉토리 (서버 데이터 디렉토리와 달라야 함)")
+    parser.add_argument("-n", "--count", type=int, default=100, help="생성할 케이스 수")
+    parser.add_argument("--start-id", type=int, default=1, help="첫 케이스 ID")
+    parser.add_argument("--signals", type=int, default=200, help="케이스당 신호 수")
+    parser.add_argument("--hours", type=float, default=4.0, help="케이스 길이 (시간)")
+    parser.add_argument("--step", type=float, default=1.0, help="time 열 간격 (초, 파형 신호의 샘플 주기)")
+    parser.add_argument("--format", choices=["csv", "store", "both"], default="csv",
+                        help="출력 형식 (csv: 케이스 CSV, store: memmap 저장소, both: 둘 다)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="병렬 프로세스 수")
+    parser.add_argument("--no-clinical", action="store_true", help="clinical_info.csv를 만들지 않음")
+
+    args = parser.parse_args()
+    try:
+        generate_directory(args.output, args.count, args.start_id, args.format, args.signals,
+                           args.hours * 3600, args.step, args.seed, args.workers, not args.no_clinical)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
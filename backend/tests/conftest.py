@@ -0,0 +1,28 @@
+# tests/conftest.py
+import importlib
+import os
+import sys
+
+import pytest
+
+# 백엔드 모듈(main, encoding 등)을 최상위 모듈로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def data_dir(tmp_path_factory):
+    """테스트용 데이터 디렉토리 (main을 import하기 전에 VITALAB_DATA_DIR로 지정)"""
+    path = tmp_path_factory.mktemp("data")
+    os.environ["VITALAB_DATA_DIR"] = str(path)
+    os.environ["VITALAB_PREWARM_TOP_N"] = "0"
+    return path
+
+
+@pytest.fixture(scope="session")
+def app_client(data_dir):
+    """세션 전체에서 공유하는 TestClient (lifespan 종료 시 실행기가 닫히므로 한 번만 시작)"""
+    from fastapi.testclient import TestClient
+
+    main = importlib.import_module("main")
+    with TestClient(main.app) as test_client:
+        yield test_client
@@ -0,0 +1,101 @@
+# tests/test_cohort.py
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from case_store import convert_csv_to_store, get_store_dir
+from cohort import CohortRunner, SignalAggregate, aggregate_case, sample_holds
+
+THRESHOLDS = [("<", 65.0), (">=", 100.0)]
+
+
+def aggregate(values, holds):
+    return SignalAggregate.from_samples(values, holds, thresholds=THRESHOLDS)
+
+
+class TestSignalAggregate:
+    def test_chan_merge_matches_numpy(self):
+        rng = np.random.default_rng(0)
+        # 평균이 크고 분산이 작은 값, 크기가 다른 부분과 빈 부분을 섞어 병합 순서와 자릿수 손실을 확인
+        parts = [1e6 + rng.normal(size=n) for n in (1, 2, 500, 0, 3000, 17)]
+        merged = SignalAggregate(thresholds=THRESHOLDS)
+        for part in parts:
+            merged.merge(aggregate(part, np.ones(len(part))))
+        values = np.concatenate(parts)
+
+        result = merged.result([50])
+        assert result["cases"] == 5 and result["count"] == len(values)
+        assert result["mean"] == pytest.approx(values.mean(), rel=1e-14)
+        assert result["std"] == pytest.approx(values.std(ddof=1), rel=1e-9)
+        assert result["min"] == values.min() and result["max"] == values.max()
+
+    def test_merge_order_does_not_matter(self):
+        rng = np.random.default_rng(1)
+        parts = [rng.normal(70, 10, n) for n in (10, 1000, 3)]
+        forward, backward = SignalAggregate(), SignalAggregate()
+        for part in parts:
+            forward.merge(SignalAggregate.from_samples(part, np.ones(len(part))))
+        for part in reversed(parts):
+            backward.merge(SignalAggregate.from_samples(part, np.ones(len(part))))
+        assert forward.mean == pytest.approx(backward.mean, rel=1e-14)
+        assert forward.m2 == pytest.approx(backward.m2, rel=1e-12)
+
+    def test_threshold_counts(self):
+        values = np.array([60.0, 65.0, 70.0, 100.0, 120.0, 50.0])
+        holds = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        first = aggregate(values[:3], holds[:3])
+        second = aggregate(values[3:], holds[3:])
+        result = first.merge(second).result([])
+
+        below = result["thresholds"]["<65"]
+        assert below["samples"] == 2 and below["seconds"] == 7.0
+        assert below["sample_fraction"] == 2 / 6 and below["time_fraction"] == 7.0 / 21.0
+        above = result["thresholds"][">=100"]
+        assert above["samples"] == 2 and above["seconds"] == 9.0
+
+    def test_empty_aggregate(self):
+        result = SignalAggregate(thresholds=THRESHOLDS).result([50])
+        assert result["count"] == 0 and result["mean"] is None and result["std"] is None
+        assert result["thresholds"]["<65"]["sample_fraction"] is None
+
+    def test_sample_holds(self):
+        # 마지막 샘플은 간격의 중앙값, 긴 공백은 max_hold로 제한
+        holds = sample_holds(np.array([0.0, 1.0, 3.0, 200.0]), max_hold=60.0)
+        assert holds.tolist() == [1.0, 2.0, 60.0, 2.0]
+
+
+class TestReadCase:
+    def test_csv_and_store_give_same_aggregate(self, tmp_path):
+        frame = pd.DataFrame({"time": np.arange(6, dtype=np.float64),
+                              "Solar8000/BT": [36.6, 36.7, np.nan, 36.65, 37.1, 36.9],
+                              "BIS/SQI": [0.8, 0.1, 0.3, np.nan, 0.7, 0.123456789]})
+        frame.to_csv(tmp_path / "1.csv", index=False)
+        spec = {"thresholds": {"Solar8000/BT": [("<", 36.7)]}}
+        signals = ["Solar8000/BT", "BIS/SQI"]
+
+        from_csv = aggregate_case(str(tmp_path), 1, signals, spec)
+        convert_csv_to_store(str(tmp_path / "1.csv"), get_store_dir(str(tmp_path), 1))
+        from_store = aggregate_case(str(tmp_path), 1, signals, spec)
+
+        for signal in signals:
+            assert from_csv[signal].result([5, 50, 95]) == from_store[signal].result([5, 50, 95])
+        assert from_csv["Solar8000/BT"].vmin == 36.6
+        assert from_csv["Solar8000/BT"].thresholds["<36.7"][0] == 2
+
+
+class TestCohortRunner:
+    def test_broken_pool_is_replaced(self, tmp_path):
+        runner = CohortRunner(str(tmp_path), 1)
+        first = runner.executor()
+
+        def broken(executor):
+            raise BrokenProcessPool("worker died")
+
+        with pytest.raises(BrokenProcessPool):
+            runner.call(broken)
+        second = runner.executor()
+        assert second is not first
+        assert runner.call(lambda executor: executor) is second
+        runner.shutdown()
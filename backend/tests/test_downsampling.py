@@ -0,0 +1,37 @@
+# tests/test_downsampling.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from downsampling import downsample_frame, split_budget
+
+
+def sparse_frame(n_rows: int, n_signals: int, seed: int = 0) -> pd.DataFrame:
+    """신호마다 샘플 위치가 다른 와이드 DataFrame (결측 많음)"""
+    rng = np.random.default_rng(seed)
+    data = {"time": np.arange(n_rows, dtype=np.float64)}
+    for i in range(n_signals):
+        values = rng.normal(size=n_rows)
+        values[rng.random(n_rows) < 0.5] = np.nan
+        data[f"S{i}"] = values
+    return pd.DataFrame(data)
+
+
+class TestDownsampleBudget:
+    def test_split_budget_never_exceeds_total(self):
+        assert split_budget([1000, 1000], 50) == [25, 25]
+        assert split_budget([10, 1000], 50) == [10, 40]
+        assert sum(split_budget([3, 7, 1000, 1000], 11)) <= 11
+
+    @pytest.mark.parametrize("method", ["uniform", "minmax", "lttb"])
+    @pytest.mark.parametrize("n_signals", [1, 2, 5])
+    def test_rows_bounded_by_resolution(self, method, n_signals):
+        df = sparse_frame(10000, n_signals)
+        result = downsample_frame(df, 50, method)
+        assert len(result) <= 50
+        for col in df.columns[1:]:
+            assert result[col].notna().any()
+
+    def test_more_signals_than_resolution(self):
+        df = sparse_frame(1000, 20)
+        assert len(downsample_frame(df, 7, "minmax")) <= 7
@@ -0,0 +1,65 @@
+# tests/test_events.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from case_store import source_identity
+from events import PRESET_RULES, EventIndex, EventIndexStore, EventRule, get_index_path
+
+
+class TestEventRuleKey:
+    def test_close_thresholds_have_distinct_keys(self):
+        a = EventRule("Solar8000/ART_MBP", "<", 65.0000001)
+        b = EventRule("Solar8000/ART_MBP", "<", 65.0000002)
+        assert a.key != b.key
+
+    def test_int_and_float_thresholds_share_key(self):
+        assert EventRule("HR", ">", 100).key == EventRule("HR", ">", 100.0).key
+
+
+class TestEventIndexStore:
+    def test_memory_is_bounded(self, tmp_path):
+        store = EventIndexStore(str(tmp_path), max_bytes=1000)
+        for threshold in range(10):
+            rule = EventRule("HR", ">", threshold)
+            index = EventIndex(rule, {key: np.zeros(10) for key in ("case_id", "start", "end", "extreme", "mean")})
+            store._indexes.put(rule, index)
+        stats = store.stats()
+        assert stats["nbytes"] <= 1000
+        assert stats["cache"]["evictions"] > 0
+
+    def test_nbytes_counts_sources_and_errors(self):
+        rule = EventRule("HR", ">", 100)
+        empty = EventIndex(rule).nbytes
+        index = EventIndex(rule, sources={i: {"size": i, "mtime_ns": i} for i in range(1000)},
+                           errors={i: "unreadable" for i in range(100)})
+        assert index.nbytes > empty + 1000 * 64
+
+
+class TestEventIndexPersistence:
+    @pytest.fixture
+    def store(self, tmp_path):
+        frame = pd.DataFrame({"time": np.arange(600, dtype=np.float64),
+                              "Solar8000/HR": np.where(np.arange(600) < 300, 120.0, 80.0)})
+        frame.to_csv(tmp_path / "1.csv", index=False)
+        return EventIndexStore(str(tmp_path))
+
+    def get(self, store, rule):
+        identities = {1: source_identity(os.path.join(store.data_dir, "1.csv"))}
+        with ThreadPoolExecutor(1) as executor:
+            return store.get(rule, identities, executor, complete=True)
+
+    def test_preset_rule_is_saved(self, store):
+        rule = PRESET_RULES["tachycardia"]
+        assert len(self.get(store, rule).columns["case_id"]) == 1
+        assert os.path.exists(get_index_path(store.data_dir, rule))
+
+    def test_ad_hoc_rule_stays_in_memory(self, store):
+        rules = [EventRule("Solar8000/HR", ">", 100 + i / 10) for i in range(5)]
+        for rule in rules:
+            assert len(self.get(store, rule).columns["case_id"]) == 1
+        assert not os.path.exists(os.path.join(store.data_dir, "events"))
+        assert store.stats()["cache"]["entries"] == 5
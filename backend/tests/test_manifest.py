@@ -0,0 +1,41 @@
+# tests/test_manifest.py
+import os
+
+import pandas as pd
+import pytest
+
+CASE_ID = 7
+
+
+@pytest.fixture(scope="module")
+def client(data_dir, app_client):
+    pd.DataFrame({"time": [0.0, 1.0], "Solar8000/HR": [60.0, 61.0]}).to_csv(data_dir / f"{CASE_ID}.csv", index=False)
+    return app_client
+
+
+@pytest.fixture
+def manifest():
+    import main
+
+    interval = main.dataset_manifest.refresh_interval
+    main.dataset_manifest.refresh(force=True)
+    # 테스트 도중 백그라운드 갱신이 항목을 바꾸지 않도록 갱신 주기를 늘림
+    main.dataset_manifest.refresh_interval = 1e9
+    yield main.dataset_manifest
+    main.dataset_manifest.refresh_interval = interval
+
+
+class TestManifestSignals:
+    def test_stale_entry_is_not_used(self, client, data_dir, manifest):
+        assert manifest.get(CASE_ID)["signals"] == ["Solar8000/HR"]
+
+        path = data_dir / f"{CASE_ID}.csv"
+        stat = os.stat(path)
+        pd.DataFrame({"time": [0.0, 1.0], "Solar8000/HR": [60.0, 61.0], "Solar8000/BT": [36.5, 36.6]}).to_csv(path, index=False)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        # 매니페스트는 아직 이전 파일 기준
+        assert manifest.get(CASE_ID)["signals"] == ["Solar8000/HR"]
+        response = client.get(f"/api/case/{CASE_ID}/signals")
+        assert response.status_code == 200
+        assert response.json()["signals"][:2] == ["Solar8000/HR", "Solar8000/BT"]
@@ -0,0 +1,119 @@
+# tests/test_range_stats.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantile_sketch import BlockQuantileSketch, compress_centroids
+from range_stats import BLOCK_SIZE, SignalStatsIndex
+
+PERCENTILES = [1, 5, 25, 50, 75, 95, 99]
+
+
+@pytest.fixture(scope="module")
+def signal():
+    """1초 간격 행 20000개, 값의 약 30%는 결측, 평균이 커서 분산 계산의 자릿수 손실이 드러나는 값"""
+    rng = np.random.default_rng(0)
+    time = np.arange(20000, dtype=np.float64)
+    values = 1e6 + rng.lognormal(size=len(time))
+    values[rng.random(len(time)) < 0.3] = np.nan
+    return time, values, SignalStatsIndex(time, values)
+
+
+def expected(time, values, start, end):
+    window = pd.Series(values[(time >= start) & (time <= end)]).dropna()
+    return window
+
+
+def assert_matches(result, window):
+    assert result["count"] == len(window)
+    assert result["min"] == window.min()
+    assert result["max"] == window.max()
+    assert result["mean"] == pytest.approx(window.mean(), rel=1e-12)
+    if len(window) > 1:
+        assert result["std"] == pytest.approx(window.std(), rel=1e-6)
+    else:
+        assert result["std"] is None
+
+
+class TestSignalStatsIndex:
+    def test_random_windows_match_pandas(self, signal):
+        time, values, index = signal
+        rng = np.random.default_rng(1)
+        for start, end in np.sort(rng.uniform(-100, 20100, (300, 2)), axis=1):
+            window = expected(time, values, start, end)
+            result = index.query(start, end, 0)
+            if len(window):
+                assert_matches(result, window)
+
+    def test_block_boundary_windows(self, signal):
+        time, values, index = signal
+        sample_time = index.time
+        # 결측이 아닌 샘플 기준으로 블록 경계에서 시작/끝나거나 경계를 하나만 넘는 구간
+        for lo, hi in [(0, BLOCK_SIZE), (BLOCK_SIZE, 2 * BLOCK_SIZE), (BLOCK_SIZE - 1, BLOCK_SIZE + 1),
+                       (BLOCK_SIZE - 1, 3 * BLOCK_SIZE), (1, 5 * BLOCK_SIZE - 1), (0, len(sample_time))]:
+            start, end = sample_time[lo], sample_time[hi - 1]
+            window = expected(time, values, start, end)
+            assert len(window) == hi - lo
+            assert_matches(index.query(start, end, 0), window)
+
+    def test_single_sample_and_empty_window(self, signal):
+        time, values, index = signal
+        t = index.time[10]
+        assert_matches(index.query(t, t, 0), expected(time, values, t, t))
+
+        result = index.query(30000, 40000, 7, PERCENTILES, bins=4)
+        assert result["count"] == 0 and result["missing"] == 7
+        assert result["min"] is None and result["mean"] is None and result["std"] is None
+        assert all(v is None for v in result["percentiles"].values())
+        assert result["histogram"] == {"edges": [], "counts": []}
+
+    def test_empty_signal(self):
+        index = SignalStatsIndex(np.arange(5.0), np.full(5, np.nan))
+        assert index.query(None, None, 5)["count"] == 0
+
+    def test_histogram_counts_window(self, signal):
+        time, values, index = signal
+        result = index.query(1000, 9000, 0, bins=10)
+        assert sum(result["histogram"]["counts"]) == result["count"]
+        assert result["histogram"]["edges"][0] == result["min"]
+        assert result["histogram"]["edges"][-1] == result["max"]
+
+
+class TestQuantileSketch:
+    def test_small_window_is_exact(self, signal):
+        time, values, index = signal
+        # 한 블록 안의 구간은 원본 샘플로 계산하므로 numpy와 같음
+        result = index.query(100, 130, 0, PERCENTILES)
+        window = expected(time, values, 100, 130)
+        for p in PERCENTILES:
+            assert result["percentiles"][f"p{p}"] == pytest.approx(np.percentile(window, p), rel=1e-12)
+
+    def test_accuracy_bound(self, signal):
+        """200개 이상 샘플 구간에서 분위수의 순위 오차 1% 이내, 값 오차는 구간 범위의 1% 이내"""
+        time, values, index = signal
+        rng = np.random.default_rng(2)
+        for start, end in np.sort(rng.uniform(0, 20000, (200, 2)), axis=1):
+            window = np.sort(expected(time, values, start, end).to_numpy())
+            if len(window) < 200:
+                continue
+            result = index.query(start, end, 0, PERCENTILES)["percentiles"]
+            for p in PERCENTILES:
+                estimate = result[f"p{p}"]
+                rank = np.searchsorted(window, estimate) / len(window)
+                assert abs(rank - p / 100) <= 0.01
+                assert abs(estimate - np.percentile(window, p)) <= 0.01 * (window[-1] - window[0])
+
+    def test_compress_keeps_weight_and_mean(self):
+        rng = np.random.default_rng(3)
+        means, weights = rng.normal(size=1000), rng.integers(1, 5, 1000)
+        merged_means, merged_weights = compress_centroids(means, weights, 32)
+        assert len(merged_means) <= 32
+        assert merged_weights.sum() == weights.sum()
+        assert np.all(np.diff(merged_means) >= 0)
+        assert (merged_means * merged_weights).sum() == pytest.approx((means * weights).sum())
+
+    def test_nan_time_samples_form_last_block(self):
+        time = np.array([0.0, 1.0, 70.0, np.nan, np.nan])
+        sketch = BlockQuantileSketch(time, np.array([1.0, 2.0, 3.0, 4.0, 5.0]))
+        assert sketch.block_starts.tolist() == [0, 2, 3]
+        assert sketch.block_ends.tolist() == [2, 3, 5]
@@ -0,0 +1,106 @@
+# tests/test_repair_csv.py
+import os
+import subprocess
+import sys
+
+import pytest
+
+from repair_csv import TAIL_BLOCK_SIZE, repair_directory, repair_file
+
+HEADER = b"time,Solar8000/HR\n0,60\n1,61\n"
+
+
+def write(path, content: bytes) -> str:
+    path.write_bytes(content)
+    return str(path)
+
+
+class TestRepairFile:
+    def test_single_null_line(self, tmp_path):
+        path = write(tmp_path / "1.csv", HEADER + b"\0\0\0\0\n")
+        result = repair_file(path)
+        assert result["status"] == "repaired" and result["removed_lines"] == 1
+        assert open(path, "rb").read() == HEADER
+
+    def test_multiple_null_lines(self, tmp_path):
+        path = write(tmp_path / "1.csv", HEADER + b"\0\0\n\0\0\0\n \0 \n")
+        result = repair_file(path)
+        assert result["removed_lines"] == 3
+        assert result["removed_bytes"] == len(b"\0\0\n\0\0\0\n \0 \n")
+        assert open(path, "rb").read() == HEADER
+
+    def test_no_final_newline(self, tmp_path):
+        path = write(tmp_path / "1.csv", HEADER + b"\0\0\0")
+        assert repair_file(path)["status"] == "repaired"
+        assert open(path, "rb").read() == HEADER
+
+        # 마지막 데이터 줄에 줄바꿈이 없어도 정상 파일은 그대로
+        clean = write(tmp_path / "2.csv", HEADER + b"2,62")
+        assert repair_file(clean)["status"] == "clean"
+        assert open(clean, "rb").read() == HEADER + b"2,62"
+
+    def test_whitespace_only_last_line_is_kept(self, tmp_path):
+        content = HEADER + b"   \n"
+        path = write(tmp_path / "1.csv", content)
+        assert repair_file(path)["status"] == "clean"
+        assert open(path, "rb").read() == content
+
+    def test_null_line_before_whitespace_line_is_kept(self, tmp_path):
+        content = HEADER + b"\0\0\n  \t\n"
+        path = write(tmp_path / "1.csv", content)
+        assert repair_file(path)["status"] == "clean"
+        assert open(path, "rb").read() == content
+
+    def test_null_run_longer_than_block(self, tmp_path):
+        trailer = b"\0" * (TAIL_BLOCK_SIZE * 2 + 123) + b"\n"
+        path = write(tmp_path / "1.csv", HEADER + trailer)
+        result = repair_file(path)
+        assert result["status"] == "repaired" and result["removed_bytes"] == len(trailer)
+        assert open(path, "rb").read() == HEADER
+
+    def test_data_after_long_null_run_is_clean(self, tmp_path):
+        content = HEADER + b"\0" * (TAIL_BLOCK_SIZE + 10) + b"2,62\n"
+        path = write(tmp_path / "1.csv", content)
+        assert repair_file(path)["status"] == "clean"
+        assert os.path.getsize(path) == len(content)
+
+    def test_file_of_only_nulls(self, tmp_path):
+        path = write(tmp_path / "1.csv", b"\0\0\0\n")
+        assert repair_file(path)["status"] == "repaired"
+        assert os.path.getsize(path) == 0
+
+    def test_empty_file(self, tmp_path):
+        assert repair_file(write(tmp_path / "1.csv", b""))["status"] == "empty"
+
+    def test_dry_run_leaves_file_untouched(self, tmp_path):
+        content = HEADER + b"\0\0\n\0\n"
+        path = write(tmp_path / "1.csv", content)
+        result = repair_file(path, dry_run=True)
+        assert result["status"] == "would_repair" and result["removed_lines"] == 2
+        assert open(path, "rb").read() == content
+
+
+class TestRepairDirectory:
+    @pytest.fixture
+    def directory(self, tmp_path):
+        write(tmp_path / "1.csv", HEADER + b"\0\0\n")
+        write(tmp_path / "2.csv", HEADER)
+        write(tmp_path / "3.csv", b"")
+        write(tmp_path / "notes.txt", b"\0\0\n")
+        return tmp_path
+
+    def test_report(self, directory):
+        report = repair_directory(str(directory), workers=2)
+        assert [r["file"] for r in report["files"]] == ["1.csv", "2.csv", "3.csv"]
+        assert report["counts"] == {"clean": 1, "repaired": 1, "would_repair": 0, "empty": 1, "error": 0}
+        assert report["removed_bytes"] == 3
+        assert (directory / "notes.txt").read_bytes() == b"\0\0\n"
+
+    def test_cli_dry_run_leaves_files_untouched(self, directory):
+        before = {p.name: p.read_bytes() for p in directory.iterdir()}
+        script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "repair_csv.py")
+        completed = subprocess.run([sys.executable, script, "-d", str(directory), "--dry-run"],
+                                   capture_output=True, text=True)
+        assert completed.returncode == 0
+        assert "1.csv" in completed.stdout
+        assert {p.name: p.read_bytes() for p in directory.iterdir()} == before
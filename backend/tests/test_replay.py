@@ -0,0 +1,81 @@
+# tests/test_replay.py
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from replay import ReplayChannel, ReplayHub
+
+
+async def read_batch(start, end):
+    return {"start": start, "end": end}
+
+
+def factory(key):
+    return lambda on_close: ReplayChannel(key, read_batch, 0.0, 1.0, 1.0, 0.1, on_close)
+
+
+class TestReplayHub:
+    def test_subscribers_share_one_producer(self):
+        async def run():
+            hub = ReplayHub()
+            first, q1 = hub.subscribe("k", factory("k"))
+            second, q2 = hub.subscribe("k", factory("k"))
+            assert first is second and hub.created == 1
+            assert hub.stats()["subscribers"] == 2
+            first.unsubscribe(q1)
+            assert hub.stats()["channels"] == 1
+            first.unsubscribe(q2)
+            assert hub.stats()["channels"] == 0
+        asyncio.run(run())
+
+    def test_producer_end_removes_channel(self):
+        async def run():
+            hub = ReplayHub()
+            channel, queue = hub.subscribe("k", factory("k"))
+            messages = []
+            while (message := await asyncio.wait_for(queue.get(), 5)) is not None:
+                messages.append(message)
+            assert messages[-1].startswith(b"event: end")
+            assert hub.get("k") is None
+            channel.unsubscribe(queue)
+        asyncio.run(run())
+
+
+@pytest.fixture(scope="module")
+def client(data_dir, app_client):
+    frame = pd.DataFrame({"time": np.arange(100, dtype=np.float64), "Solar8000/HR": np.full(100, 60.0)})
+    frame.to_csv(data_dir / "6.csv", index=False)
+    return app_client
+
+
+class TestReplayEndpoint:
+    def test_disconnect_before_start_leaves_no_channel(self, client):
+        import main
+
+        async def open_and_drop():
+            response = await main.replay_case(6, signals=["Solar8000/HR"], start_time=None, speed=1.0,
+                                              interval=1.0, window=0.0, resolution=500)
+            # 응답 본문을 한 번도 읽지 않고 연결이 끊긴 경우
+            channels = main.replay_hub.stats()["channels"]
+            await response.body_iterator.aclose()
+            return channels
+
+        assert client.portal.call(open_and_drop) == 0
+        assert main.replay_hub.stats()["channels"] == 0
+
+    def test_disconnect_after_snapshot_releases_channel(self, client):
+        import main
+
+        async def read_snapshot():
+            response = await main.replay_case(6, signals=["Solar8000/HR"], start_time=None, speed=1.0,
+                                              interval=1.0, window=10.0, resolution=500)
+            first = await response.body_iterator.__anext__()
+            subscribers = main.replay_hub.stats()["subscribers"]
+            await response.body_iterator.aclose()
+            return first, subscribers
+
+        first, subscribers = client.portal.call(read_snapshot)
+        assert first.startswith(b"event: snapshot") and subscribers == 1
+        assert main.replay_hub.stats()["channels"] == 0
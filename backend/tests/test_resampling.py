@@ -0,0 +1,97 @@
+# tests/test_resampling.py
+import numpy as np
+import pytest
+
+from resampling import bucket_edges, fixed_grid, resample, resample_linear, resample_locf, resample_mean
+
+# 0~10초 샘플, 4~8초 사이는 비어 있음
+TIME = np.array([0.0, 1.0, 2.0, 3.0, 4.0, 8.0, 9.0, 10.0])
+VALUES = np.array([0.0, 10.0, 20.0, 30.0, 40.0, 80.0, 90.0, 100.0])
+
+
+def assert_values(actual, expected):
+    np.testing.assert_array_equal(actual, np.array(expected, dtype=np.float64))
+
+
+class TestGrid:
+    def test_fixed_grid_includes_end(self):
+        assert_values(fixed_grid(0.0, 0.3, 0.1), [0.0, 0.1, 0.2, 0.30000000000000004])
+        assert_values(fixed_grid(5.0, 7.0, 1.0), [5.0, 6.0, 7.0])
+        assert_values(fixed_grid(5.0, 6.5, 1.0), [5.0, 6.0])
+
+    def test_fixed_grid_single_and_empty(self):
+        assert_values(fixed_grid(5.0, 5.0, 1.0), [5.0])
+        assert len(fixed_grid(5.0, 4.0, 1.0)) == 0
+        with pytest.raises(ValueError):
+            fixed_grid(0.0, 1.0, 0.0)
+
+    def test_bucket_edges(self):
+        assert_values(bucket_edges(np.array([0.0, 2.0, 3.0, 5.0])), [0.0, 2.0, 3.0, 5.0, 7.0])
+        assert_values(bucket_edges(np.array([4.0])), [4.0, 5.0])
+        assert len(bucket_edges(np.zeros(0))) == 0
+
+
+class TestLocf:
+    def test_before_first_sample_is_missing(self):
+        grid = np.array([-1.0, -0.001, 0.0, 0.5])
+        assert_values(resample_locf(TIME, VALUES, grid, np.inf), [np.nan, np.nan, 0.0, 0.0])
+
+    def test_exact_time_uses_that_sample(self):
+        assert_values(resample_locf(TIME, VALUES, np.array([3.0, 3.999, 4.0]), np.inf), [30.0, 30.0, 40.0])
+
+    def test_gap_and_max_age(self):
+        grid = np.array([5.0, 6.0, 7.0, 12.0])
+        assert_values(resample_locf(TIME, VALUES, grid, np.inf), [40.0, 40.0, 40.0, 100.0])
+        assert_values(resample_locf(TIME, VALUES, grid, 2.0), [40.0, 40.0, np.nan, 100.0])
+
+    def test_no_samples(self):
+        assert_values(resample_locf(np.zeros(0), np.zeros(0), np.array([1.0, 2.0]), np.inf), [np.nan, np.nan])
+
+
+class TestLinear:
+    def test_interpolates_between_samples(self):
+        assert_values(resample_linear(TIME, VALUES, np.array([0.5, 2.25, 6.0]), np.inf), [5.0, 22.5, 60.0])
+
+    def test_outside_sample_range_is_missing(self):
+        grid = np.array([-0.5, 0.0, 10.0, 10.5])
+        assert_values(resample_linear(TIME, VALUES, grid, np.inf), [np.nan, 0.0, 100.0, np.nan])
+
+    def test_gap_longer_than_max_age_is_missing(self):
+        grid = np.array([3.5, 6.0, 8.0])
+        # 4~8초 간격(4초)이 max_age보다 크면 결측, 샘플 시각은 그대로
+        assert_values(resample_linear(TIME, VALUES, grid, 2.0), [35.0, np.nan, 80.0])
+
+    def test_single_sample(self):
+        assert_values(resample_linear(np.array([1.0]), np.array([7.0]), np.array([0.0, 1.0, 2.0]), np.inf),
+                      [np.nan, 7.0, np.nan])
+
+
+class TestMean:
+    def test_buckets_are_half_open(self):
+        grid = np.array([0.0, 2.0, 4.0, 6.0, 8.0])
+        # [0, 2), [2, 4), [4, 6), [6, 8), [8, 10) - 마지막 폭은 간격의 중앙값 2초이므로 10초 샘플은 제외
+        assert_values(resample_mean(TIME, VALUES, grid), [5.0, 25.0, 40.0, np.nan, 85.0])
+
+    def test_empty_buckets_at_edges(self):
+        grid = np.array([-4.0, -2.0, 11.0])
+        # [-4, -2)와 [11, 18.5)는 비어 있고, [-2, 11)은 전체 샘플의 평균
+        assert_values(resample_mean(TIME, VALUES, grid), [np.nan, VALUES.mean(), np.nan])
+
+    def test_no_samples(self):
+        assert_values(resample_mean(np.zeros(0), np.zeros(0), np.array([0.0, 1.0])), [np.nan, np.nan])
+
+
+class TestResample:
+    @pytest.mark.parametrize("policy", ["locf", "linear", "mean"])
+    def test_empty_grid(self, policy):
+        result = resample({"a": (TIME, VALUES), "b": (np.zeros(0), np.zeros(0))}, np.zeros(0), policy, 1.0)
+        assert {name: len(values) for name, values in result.items()} == {"a": 0, "b": 0}
+
+    def test_max_age_none_is_unlimited(self):
+        grid = np.array([7.0])
+        assert_values(resample({"a": (TIME, VALUES)}, grid, "locf")["a"], [40.0])
+        assert_values(resample({"a": (TIME, VALUES)}, grid, "locf", 1.0)["a"], [np.nan])
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            resample({}, np.zeros(0), "nearest")
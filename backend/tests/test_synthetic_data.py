@@ -0,0 +1,21 @@
+# tests/test_synthetic_data.py
+import os
+
+from case_store import CaseStore, get_store_dir, source_identity, store_identity
+from synthetic_data import write_case
+
+
+class TestWriteCase:
+    def test_store_only_identity_comes_from_written_files(self, tmp_path):
+        write_case(str(tmp_path), 1, "store", n_signals=3, duration=60, step=1.0, seed=0)
+        store_dir = get_store_dir(str(tmp_path), 1)
+        source = CaseStore(store_dir).source
+        assert source == store_identity(store_dir)
+        assert source["size"] > 0
+        assert not os.path.exists(tmp_path / "1.csv")
+
+    def test_both_records_csv_identity(self, tmp_path):
+        write_case(str(tmp_path), 1, "both", n_signals=3, duration=60, step=1.0, seed=0)
+        store = CaseStore(get_store_dir(str(tmp_path), 1))
+        assert store.source == source_identity(str(tmp_path / "1.csv"))
+        assert store.is_fresh(str(tmp_path / "1.csv"))
@@ -0,0 +1,27 @@
+# tests/test_tiles.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from tiles import MAX_LEVEL, MAX_TILE_INDEX
+
+
+@pytest.fixture(scope="module")
+def client(data_dir, app_client):
+    frame = pd.DataFrame({"time": np.arange(1000, dtype=np.float64), "Solar8000/HR": np.linspace(60, 80, 1000)})
+    frame.to_csv(data_dir / "3.csv", index=False)
+    return app_client
+
+
+class TestTileBounds:
+    @pytest.mark.parametrize("level,index", [(0, 0), (MAX_LEVEL, 0), (MAX_LEVEL, MAX_TILE_INDEX),
+                                             (MAX_LEVEL, -MAX_TILE_INDEX)])
+    def test_levels_in_range(self, client, level, index):
+        response = client.get(f"/api/case/3/tiles/{level}/{index}", params={"signal": "Solar8000/HR"})
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize("level,index", [(-1, 0), (MAX_LEVEL + 1, 0), (10 ** 30, 0), (0, MAX_TILE_INDEX + 1),
+                                             (0, 10 ** 30)])
+    def test_out_of_range_is_rejected(self, client, level, index):
+        response = client.get(f"/api/case/3/tiles/{level}/{index}", params={"signal": "Solar8000/HR"})
+        assert response.status_code == 422
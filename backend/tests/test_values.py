@@ -0,0 +1,89 @@
+# tests/test_values.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from case_store import convert_csv_to_store, get_store_dir
+from encoding import float32_to_float64
+
+# CSV에 적힌 그대로 응답에 나와야 하는 값 (float32로 저장해도 유효 숫자 7자리 이내)
+CSV_VALUES = {
+    "BIS/SQI": [0.8, 0.1, np.nan, 0.3, 0.7],
+    "Solar8000/BT": [36.6, 36.7, 36.65, np.nan, 37.1],
+    "Solar8000/HR": [59.9, 61.0, 72.3, 88.8, np.nan],
+    "Primus/MAWP_MBAR": [-12.3, 0.001, 1234.5, 98.25, 12345.67],
+}
+
+
+@pytest.fixture(scope="module")
+def client(data_dir, app_client):
+    frame = pd.DataFrame({"time": [0.0, 1.0, 2.0, 3.0, 4.0], **CSV_VALUES})
+    frame.to_csv(data_dir / "1.csv", index=False)
+    # 케이스 2는 같은 값을 float32 memmap 저장소로 읽음
+    frame.to_csv(data_dir / "2.csv", index=False)
+    convert_csv_to_store(str(data_dir / "2.csv"), get_store_dir(str(data_dir), 2))
+    return app_client
+
+
+def expected(signal):
+    return [None if np.isnan(v) else v for v in CSV_VALUES[signal]]
+
+
+class TestFloatValues:
+    def test_float32_to_float64_shortest_repr(self):
+        values = np.array([0.8, 59.9, -12.3, 0.001, 12345.67, 3.4028235e38], dtype=np.float32)
+        assert float32_to_float64(values).tolist() == [0.8, 59.9, -12.3, 0.001, 12345.67, 3.4028235e38]
+        assert np.isnan(float32_to_float64(np.array([np.nan], dtype=np.float32))[0])
+
+    @pytest.mark.parametrize("case_id", [1, 2])
+    def test_data_columns_round_trip(self, client, case_id):
+        response = client.get(f"/api/case/{case_id}/data", params={"orient": "columns"})
+        assert response.status_code == 200
+        data = response.json()["data"]
+        for signal in CSV_VALUES:
+            assert data["signals"][signal] == expected(signal)
+
+    @pytest.mark.parametrize("case_id", [1, 2])
+    def test_data_records_round_trip(self, client, case_id):
+        response = client.get(f"/api/case/{case_id}/data", params={"signals": list(CSV_VALUES)})
+        assert response.status_code == 200
+        records = response.json()["data"]
+        for signal in CSV_VALUES:
+            assert [record[signal] for record in records] == expected(signal)
+
+    @pytest.mark.parametrize("case_id", [1, 2])
+    def test_statistics_min_max_round_trip(self, client, case_id):
+        response = client.get(f"/api/case/{case_id}/statistics")
+        assert response.status_code == 200
+        statistics = response.json()["statistics"]
+        for signal, values in CSV_VALUES.items():
+            assert statistics[signal]["min"] == np.nanmin(values)
+            assert statistics[signal]["max"] == np.nanmax(values)
+
+
+@pytest.fixture(scope="module")
+def nibp_client(data_dir, app_client):
+    # 케이스 5: MAP = (100 + 2 * 90) / 3 = 93.33333333333333 (float32로 줄이면 93.333336)
+    frame = pd.DataFrame({"time": [0.0, 1.0, 2.0, 3.0],
+                          "Solar8000/NIBP_SBP": [100.0, np.nan, 120.0, np.nan],
+                          "Solar8000/NIBP_DBP": [90.0, np.nan, 70.0, np.nan]})
+    frame.to_csv(data_dir / "5.csv", index=False)
+    return app_client
+
+
+class TestComputedValues:
+    def test_derived_signal_keeps_float64(self, nibp_client):
+        response = nibp_client.get("/api/case/5/data", params={"orient": "columns",
+                                                               "signals": ["Solar8000/NIBP_SBP", "Derived/NIBP_MAP"]})
+        assert response.status_code == 200
+        signals = response.json()["data"]["signals"]
+        assert signals["Solar8000/NIBP_SBP"][0] == 100.0
+        assert signals["Derived/NIBP_MAP"][0] == (100.0 + 2 * 90.0) / 3
+
+    def test_linear_resample_keeps_float64(self, nibp_client):
+        response = nibp_client.get("/api/case/5/resample", params={
+            "signals": ["Solar8000/NIBP_SBP"], "interval": 2 / 3, "policy": "linear", "orient": "columns"})
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["signals"]["Solar8000/NIBP_SBP"][1] == 100.0 + 20.0 * data["time"][1] / 2.0
+        assert data["signals"]["Solar8000/NIBP_SBP"][1] != float(np.float32(data["signals"]["Solar8000/NIBP_SBP"][1]))
@@ -0,0 +1,86 @@
+# tests/test_wire_format.py
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from wire_format import (FRAME_MAGIC, MEDIA_TYPE_ARROW, MEDIA_TYPE_FRAME, MEDIA_TYPE_JSON, decode_frame,
+                         encode_frame, negotiate, pa)
+
+
+def header_of(frame: bytes):
+    (length,) = struct.unpack_from("<I", frame, 4)
+    return json.loads(frame[8:8 + length])
+
+
+class TestFrameRoundTrip:
+    @pytest.mark.parametrize("rows", [0, 1, 7, 9, 13])
+    def test_round_trip(self, rows):
+        rng = np.random.default_rng(rows)
+        time = np.arange(rows, dtype=np.float64) + 0.1
+        precise = rng.normal(size=rows) / 3
+        stored = rng.normal(size=rows).astype(np.float32)
+        counts = np.arange(rows, dtype=np.int32)
+        if rows:
+            precise[::3] = np.nan
+            stored[rows // 2] = np.nan
+        columns = {"time": (time, "float64"), "precise": (precise, "float64"),
+                   "stored": (stored, "float32"), "count": (counts, "int32")}
+
+        decoded, meta = decode_frame(encode_frame(columns, {"rows": rows, "name": "케이스"}))
+
+        assert meta == {"rows": rows, "name": "케이스"}
+        assert list(decoded) == list(columns)
+        assert decoded["time"].dtype == np.float64 and decoded["stored"].dtype == np.float32
+        np.testing.assert_array_equal(decoded["time"], time)
+        np.testing.assert_array_equal(decoded["precise"], precise)  # NaN 위치 포함, float64 정밀도 유지
+        np.testing.assert_array_equal(decoded["stored"], stored)
+        np.testing.assert_array_equal(decoded["count"], counts)
+
+    def test_alignment_and_null_bitmap(self):
+        values = np.array([1.0, np.inf, np.nan, 4.0, -np.inf, 6.0, 7.0, 8.0, np.nan])
+        frame = encode_frame({"a": (values, "float32"), "b": (values, "float64")})
+        assert frame[:4] == FRAME_MAGIC
+
+        header = header_of(frame)
+        for entry in header["columns"]:
+            assert entry["null_bitmap_offset"] % 8 == 0
+            assert entry["values_offset"] % 8 == 0
+            bitmap = frame[entry["null_bitmap_offset"]:entry["null_bitmap_offset"] + 2]
+            assert bitmap == bytes([0b00010110, 0b00000001])
+
+        decoded, _ = decode_frame(frame)
+        # Infinity도 null이므로 NaN으로 복원
+        expected = [1.0, np.nan, np.nan, 4.0, np.nan, 6.0, 7.0, 8.0, np.nan]
+        np.testing.assert_array_equal(decoded["a"], np.array(expected, dtype=np.float32))
+        np.testing.assert_array_equal(decoded["b"], expected)
+
+    def test_length_mismatch_is_rejected(self):
+        with pytest.raises(ValueError):
+            encode_frame({"a": (np.zeros(3), "float64"), "b": (np.zeros(4), "float64")})
+
+    def test_not_a_frame(self):
+        with pytest.raises(ValueError):
+            decode_frame(b"JSON" + b"\0" * 12)
+
+
+class TestNegotiate:
+    @pytest.mark.parametrize("accept,expected", [
+        (None, MEDIA_TYPE_JSON),
+        ("", MEDIA_TYPE_JSON),
+        ("*/*", MEDIA_TYPE_JSON),
+        ("application/x-vitalab-frame", MEDIA_TYPE_FRAME),
+        ("Application/X-VitaLab-Frame", MEDIA_TYPE_FRAME),
+        ("application/json, application/x-vitalab-frame", MEDIA_TYPE_JSON),
+        ("application/json;q=0.5, application/x-vitalab-frame", MEDIA_TYPE_FRAME),
+        ("application/x-vitalab-frame;q=0, application/json;q=0.1", MEDIA_TYPE_JSON),
+        ("application/x-vitalab-frame;q=abc", MEDIA_TYPE_JSON),
+        ("text/html, application/x-vitalab-frame ; q=0.9", MEDIA_TYPE_FRAME),
+    ])
+    def test_accept(self, accept, expected):
+        assert negotiate(accept) == expected
+
+    def test_arrow_only_when_installed(self):
+        expected = MEDIA_TYPE_ARROW if pa is not None else MEDIA_TYPE_JSON
+        assert negotiate("application/vnd.apache.arrow.stream") == expected
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+신호별 다중 해상도 타일 피라미드
+
+레벨 L의 버킷 폭은 BASE_BUCKET_SECONDS * 2^L 초이며, 각 버킷은 min/max/sum/count를
+가집니다. 타일은 TILE_BUCKETS개의 버킷으로 고정되어 있어 타일 경계가 케이스와
+요청에 상관없이 항상 같습니다 (레벨 L, 인덱스 k 타일 = [k, k+1) * TILE_BUCKETS 버킷).
+
+피라미드는 결측이 아닌 샘플만 저장하며 (빈 버킷 생략),
+data/tiles/{case_id}/{signal}.npz 파일로 저장됩니다.
+"""
+
+import os
+import threading
+import urllib.parse
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+BASE_BUCKET_SECONDS = 1.0
+TILE_BUCKETS = 256
+MAX_LEVEL = 24
+# 타일 인덱스 절댓값 상한 (최대 레벨에서도 버킷 ID 계산이 int64 범위를 넘지 않음)
+MAX_TILE_INDEX = 2 ** (62 - MAX_LEVEL) // TILE_BUCKETS - 1
+TILES_DIR_NAME = "tiles"
+
+# 저장 파일 형식 버전 (다르면 원본 파일 정보가 같아도 다시 생성)
+PYRAMID_FORMAT_VERSION = 3
+
+
+def get_pyramid_path(data_dir: str, case_id: int, signal: str) -> str:
+    """신호 피라미드 파일 경로 (신호 이름의 '/'는 인코딩)"""
+    file_name = urllib.parse.quote(signal, safe="") + ".npz"
+    return os.path.join(data_dir, TILES_DIR_NAME, str(case_id), file_name)
+
+
+def _reduce_level(ids: np.ndarray, vmin: np.ndarray, vmax: np.ndarray,
+                  vsum: np.ndarray, count: np.ndarray) -> Dict[str, np.ndarray]:
+    """정렬된 버킷 ID가 같은 연속 구간을 하나로 합침"""
+    if len(ids) == 0:
+        return {"ids": ids, "min": vmin, "max": vmax, "sum": vsum, "count": count}
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    return {
+        "ids": ids[starts],
+        "min": np.minimum.reduceat(vmin, starts),
+        "max": np.maximum.reduceat(vmax, starts),
+        "sum": np.add.reduceat(vsum, starts),
+        "count": np.add.reduceat(count, starts),
+    }
+
+
+class SignalPyramid:
+    """한 신호의 레벨별 버킷 요약 (레벨 0이 가장 세밀함)"""
+
+    def __init__(self, levels: List[Dict[str, np.ndarray]], source: Optional[Dict[str, int]] = None):
+        self.levels = levels
+        self.source = source or {}
+
+    @classmethod
+    def build(cls, time: np.ndarray, values: np.ndarray,
+              source: Optional[Dict[str, int]] = None) -> "SignalPyramid":
+        """시간순 샘플로 피라미드 생성 (NaN/inf 샘플은 제외)"""
+        time = np.asarray(time, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(values) & np.isfinite(time)
+        time, values = time[finite], values[finite]
+
+        ids = np.floor(time / BASE_BUCKET_SECONDS).astype(np.int64)
+        level = _reduce_level(ids, values, values, values, np.ones(len(values), dtype=np.int64))
+        levels = [level]
+
+        # 상위 레벨은 하위 레벨 버킷 두 개씩을 합쳐 생성 (>> 1 은 음수에서도 floor)
+        while len(level["ids"]) > 1 and len(levels) <= MAX_LEVEL:
+            level = _reduce_level(level["ids"] >> 1, level["min"], level["max"],
+                                  level["sum"], level["count"])
+            levels.append(level)
+        return cls(levels, source)
+
+    @classmethod
+    def load(cls, path: str) -> "SignalPyramid":
+        with np.load(path) as npz:
+            n_levels = int(npz["n_levels"])
+            levels = [
+                {key: npz[f"{key}{lv}"] for key in ("ids", "min", "max", "sum", "count")}
+                for lv in range(n_levels)
+            ]
+            size, mtime_ns = (int(v) for v in npz["source"])
+            version = int(npz["version"]) if "version" in npz.files else 1
+        # 이전 형식 파일은 원본 파일 정보를 비워 최신 데이터로 다시 생성되게 함
+        source = {"size": size, "mtime_ns": mtime_ns} if version == PYRAMID_FORMAT_VERSION else {}
+        return cls(levels, source)
+
+    def save(self, path: str) -> None:
+        """임시 파일에 쓴 뒤 이름을 바꿔 저장 (동시 읽기 안전)"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        arrays = {"version": np.int64(PYRAMID_FORMAT_VERSION),
+                  "n_levels": np.int64(len(self.levels)),
+                  "source": np.array([self.source.get("size", -1), self.source.get("mtime_ns", -1)],
+                                     dtype=np.int64)}
+        for lv, level in enumerate(self.levels):
+            for key, array in level.items():
+                arrays[f"{key}{lv}"] = array
+
+        # 같은 피라미드를 여러 요청 스레드가 동시에 저장할 수 있으므로 임시 파일은 스레드별로 구분
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for level in self.levels for array in level.values())
+
+    @property
+    def max_level(self) -> int:
+        return len(self.levels) - 1
+
+    def bucket_seconds(self, level: int) -> float:
+        return BASE_BUCKET_SECONDS * (2 ** level)
+
+    def time_span(self) -> Optional[List[float]]:
+        """데이터가 있는 구간의 [시작, 끝) 시간"""
+        ids = self.levels[0]["ids"]
+        if len(ids) == 0:
+            return None
+        return [float(ids[0] * BASE_BUCKET_SECONDS), float((ids[-1] + 1) * BASE_BUCKET_SECONDS)]
+
+    def tile(self, level: int, index: int) -> Dict[str, Any]:
+        """
+        레벨/인덱스 타일의 버킷 요약 반환 (빈 버킷은 생략)
+        - 레벨이 피라미드 최대 레벨보다 크면 최대 레벨 데이터를 합쳐 계산
+        """
+        if not 0 <= level <= MAX_LEVEL:
+            raise ValueError(f"level must be between 0 and {MAX_LEVEL}")
+        if abs(index) > MAX_TILE_INDEX:
+            raise ValueError(f"index must be between -{MAX_TILE_INDEX} and {MAX_TILE_INDEX}")
+
+        source_level = min(level, self.max_level)
+        data = self.levels[source_level]
+        ids = data["ids"]
+        shift = level - source_level
+
+        width = self.bucket_seconds(level)
+        first_bucket = index * TILE_BUCKETS
+        lo = np.searchsorted(ids, first_bucket << shift, side="left")
+        hi = np.searchsorted(ids, (first_bucket + TILE_BUCKETS) << shift, side="left")
+
+        tile = {key: data[key][lo:hi] for key in ("ids", "min", "max", "sum", "count")}
+        if shift:
+            tile = _reduce_level(tile["ids"] >> shift, tile["min"], tile["max"], tile["sum"], tile["count"])
+
+        return {
+            "level": level,
+            "index": index,
+            "bucket_seconds": width,
+            "start_time": first_bucket * width,
+            "end_time": (first_bucket + TILE_BUCKETS) * width,
+            "time": (tile["ids"] * width).tolist(),
+            "min": tile["min"].tolist(),
+            "max": tile["max"].tolist(),
+            "mean": (tile["sum"] / tile["count"]).tolist(),
+            "count": tile["count"].tolist(),
+        }
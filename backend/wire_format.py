@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+케이스 데이터/통계 응답의 바이너리 직렬화 (Accept 헤더로 선택)
+
+application/x-vitalab-frame (VitaLab 프레임, 모든 정수/실수는 little-endian):
+
+    offset 0   4 bytes   매직 b"VLF1"
+    offset 4   uint32    헤더 길이 H (바이트)
+    offset 8   H bytes   UTF-8 JSON 헤더 (공백으로 8바이트 경계까지 채움)
+    이후        열 데이터 블록 (각 블록의 시작은 8바이트 경계)
+
+    JSON 헤더:
+        {"rows": n,
+         "columns": [{"name": ..., "dtype": "float32" | "float64" | "int32",
+                      "null_bitmap_offset": ..., "values_offset": ...}, ...],
+         "meta": {...}}
+
+    null 비트맵: ceil(n / 8) 바이트, i번째 값이 NaN/Infinity이면
+                 바이트 i // 8 의 비트 (i % 8) 가 1 (LSB 우선)
+    값 배열:     n개의 dtype 값 (null 위치의 실수 값은 NaN)
+
+    오프셋은 모두 프레임 시작 기준이므로 브라우저에서
+    new Float32Array(buffer, values_offset, rows) 로 복사 없이 읽을 수 있습니다.
+
+application/vnd.apache.arrow.stream (Arrow IPC 스트림, pyarrow 설치 시):
+    열 하나당 Arrow 필드 하나, NaN/Infinity는 Arrow null. meta는 스키마 메타데이터
+    "vitalab.meta" 키에 JSON 문자열로 저장됩니다.
+"""
+
+import json
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow는 선택 의존성
+    pa = None
+
+MEDIA_TYPE_JSON = "application/json"
+MEDIA_TYPE_FRAME = "application/x-vitalab-frame"
+MEDIA_TYPE_ARROW = "application/vnd.apache.arrow.stream"
+
+FRAME_MAGIC = b"VLF1"
+_ALIGN = 8
+_DTYPES = {"float32": "<f4", "float64": "<f8", "int32": "<i4"}
+
+
+def _padding(length: int) -> int:
+    return (-length) % _ALIGN
+
+
+def supported_media_types() -> List[str]:
+    """현재 환경에서 응답 가능한 미디어 타입 (선호 순)"""
+    types = [MEDIA_TYPE_JSON, MEDIA_TYPE_FRAME]
+    if pa is not None:
+        types.append(MEDIA_TYPE_ARROW)
+    return types
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Accept 헤더에서 응답 미디어 타입 선택
+    - q 값이 높은 순, 같으면 헤더에 적힌 순서
+    - 지원하는 바이너리 타입이 없으면 JSON
+    """
+    if not accept:
+        return MEDIA_TYPE_JSON
+
+    candidates: List[Tuple[float, int, str]] = []
+    for order, part in enumerate(accept.split(",")):
+        fields = [f.strip() for f in part.split(";")]
+        media_type = fields[0].lower()
+        q = 1.0
+        for param in fields[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            candidates.append((-q, order, media_type))
+
+    available = supported_media_types()
+    for _, _, media_type in sorted(candidates):
+        if media_type in available:
+            return media_type
+    return MEDIA_TYPE_JSON
+
+
+def encode_frame(columns: Dict[str, Tuple[np.ndarray, str]], meta: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    열 목록을 VitaLab 프레임으로 직렬화
+
+    Args:
+        columns: {열 이름: (값 배열, dtype 이름)} — 모든 배열의 길이가 같아야 함
+        meta: 헤더에 함께 기록할 JSON 호환 메타 정보
+    """
+    lengths = {len(values) for values, _ in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("All frame columns must have the same length")
+    rows = lengths.pop() if lengths else 0
+    bitmap_size = (rows + 7) // 8
+
+    blocks = []
+    layout = []
+    offset = 0
+    for name, (values, dtype) in columns.items():
+        array = np.asarray(values)
+        if dtype.startswith("float"):
+            array = array.astype(_DTYPES[dtype])
+            nulls = ~np.isfinite(array)
+            # Infinity도 null이므로 값 배열에는 NaN으로 기록 (형식 정의와 일치)
+            if nulls.any():
+                array = np.where(nulls, np.nan, array).astype(_DTYPES[dtype])
+        else:
+            array = array.astype(_DTYPES[dtype])
+            nulls = np.zeros(rows, dtype=bool)
+
+        bitmap = np.packbits(nulls, bitorder="little").tobytes()
+        values_bytes = array.tobytes()
+        bitmap_offset = offset
+        values_offset = bitmap_offset + bitmap_size + _padding(bitmap_size)
+        offset = values_offset + len(values_bytes) + _padding(len(values_bytes))
+
+        blocks.append(bitmap + b"\0" * _padding(bitmap_size))
+        blocks.append(values_bytes + b"\0" * _padding(len(values_bytes)))
+        layout.append({"name": name, "dtype": dtype,
+                       "null_bitmap_offset": bitmap_offset, "values_offset": values_offset})
+
+    # 헤더 길이에 따라 오프셋이 달라지므로, 오프셋을 확정한 뒤 다시 직렬화
+    header = {"rows": rows, "columns": layout, "meta": meta or {}}
+    base = 8 + len(json.dumps(header, ensure_ascii=False).encode("utf-8"))
+    while True:
+        data_start = base + _padding(base)
+        header["columns"] = [
+            dict(entry, null_bitmap_offset=entry["null_bitmap_offset"] + data_start,
+                 values_offset=entry["values_offset"] + data_start)
+            for entry in layout
+        ]
+        header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        if 8 + len(header_bytes) <= data_start:
+            break
+        base = 8 + len(header_bytes)
+
+    header_bytes += b" " * (data_start - 8 - len(header_bytes))
+    return b"".join([FRAME_MAGIC, struct.pack("<I", len(header_bytes)), header_bytes] + blocks)
+
+
+def decode_frame(data: bytes) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """VitaLab 프레임을 {열 이름: 배열}, meta로 복원 (실수 열의 null 비트맵 위치는 NaN, 그 외에는 복사 없이 읽음)"""
+    if data[:4] != FRAME_MAGIC:
+        raise ValueError("Not a VitaLab frame")
+    (header_length,) = struct.unpack_from("<I", data, 4)
+    header = json.loads(data[8:8 + header_length].decode("utf-8"))
+    rows = header["rows"]
+
+    columns = {}
+    for entry in header["columns"]:
+        array = np.frombuffer(data, dtype=_DTYPES[entry["dtype"]], count=rows,
+                              offset=entry["values_offset"])
+        if entry["dtype"].startswith("float"):
+            bitmap = np.frombuffer(data, dtype=np.uint8, count=(rows + 7) // 8, offset=entry["null_bitmap_offset"])
+            nulls = np.unpackbits(bitmap, count=rows, bitorder="little").astype(bool)
+            if nulls.any():
+                array = np.where(nulls, np.nan, array).astype(array.dtype)
+        columns[entry["name"]] = array
+    return columns, header["meta"]
+
+
+def encode_arrow(columns: Dict[str, Tuple[np.ndarray, str]], meta: Optional[Dict[str, Any]] = None) -> bytes:
+    """열 목록을 Arrow IPC 스트림으로 직렬화 (pyarrow 필요)"""
+    if pa is None:
+        raise RuntimeError("pyarrow is not installed")
+
+    arrays = []
+    for values, dtype in columns.values():
+        array = np.asarray(values).astype(_DTYPES[dtype])
+        mask = ~np.isfinite(array) if dtype.startswith("float") else None
+        arrays.append(pa.array(array, mask=mask))
+
+    batch = pa.RecordBatch.from_arrays(arrays, names=list(columns.keys()))
+    schema = batch.schema.with_metadata({"vitalab.meta": json.dumps(meta or {}, ensure_ascii=False)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(batch.replace_schema_metadata(schema.metadata))
+    return sink.getvalue().to_pybytes()
+
+
+def encode(media_type: str, columns: Dict[str, Tuple[np.ndarray, str]], meta: Optional[Dict[str, Any]] = None) -> bytes:
+    """협상된 바이너리 미디어 타입으로 직렬화"""
+    if media_type == MEDIA_TYPE_FRAME:
+        return encode_frame(columns, meta)
+    if media_type == MEDIA_TYPE_ARROW:
+        return encode_arrow(columns, meta)
+    raise ValueError(f"Unsupported binary media type: {media_type}")